@@ -0,0 +1,302 @@
+"""Single-pass text analysis shared by the manuscript tools.
+
+:func:`analyze` tokenises a text once and collects everything the analysis
+tools report on: sentences, paragraphs, word positions (and so word
+frequencies), dialogue spans, time references and name mentions. Results
+are cached by text, so a review that runs every tool over the same chapter
+pays for one pass instead of one per tool.
+
+Each tool's figures for one chapter are also summarized in a small result
+model (:class:`ProseStats`, :class:`PacingStats`, :class:`TimelineStats`)
+that can be stored, and the results of several chapters merged into those of
+the whole selection.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from pydantic import BaseModel, Field
+
+# Bump when the analysis output changes, so persisted results are recomputed
+ANALYZER_VERSION = 1
+
+# One alternation, so a single scan finds every token kind in order
+TOKEN = re.compile(
+    r"(?P<word>[^\W_]+(?:['’][^\W_]+)*)"
+    r"|(?P<stop>[.!?]+)"
+    r"|(?P<quote>[\"“”])"
+    r"|(?P<para>\n[ \t]*\n\s*)"
+)
+WORD = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+
+WEEKDAYS = frozenset({"monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"})
+MONTHS = frozenset(
+    {
+        "january",
+        "february",
+        "march",
+        "april",
+        "may",
+        "june",
+        "july",
+        "august",
+        "september",
+        "october",
+        "november",
+        "december",
+    }
+)
+RELATIVE_TIME = frozenset({"later", "ago", "before", "after"})
+PASSIVE_INDICATORS = frozenset({"was", "were", "been", "being"})
+
+
+def possessives(word: str) -> tuple[str, str]:
+    """Possessive forms of a case-folded word, which tokenise as one word."""
+    return word + "'s", word + "’s"
+
+
+class TextAnalysis(BaseModel):
+    """Everything the tools need to know about one text.
+
+    Offsets are character offsets into ``text``.
+    """
+
+    text: str
+    word_count: int = 0
+    sentences: list[tuple[int, int, int]] = Field(default_factory=list)  # start, end, words
+    # start, end, words, whether the paragraph contains dialogue
+    paragraphs: list[tuple[int, int, int, bool]] = Field(default_factory=list)
+    dialogue: list[tuple[int, int]] = Field(default_factory=list)  # Quoted spans
+    time_references: list[tuple[int, str]] = Field(default_factory=list)
+    positions: dict[str, list[int]] = Field(default_factory=dict)  # Case-folded word -> starts
+
+    @property
+    def word_frequencies(self) -> dict[str, int]:
+        """Occurrences of each case-folded word."""
+        return {word: len(starts) for word, starts in self.positions.items()}
+
+    def count(self, words: frozenset[str] | set[str]) -> int:
+        """Total occurrences of any of the given case-folded words."""
+        return sum(len(self.positions.get(word, ())) for word in words)
+
+    def mentions(self, name: str) -> list[tuple[int, str]]:
+        """Find a (possibly multi-word) name, ignoring case.
+
+        Args:
+            name: Name to look for
+
+        Returns:
+            (offset, text as written) for each mention, in order
+        """
+        tokens = WORD.findall(name.casefold())
+        if not tokens:
+            return []
+        pattern = re.compile(
+            r"[\W_]+".join(re.escape(token) for token in WORD.findall(name)) + r"(?![^\W_])",
+            re.IGNORECASE,
+        )
+        starts = self.positions.get(tokens[0], [])
+        if len(tokens) == 1:
+            # "Sarah's" is one token; the name still ends at the apostrophe
+            forms = [self.positions.get(form, []) for form in possessives(tokens[0])]
+            starts = sorted(starts + forms[0] + forms[1])
+        found = []
+        for start in starts:
+            match = pattern.match(self.text, start)
+            if match:
+                found.append((start, match.group()))
+        return found
+
+
+@lru_cache(maxsize=32)
+def analyze(text: str) -> TextAnalysis:
+    """Analyze a text in a single pass.
+
+    Results are cached, so calling this again with the same text is free.
+    Treat the returned object as read-only.
+
+    Args:
+        text: Text to analyze, typically one chapter
+
+    Returns:
+        The analysis
+    """
+    positions: dict[str, list[int]] = {}
+    sentences: list[tuple[int, int, int]] = []
+    paragraphs: list[tuple[int, int, int, bool]] = []
+    dialogue: list[tuple[int, int]] = []
+    times: list[tuple[int, str]] = []
+
+    word_count = 0
+    last_end = 0
+    sentence_start, sentence_words = -1, 0
+    paragraph_start, paragraph_words, paragraph_dialogue = -1, 0, False
+    quote_start = -1
+    # The two previous words of the current sentence, for multi-word time references
+    prev, prev_start, prev2, prev2_start = "", 0, "", 0
+
+    for match in TOKEN.finditer(text):
+        kind = match.lastgroup
+        start, end = match.span()
+
+        if kind == "word":
+            surface = match.group()
+            word = surface.casefold()
+            starts = positions.get(word)
+            if starts is None:
+                positions[word] = [start]
+            else:
+                starts.append(start)
+
+            word_count += 1
+            sentence_words += 1
+            paragraph_words += 1
+            if sentence_start < 0:
+                sentence_start = start
+            if paragraph_start < 0:
+                paragraph_start = start
+
+            if word in WEEKDAYS or word in MONTHS:
+                times.append((start, surface))
+            elif prev == "day" and word.isdigit():
+                times.append((prev_start, text[prev_start:end]))
+            elif word in RELATIVE_TIME and prev in ("day", "days") and prev2.isdigit():
+                times.append((prev2_start, text[prev2_start:end]))
+
+            prev2, prev2_start, prev, prev_start = prev, prev_start, word, start
+            last_end = end
+
+        elif kind == "stop":
+            if sentence_words:
+                sentences.append((sentence_start, end, sentence_words))
+            sentence_start, sentence_words = -1, 0
+            prev, prev2 = "", ""
+            last_end = end
+
+        elif kind == "quote":
+            char = match.group()
+            if char == "“" or (char == '"' and quote_start < 0):
+                quote_start = start
+                paragraph_dialogue = True
+            elif quote_start >= 0:
+                dialogue.append((quote_start, end))
+                quote_start = -1
+            last_end = end
+
+        else:  # Paragraph break
+            if sentence_words:
+                sentences.append((sentence_start, last_end, sentence_words))
+            if paragraph_words:
+                paragraphs.append((paragraph_start, last_end, paragraph_words, paragraph_dialogue))
+            if quote_start >= 0:
+                dialogue.append((quote_start, last_end))
+            sentence_start, sentence_words = -1, 0
+            paragraph_start, paragraph_words, paragraph_dialogue = -1, 0, False
+            quote_start = -1
+            prev, prev2 = "", ""
+
+    if sentence_words:
+        sentences.append((sentence_start, last_end, sentence_words))
+    if paragraph_words:
+        paragraphs.append((paragraph_start, last_end, paragraph_words, paragraph_dialogue))
+    if quote_start >= 0:
+        dialogue.append((quote_start, last_end))
+
+    # The lists are built here and trusted, so skip re-validating them
+    return TextAnalysis.model_construct(
+        text=text,
+        word_count=word_count,
+        sentences=sentences,
+        paragraphs=paragraphs,
+        dialogue=dialogue,
+        time_references=times,
+        positions=positions,
+    )
+
+
+class ProseStats(BaseModel):
+    """Prose quality figures of a text."""
+
+    sentences: int = 0
+    words: int = 0
+    passive: int = 0  # Passive voice indicators
+    adverbs: int = 0  # Words ending in -ly
+    # Occurrences of words longer than three letters, in order of first use
+    frequencies: dict[str, int] = Field(default_factory=dict)
+
+    @classmethod
+    def from_text(cls, text: str) -> "ProseStats":
+        """Summarize one text."""
+        analysis = analyze(text)
+        return cls(
+            sentences=len(analysis.sentences),
+            words=analysis.word_count,
+            passive=analysis.count(PASSIVE_INDICATORS),
+            adverbs=analysis.count({word for word in analysis.positions if word.endswith("ly")}),
+            frequencies={
+                word: count for word, count in analysis.word_frequencies.items() if len(word) > 3
+            },
+        )
+
+    @classmethod
+    def merge(cls, parts: Iterable["ProseStats"]) -> "ProseStats":
+        """Combine the results of consecutive texts."""
+        merged = cls()
+        for part in parts:
+            merged.sentences += part.sentences
+            merged.words += part.words
+            merged.passive += part.passive
+            merged.adverbs += part.adverbs
+            for word, count in part.frequencies.items():
+                merged.frequencies[word] = merged.frequencies.get(word, 0) + count
+        return merged
+
+
+class PacingStats(BaseModel):
+    """Paragraph figures of a text."""
+
+    paragraph_words: list[int] = Field(default_factory=list)  # Words per paragraph
+    dialogue_paragraphs: int = 0
+
+    @classmethod
+    def from_text(cls, text: str) -> "PacingStats":
+        """Summarize one text."""
+        paragraphs = analyze(text).paragraphs
+        return cls(
+            paragraph_words=[words for _, _, words, _ in paragraphs],
+            dialogue_paragraphs=sum(1 for *_, has_dialogue in paragraphs if has_dialogue),
+        )
+
+    @classmethod
+    def merge(cls, parts: Iterable["PacingStats"]) -> "PacingStats":
+        """Combine the results of consecutive texts."""
+        merged = cls()
+        for part in parts:
+            merged.paragraph_words += part.paragraph_words
+            merged.dialogue_paragraphs += part.dialogue_paragraphs
+        return merged
+
+
+class TimelineStats(BaseModel):
+    """Time references in a text, as written."""
+
+    time_references: list[str] = Field(default_factory=list)
+
+    @classmethod
+    def from_text(cls, text: str) -> "TimelineStats":
+        """Summarize one text."""
+        return cls(time_references=[ref for _, ref in analyze(text).time_references])
+
+    @classmethod
+    def merge(cls, parts: Iterable["TimelineStats"]) -> "TimelineStats":
+        """Combine the results of consecutive texts."""
+        return cls(time_references=[ref for part in parts for ref in part.time_references])
+
+
+# Result model of each analysis tool, by the name results are stored under
+ANALYZERS: dict[str, type[ProseStats] | type[PacingStats] | type[TimelineStats]] = {
+    "prose": ProseStats,
+    "pacing": PacingStats,
+    "timeline": TimelineStats,
+}
@@ -0,0 +1,216 @@
+"""Persistent project catalog for fast project listings."""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .models import Project, ProjectSummary
+
+
+class ProjectCatalog:
+    """SQLite index of project summaries.
+
+    The catalog mirrors the header fields of every ``project.json`` so that
+    listings can be sorted and paginated without parsing full projects. Each
+    row remembers the ``mtime_ns`` of the file it was built from, which lets
+    :meth:`refresh` find stale entries with a single ``stat`` per project.
+    """
+
+    SORT_COLUMNS = ("last_edited", "name", "title", "word_count", "created_at")
+
+    def __init__(self, db_path: str | Path):
+        """Initialize the catalog.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS projects (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    genre TEXT NOT NULL,
+                    word_count INTEGER NOT NULL,
+                    character_count INTEGER NOT NULL,
+                    plot_event_count INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_edited TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_projects_last_edited ON projects (last_edited)"
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def upsert(self, project: Project, mtime_ns: int) -> None:
+        """Insert or update the entry for a project.
+
+        Args:
+            project: The project to index
+            mtime_ns: Modification time of the project's ``project.json``
+        """
+        self.upsert_many([(project, mtime_ns)])
+
+    def upsert_many(self, entries: Iterable[tuple[Project, int]]) -> None:
+        """Insert or update several entries in one transaction.
+
+        Args:
+            entries: Pairs of project and ``project.json`` modification time
+        """
+        rows = [self._to_row(project, mtime_ns) for project, mtime_ns in entries]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO projects (
+                    id, name, title, genre, word_count, character_count,
+                    plot_event_count, created_at, last_edited, mtime_ns
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def remove(self, project_id: str) -> None:
+        """Remove a project from the catalog.
+
+        Args:
+            project_id: Project ID
+        """
+        self.remove_many([project_id])
+
+    def remove_many(self, project_ids: Iterable[str]) -> None:
+        """Remove several projects from the catalog.
+
+        Args:
+            project_ids: Project IDs
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM projects WHERE id = ?", [(pid,) for pid in project_ids]
+            )
+
+    def count(self) -> int:
+        """Return the number of catalogued projects."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def query(
+        self,
+        sort: str = "last_edited",
+        descending: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[ProjectSummary]:
+        """Query project summaries.
+
+        Args:
+            sort: Column to sort by (see ``SORT_COLUMNS``)
+            descending: Sort in descending order
+            limit: Maximum number of entries, or None for all
+            offset: Number of entries to skip
+
+        Returns:
+            List of project summaries
+
+        Raises:
+            ValueError: If the sort column is not supported
+        """
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort}")
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT * FROM projects ORDER BY {sort} {direction}, id"
+        params: list[int] = []
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params = [-1 if limit is None else limit, offset]
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def mtimes(self) -> dict[str, int]:
+        """Return the recorded ``project.json`` mtime for every entry."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, mtime_ns FROM projects").fetchall()
+        return {row["id"]: row["mtime_ns"] for row in rows}
+
+    def refresh(self, data_dir: Path, loader: Callable[[str], Project | None]) -> None:
+        """Bring the catalog in line with the projects on disk.
+
+        Only projects whose ``project.json`` mtime differs from the recorded
+        one are reloaded; unchanged projects cost a single ``stat``.
+
+        Args:
+            data_dir: Directory containing the project directories
+            loader: Callable that loads a project by ID
+        """
+        known = self.mtimes()
+        seen: set[str] = set()
+        changed: list[tuple[Project, int]] = []
+
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    mtime_ns = os.stat(Path(entry.path) / "project.json").st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(entry.name)
+                if known.get(entry.name) == mtime_ns:
+                    continue
+                project = loader(entry.name)
+                if project:
+                    changed.append((project, mtime_ns))
+                else:
+                    seen.discard(entry.name)
+
+        if changed:
+            self.upsert_many(changed)
+        missing = [project_id for project_id in known if project_id not in seen]
+        if missing:
+            self.remove_many(missing)
+
+    @staticmethod
+    def _to_row(project: Project, mtime_ns: int) -> tuple:
+        return (
+            project.id,
+            project.name,
+            project.metadata.title,
+            project.metadata.genre,
+            project.metadata.word_count,
+            project.character_count,
+            project.plot_event_count,
+            project.created_at.isoformat(),
+            project.last_edited.isoformat(),
+            mtime_ns,
+        )
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> ProjectSummary:
+        return ProjectSummary(
+            id=row["id"],
+            name=row["name"],
+            title=row["title"],
+            genre=row["genre"],
+            word_count=row["word_count"],
+            character_count=row["character_count"],
+            plot_event_count=row["plot_event_count"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            last_edited=datetime.fromisoformat(row["last_edited"]),
+        )
@@ -0,0 +1,303 @@
+"""Chapter-segmented manuscript storage."""
+
+import uuid
+from pathlib import Path
+from typing import Callable, Iterator
+
+from pydantic import BaseModel, Field
+
+from .counting import CHAPTER_HEADING, ChapterCount, count_text, count_words
+from .storage import atomic_write
+
+
+def split_chapters(text: str) -> list[tuple[str, str]]:
+    """Split manuscript text into segments at chapter headings.
+
+    Text before the first chapter heading (title, front matter) becomes a
+    leading segment with an empty title; it is always present, possibly
+    empty, so chapter ``i`` is segment ``i``. Concatenating the segment
+    texts reproduces the input exactly.
+
+    Args:
+        text: Manuscript content
+
+    Returns:
+        List of (title, text) pairs
+    """
+    stats = count_text(text)
+    return [
+        (chapter.title, text[chapter.offset : chapter.offset + chapter.length])
+        for chapter in stats.chapters
+    ]
+
+
+def is_chapter_text(text: str, index: int) -> bool:
+    """Check that text is exactly one chapter as :func:`split_chapters` sees it.
+
+    Args:
+        text: Chapter text
+        index: Chapter index; the preamble (0) has no heading, every other
+            chapter starts with its own and has no other
+
+    Returns:
+        Whether splitting the text yields just that chapter
+    """
+    segments = split_chapters(text)
+    if index == 0:
+        return len(segments) == 1
+    return len(segments) == 2 and not segments[0][1]
+
+
+def select_chapters(selector: str | int | None, count: int) -> list[int]:
+    """Resolve a chapter selector to chapter indexes.
+
+    Args:
+        selector: A chapter index (``3``), a range (``"2-4"``), a
+            comma-separated list of either (``"1,3-5"``), or None or
+            ``"all"`` for every chapter including the preamble
+        count: Number of chapters, including the preamble
+
+    Returns:
+        Sorted, distinct chapter indexes
+
+    Raises:
+        ValueError: If the selector is malformed or out of range
+    """
+    if selector is None or str(selector).strip().lower() in ("", "all"):
+        return list(range(count))
+
+    selected: set[int] = set()
+    for part in str(selector).split(","):
+        first, _, last = part.strip().partition("-")
+        try:
+            start = int(first)
+            end = int(last) if last else start
+        except ValueError:
+            raise ValueError(f"Invalid chapter selector: {selector!r}") from None
+        if not 0 <= start <= end < count:
+            raise ValueError(f"Chapters {part.strip()} out of range 0-{count - 1}")
+        selected.update(range(start, end + 1))
+    return sorted(selected)
+
+
+class ChapterEntry(ChapterCount):
+    """Manifest entry for a single stored chapter."""
+
+    file: str
+
+
+class ChapterManifest(BaseModel):
+    """Ordered list of chapter files making up a manuscript."""
+
+    chapters: list[ChapterEntry] = Field(default_factory=list)
+
+    @property
+    def word_count(self) -> int:
+        """Total word count across all chapters."""
+        return sum(entry.word_count for entry in self.chapters)
+
+    @property
+    def chapter_count(self) -> int:
+        """Number of chapters, not counting the preamble."""
+        return max(len(self.chapters) - 1, 0)
+
+    def reflow(self) -> None:
+        """Recompute offsets from chapter lengths."""
+        offset = 0
+        for entry in self.chapters:
+            entry.offset = offset
+            offset += entry.length
+
+
+class ChapterStore:
+    """Stores a manuscript as one file per chapter plus a manifest.
+
+    Chapter files live in ``<project>/chapters/`` under stable random names,
+    so inserting or reordering chapters never renames existing files. The
+    manifest records order, offsets, lengths and per-chapter word counts.
+    Entry 0 is the preamble (text before the first chapter heading).
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(
+        self,
+        chapters_dir: Path,
+        commit: Callable[[dict[Path, str]], None] | None = None,
+    ):
+        """Initialize the chapter store.
+
+        Args:
+            chapters_dir: Directory holding the chapter files
+            commit: Callable that writes several files as one unit
+                (defaults to individual atomic writes)
+        """
+        self.chapters_dir = Path(chapters_dir)
+        self.manifest_path = self.chapters_dir / self.MANIFEST_NAME
+        self._commit = commit or self._write_files
+        self._manifest: ChapterManifest | None = None
+
+    def exists(self) -> bool:
+        """Return True if the store has a manifest on disk."""
+        return self.manifest_path.exists()
+
+    @property
+    def manifest(self) -> ChapterManifest:
+        """The chapter manifest, loaded on first access."""
+        if self._manifest is None:
+            if self.manifest_path.exists():
+                self._manifest = ChapterManifest.model_validate_json(self.manifest_path.read_text())
+            else:
+                self._manifest = ChapterManifest()
+        return self._manifest
+
+    def __len__(self) -> int:
+        return len(self.manifest.chapters)
+
+    def create_from_text(self, text: str, remove_old: bool = True) -> None:
+        """Replace the store's contents with a full manuscript.
+
+        Args:
+            text: Manuscript content
+            remove_old: Delete the replaced chapter files right away; pass
+                False when ``commit`` only stages the files, and remove them
+                once they are committed
+        """
+        self.chapters_dir.mkdir(parents=True, exist_ok=True)
+        old_files = [entry.file for entry in self.manifest.chapters]
+
+        manifest = ChapterManifest()
+        files: dict[Path, str] = {}
+        for title, segment in split_chapters(text):
+            entry = self._new_entry(title, segment)
+            manifest.chapters.append(entry)
+            files[self.chapters_dir / entry.file] = segment
+        manifest.reflow()
+
+        self._manifest = manifest
+        files[self.manifest_path] = manifest.model_dump_json(indent=2)
+        self._commit(files)
+        if remove_old:
+            self._remove_files(old_files)
+
+    def read_chapter(self, index: int) -> str:
+        """Read a single chapter.
+
+        Args:
+            index: Chapter index in manifest order
+
+        Returns:
+            Chapter text, including its heading
+        """
+        entry = self.manifest.chapters[index]
+        return (self.chapters_dir / entry.file).read_text(encoding="utf-8")
+
+    def write_chapter(self, index: int, text: str) -> None:
+        """Replace the contents of a single chapter.
+
+        Only the chapter file and the manifest are rewritten.
+
+        Args:
+            index: Chapter index in manifest order
+            text: New chapter text, including its heading
+
+        Raises:
+            ValueError: If the text is not exactly one chapter (see
+                :func:`is_chapter_text`)
+        """
+        entry = self.manifest.chapters[index]
+        if not is_chapter_text(text, index):
+            if index == 0:
+                raise ValueError("The preamble cannot contain a chapter heading")
+            raise ValueError(f"Chapter {index} must start with its heading and contain no other")
+        heading = CHAPTER_HEADING.match(text)
+        entry.title = heading.group(1).strip() if heading else ""
+        entry.length = len(text)
+        entry.word_count = count_words(text)
+        self.manifest.reflow()
+        self._commit(
+            {
+                self.chapters_dir / entry.file: text,
+                self.manifest_path: self.manifest.model_dump_json(indent=2),
+            }
+        )
+
+    def insert_chapter(self, index: int, text: str) -> None:
+        """Insert a new chapter before the given index.
+
+        Args:
+            index: Position of the new chapter
+            text: Chapter text, including its heading
+        """
+        self.chapters_dir.mkdir(parents=True, exist_ok=True)
+        heading = CHAPTER_HEADING.match(text)
+        entry = self._new_entry(heading.group(1).strip() if heading else "", text)
+        self.manifest.chapters.insert(index, entry)
+        self.manifest.reflow()
+        self._commit(
+            {
+                self.chapters_dir / entry.file: text,
+                self.manifest_path: self.manifest.model_dump_json(indent=2),
+            }
+        )
+
+    def delete_chapter(self, index: int) -> None:
+        """Remove a chapter.
+
+        Args:
+            index: Chapter index in manifest order
+        """
+        entry = self.manifest.chapters.pop(index)
+        self.manifest.reflow()
+        self._commit({self.manifest_path: self.manifest.model_dump_json(indent=2)})
+        self._remove_files([entry.file])
+
+    def iter_text(self) -> Iterator[str]:
+        """Stream the assembled manuscript one chapter at a time.
+
+        Yields:
+            Chapter texts in manifest order
+        """
+        for entry in self.manifest.chapters:
+            yield (self.chapters_dir / entry.file).read_text(encoding="utf-8")
+
+    def read_all(self) -> str:
+        """Assemble the full manuscript text."""
+        return "".join(self.iter_text())
+
+    def locate(self, offset: int) -> int:
+        """Find the chapter containing a character offset.
+
+        Args:
+            offset: Character offset in the assembled manuscript
+
+        Returns:
+            Chapter index
+        """
+        chapters = self.manifest.chapters
+        lo, hi = 0, len(chapters) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if chapters[mid].offset <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    @staticmethod
+    def _new_entry(title: str, text: str) -> ChapterEntry:
+        return ChapterEntry(
+            file=f"ch-{uuid.uuid4().hex[:12]}.md",
+            title=title,
+            length=len(text),
+            word_count=count_words(text),
+        )
+
+    def _remove_files(self, names: list[str]) -> None:
+        for name in names:
+            (self.chapters_dir / name).unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_files(files: dict[Path, str]) -> None:
+        for path, data in files.items():
+            atomic_write(path, data)
@@ -1,5 +1,7 @@
 """Interactive chat interface for manuscript editing."""
 
+import asyncio
+import time
 from typing import AsyncIterator, Any
 
 from claude_agent_sdk import (
@@ -10,6 +12,7 @@ from claude_agent_sdk import (
     ToolUseBlock,
     ResultMessage,
     ThinkingBlock,
+    StreamEvent,
 )
 
 from .models import Project
@@ -20,21 +23,27 @@ from .tools import create_storybook_tools
 class ManuscriptChatSession:
     """Interactive chat session for manuscript editing."""
 
-    def __init__(self, project: Project, project_manager: ProjectManager):
+    def __init__(
+        self, project: Project, project_manager: ProjectManager, stream_partial: bool = False
+    ):
         """Initialize the chat session.
 
         Args:
             project: Current project
             project_manager: Project manager instance
+            stream_partial: Also yield ``text_delta`` and ``thinking_delta``
+                events while a reply is being generated
         """
         self.project = project
         self.project_manager = project_manager
-        self.tools = create_storybook_tools()
+        self.stream_partial = stream_partial
+        self.tools = create_storybook_tools(project, project_manager)
         self.client: ClaudeSDKClient | None = None
+        self._awaiting_result = False  # A reply was requested and not read to its end
 
     async def start(self) -> None:
         """Start the chat session."""
-        manuscript_path = self.project.get_manuscript_path(self.project_manager.data_dir)
+        manuscript_path = self.project.get_manuscript_location(self.project_manager.data_dir)
 
         system_prompt = f"""You are an expert manuscript editor working with an author on their fiction manuscript.
 
@@ -54,6 +63,8 @@ Tools available:
 - File tools (Read, Write, Edit) - to read and modify the manuscript
 - track_character - to track character information
 - check_character_consistency - to verify character consistency
+- find_in_manuscript - to find where a name or phrase appears, by chapter and paragraph
+- check_all_characters - to check every tracked character's names at once
 - track_plot_event - to track plot events
 - analyze_plot_timeline - to check timeline consistency
 - analyze_prose_quality - to analyze prose and style
@@ -66,6 +77,8 @@ Guidelines:
 - Make edits only when requested
 - Track important characters and events automatically
 - Use tools proactively to provide better assistance
+- The analysis tools read the manuscript themselves: pass chapters (such as 3 or "2-4")
+  instead of copying text into them
 
 When making edits:
 - Always read the relevant section first
@@ -85,6 +98,8 @@ Remember: You're a collaborative partner in the creative process, not just an au
                 "mcp__storybook__track_character",
                 "mcp__storybook__list_characters",
                 "mcp__storybook__check_character_consistency",
+                "mcp__storybook__find_in_manuscript",
+                "mcp__storybook__check_all_characters",
                 "mcp__storybook__track_plot_event",
                 "mcp__storybook__list_plot_events",
                 "mcp__storybook__analyze_plot_timeline",
@@ -97,6 +112,7 @@ Remember: You're a collaborative partner in the creative process, not just an au
             model="claude-sonnet-4-5",
             permission_mode="default",  # Ask for permission on edits
             continue_conversation=True,
+            include_partial_messages=self.stream_partial,
         )
 
         self.client = ClaudeSDKClient(options)
@@ -105,22 +121,47 @@ Remember: You're a collaborative partner in the creative process, not just an au
     async def send_message(self, message: str) -> AsyncIterator[dict[str, Any]]:
         """Send a message and receive responses.
 
+        With ``stream_partial`` enabled, ``text_delta`` events carry text as
+        it is generated. The finished block still arrives as a ``text`` event
+        with ``streamed`` set, and its content is authoritative: consumers
+        that rendered the deltas should replace them with it.
+
         Args:
             message: User message
 
         Yields:
-            Response events
+            Response events; ``complete`` includes ``time_to_first_token`` and
+            ``time_to_complete`` in seconds
         """
         if not self.client:
             raise RuntimeError("Chat session not started")
 
+        started = time.monotonic()
+        first_token: float | None = None
+        streamed = False  # Deltas sent since the last finished message
+
         await self.client.query(message)
+        self._awaiting_result = True
 
         async for msg in self.client.receive_response():
-            if isinstance(msg, AssistantMessage):
+            if isinstance(msg, StreamEvent):
+                event = msg.event
+                if event.get("type") != "content_block_delta" or msg.parent_tool_use_id:
+                    continue
+                delta = event.get("delta", {})
+                if delta.get("type") == "text_delta":
+                    if first_token is None:
+                        first_token = time.monotonic()
+                    streamed = True
+                    yield {"type": "text_delta", "content": delta["text"]}
+                elif delta.get("type") == "thinking_delta":
+                    yield {"type": "thinking_delta", "content": delta["thinking"]}
+            elif isinstance(msg, AssistantMessage):
                 for block in msg.content:
                     if isinstance(block, TextBlock):
-                        yield {"type": "text", "content": block.text}
+                        if first_token is None:
+                            first_token = time.monotonic()
+                        yield {"type": "text", "content": block.text, "streamed": streamed}
                     elif isinstance(block, ThinkingBlock):
                         yield {"type": "thinking", "content": block.thinking}
                     elif isinstance(block, ToolUseBlock):
@@ -130,16 +171,50 @@ Remember: You're a collaborative partner in the creative process, not just an au
                             "input": block.input,
                             "id": block.id,
                         }
+                streamed = False
             elif isinstance(msg, ResultMessage):
+                self._awaiting_result = False
+                # Save characters and plot events tracked during the turn
+                self.project_manager.flush_entities()
+                finished = time.monotonic()
                 yield {
                     "type": "complete",
                     "cost": msg.total_cost_usd,
                     "turns": msg.num_turns,
                     "session_id": msg.session_id,
+                    "time_to_first_token": (
+                        first_token - started if first_token is not None else None
+                    ),
+                    "time_to_complete": finished - started,
                 }
 
+    async def interrupt(self, timeout: float = 10.0) -> None:
+        """Stop the response currently being generated.
+
+        The rest of the interrupted response is read and discarded up to its
+        result, so the next message does not receive it.
+
+        Args:
+            timeout: Longest time to wait for the interrupted response to end
+        """
+        if not self.client:
+            return
+        await self.client.interrupt()
+        if self._awaiting_result:
+            try:
+                await asyncio.wait_for(self._discard_response(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._awaiting_result = False
+
+    async def _discard_response(self) -> None:
+        # receive_response() ends after the ResultMessage
+        async for _ in self.client.receive_response():
+            pass
+
     async def close(self) -> None:
         """Close the chat session."""
+        self.project_manager.flush_entities()
         if self.client:
             await self.client.__aexit__(None, None, None)
             self.client = None
@@ -0,0 +1,321 @@
+"""Host many chat sessions on one event loop behind a single event stream."""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Protocol
+
+from .events import EventStream
+
+
+class ChatSessionLike(Protocol):
+    """The part of ManuscriptChatSession the host relies on."""
+
+    def send_message(self, message: str) -> AsyncIterator[dict[str, Any]]: ...
+
+    async def interrupt(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+SessionFactory = Callable[[str], Awaitable[ChatSessionLike]]
+
+
+class HostedSession:
+    """One chat session and the turns queued against it."""
+
+    def __init__(self, session_id: str, project_id: str, starting: asyncio.Task):
+        self.session_id = session_id
+        self.project_id = project_id
+        self.starting = starting  # Resolves to the started chat session, or None
+        self.lock = asyncio.Lock()  # One turn at a time per session
+        self.ready = asyncio.Event()  # Cleared while a cancelled turn is drained
+        self.ready.set()
+        self.turns: set[asyncio.Task] = set()
+        self.draining: asyncio.Task | None = None  # The latest cancel, until it finishes
+        self.running = False
+        self.last_active = time.monotonic()
+
+    @property
+    def busy(self) -> bool:
+        """Whether the session is starting or has a turn running or queued."""
+        return not self.starting.done() or bool(self.turns)
+
+    async def close(self) -> None:
+        """Cancel all turns and close the chat session once it has started."""
+        for task in list(self.turns):
+            task.cancel()
+        await asyncio.gather(*self.turns, return_exceptions=True)
+        if self.draining is not None:
+            await asyncio.gather(self.draining, return_exceptions=True)
+        chat = await self.starting
+        if chat is not None:
+            await chat.close()
+
+
+class ChatHost:
+    """Runs chat sessions concurrently, routed by session id.
+
+    Commands arrive as dicts with an ``op`` and a ``session`` id:
+
+    - ``open`` (``project_id``) starts a session
+    - ``send`` (``content``) queues a turn; turns of one session run in order
+    - ``cancel`` stops the running turn and drops queued ones
+    - ``close`` cancels and closes the session
+
+    Every event a session produces is written to the shared stream tagged
+    with its ``session``. At most ``max_concurrent`` turns run at once across
+    all sessions, and sessions idle for ``idle_timeout`` seconds are closed.
+    Starting, cancelling and closing run as tasks of their own, so a slow
+    one never holds up commands for other sessions.
+    """
+
+    def __init__(
+        self,
+        events: EventStream,
+        session_factory: SessionFactory,
+        max_concurrent: int = 8,
+        max_sessions: int = 256,
+        idle_timeout: float = 900.0,
+        translate: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ):
+        """Initialize the chat host.
+
+        Args:
+            events: Stream the sessions' events are written to
+            session_factory: Coroutine creating a started session for a project id
+            max_concurrent: Maximum number of turns running at once
+            max_sessions: Maximum number of open sessions
+            idle_timeout: Seconds without activity before a session is evicted
+            translate: Optional mapping applied to each session event
+        """
+        self.events = events
+        self.session_factory = session_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.translate = translate or (lambda event: event)
+        self.sessions: dict[str, HostedSession] = {}
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._tasks: set[asyncio.Task] = set()  # Cancels and closes in progress
+
+    async def handle(self, command: dict[str, Any]) -> None:
+        """Dispatch one command.
+
+        Args:
+            command: Command dict with ``op`` and ``session`` keys
+        """
+        op = command.get("op")
+        session_id = command.get("session")
+        try:
+            if op == "open":
+                await self.open(session_id, command["project_id"])
+            elif op == "send":
+                self.send(session_id, command.get("content", ""))
+            elif op == "cancel":
+                self.cancel(session_id)
+            elif op == "close":
+                self.close_session(session_id)
+            else:
+                raise ValueError(f"Unknown chat host op: {op}")
+        except OSError:
+            raise
+        except Exception as e:
+            await self._emit(session_id, {"type": "error", "message": str(e)})
+
+    async def open(self, session_id: str, project_id: str) -> asyncio.Task:
+        """Start a session for a project.
+
+        The session starts in the background so a slow start does not hold
+        up other sessions; turns sent meanwhile wait for it. An ``opened``
+        or ``error`` event reports the outcome.
+
+        Returns:
+            The task starting the session
+
+        Raises:
+            ValueError: If the id is taken or the host is full of busy sessions
+        """
+        if session_id in self.sessions:
+            raise ValueError(f"Chat session {session_id} already open")
+        if len(self.sessions) >= self.max_sessions:
+            idle = [s for s in self.sessions.values() if not s.busy]
+            if not idle:
+                raise ValueError("Too many active chat sessions")
+            self._evict(min(idle, key=lambda s: s.last_active))
+
+        starting = asyncio.create_task(self._start(session_id, project_id))
+        self.sessions[session_id] = HostedSession(session_id, project_id, starting)
+        return starting
+
+    def send(self, session_id: str, content: str) -> asyncio.Task:
+        """Queue a turn for a session.
+
+        Returns:
+            The task running the turn
+
+        Raises:
+            ValueError: If the session is not open
+        """
+        session = self._get(session_id)
+        session.last_active = time.monotonic()
+        task = asyncio.create_task(self._run_turn(session, content))
+        session.turns.add(task)
+        task.add_done_callback(session.turns.discard)
+        return task
+
+    def cancel(self, session_id: str) -> asyncio.Task:
+        """Stop a session's running turn and drop its queued turns.
+
+        The turns are cancelled right away; interrupting the session and
+        draining its reply happen in the returned task, which ends with a
+        ``cancelled`` event. Turns sent meanwhile wait for it.
+
+        Raises:
+            ValueError: If the session is not open
+        """
+        session = self._get(session_id)
+        session.ready.clear()
+        turns = list(session.turns)
+        for task in turns:
+            task.cancel()
+        task = self._spawn(
+            session_id, self._drain(session, turns, session.running, session.draining)
+        )
+        session.draining = task
+        return task
+
+    def close_session(self, session_id: str) -> asyncio.Task:
+        """Cancel and close a session.
+
+        The session is forgotten right away and closed in the returned task,
+        which ends with a ``closed`` event.
+
+        Raises:
+            ValueError: If the session is not open
+        """
+        session = self._get(session_id)
+        del self.sessions[session_id]
+        return self._spawn(session_id, self._close(session, "closed"))
+
+    async def evict_idle(self) -> list[str]:
+        """Close sessions idle for longer than ``idle_timeout``.
+
+        Returns:
+            Ids of the evicted sessions
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = [s for s in self.sessions.values() if not s.busy and s.last_active < cutoff]
+        await asyncio.gather(*(self._evict(session) for session in stale))
+        return [s.session_id for s in stale]
+
+    async def run(self, commands: AsyncIterator[dict[str, Any]]) -> None:
+        """Serve commands until the iterator ends, then close every session."""
+        reaper = asyncio.create_task(self._reap())
+        try:
+            async for command in commands:
+                await self.handle(command)
+        finally:
+            reaper.cancel()
+            await self.shutdown()
+
+    async def shutdown(self) -> None:
+        """Close every session and wait for cancels and closes in progress."""
+        for session_id in list(self.sessions):
+            self.close_session(session_id)
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        """Counts of open, busy and running sessions."""
+        sessions = self.sessions.values()
+        return {
+            "sessions": len(self.sessions),
+            "busy": sum(1 for s in sessions if s.busy),
+            "running": sum(1 for s in sessions if s.running),
+        }
+
+    async def _start(self, session_id: str, project_id: str) -> ChatSessionLike | None:
+        try:
+            chat = await self.session_factory(project_id)
+        except Exception as e:
+            self.sessions.pop(session_id, None)
+            await self._emit(session_id, {"type": "error", "message": str(e)})
+            await self._emit(session_id, {"type": "closed"})
+            return None
+        await self._emit(session_id, {"type": "opened", "project_id": project_id})
+        return chat
+
+    async def _run_turn(self, session: HostedSession, content: str) -> None:
+        chat = await session.starting
+        if chat is None:
+            return  # Start failure was already reported
+        await session.ready.wait()
+        async with session.lock, self._slots:
+            session.running = True
+            try:
+                async for event in chat.send_message(content):
+                    await self._emit(session.session_id, self.translate(event))
+            except (asyncio.CancelledError, OSError):
+                raise
+            except Exception as e:
+                await self._emit(session.session_id, {"type": "error", "message": str(e)})
+            finally:
+                session.running = False
+                session.last_active = time.monotonic()
+
+    async def _reap(self) -> None:
+        interval = max(min(self.idle_timeout / 4, 30.0), 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_idle()
+
+    async def _drain(
+        self,
+        session: HostedSession,
+        turns: list[asyncio.Task],
+        was_running: bool,
+        previous: asyncio.Task | None,
+    ) -> None:
+        # Wait for the cancelled turns, then interrupt the reply in progress
+        try:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            await asyncio.gather(*turns, return_exceptions=True)
+            if was_running:
+                chat = await session.starting
+                await chat.interrupt()
+        finally:
+            if session.draining is asyncio.current_task():
+                session.draining = None
+                session.ready.set()
+        await self._emit(session.session_id, {"type": "cancelled"})
+
+    async def _close(self, session: HostedSession, event_type: str) -> None:
+        await session.close()
+        await self._emit(session.session_id, {"type": event_type})
+
+    def _evict(self, session: HostedSession) -> asyncio.Task:
+        del self.sessions[session.session_id]
+        return self._spawn(session.session_id, self._close(session, "evicted"))
+
+    def _spawn(self, session_id: str, work: Awaitable[None]) -> asyncio.Task:
+        # Run a slow per-session command without holding up the command loop
+        task = asyncio.create_task(self._report_errors(session_id, work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _report_errors(self, session_id: str, work: Awaitable[None]) -> None:
+        try:
+            await work
+        except (asyncio.CancelledError, OSError):
+            raise
+        except Exception as e:
+            await self._emit(session_id, {"type": "error", "message": str(e)})
+
+    async def _emit(self, session_id: str | None, event: dict[str, Any]) -> None:
+        await self.events.send({**event, "session": session_id})
+
+    def _get(self, session_id: str) -> HostedSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"Chat session {session_id} not found")
+        return session
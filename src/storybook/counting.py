@@ -0,0 +1,250 @@
+"""Incremental word and chapter counting for manuscripts."""
+
+import re
+from bisect import bisect_right
+from typing import Iterable
+
+from pydantic import BaseModel, Field
+
+# Chapters start at level-two Markdown headings ("## Chapter 1: ...").
+CHAPTER_HEADING = re.compile(r"^##[ \t]+(.*)$", re.MULTILINE)
+
+# Characters outside the Basic Multilingual Plane take two UTF-16 code units
+ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+
+
+class ChapterCount(BaseModel):
+    """Position and word count of one manuscript segment."""
+
+    title: str = ""
+    offset: int = 0  # Character offset in the assembled manuscript
+    length: int = 0
+    word_count: int = 0
+
+
+class ManuscriptStats(BaseModel):
+    """Word and chapter counts for a whole manuscript.
+
+    ``chapters[0]`` is always the preamble (the text before the first
+    chapter heading, possibly empty); every later entry starts with a
+    chapter heading. Words never span lines, which is what allows edits to
+    be counted from the changed lines alone.
+    """
+
+    chapters: list[ChapterCount] = Field(default_factory=lambda: [ChapterCount()])
+
+    @property
+    def word_count(self) -> int:
+        """Total number of words."""
+        return sum(chapter.word_count for chapter in self.chapters)
+
+    @property
+    def chapter_count(self) -> int:
+        """Number of chapters, not counting the preamble."""
+        return len(self.chapters) - 1
+
+    @property
+    def length(self) -> int:
+        """Total length of the manuscript in characters."""
+        return sum(chapter.length for chapter in self.chapters)
+
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words."""
+    return len(text.split())
+
+
+def count_lines(lines: Iterable[str]) -> ManuscriptStats:
+    """Count words and chapters over a stream of lines.
+
+    Only one line is held in memory at a time, so a file object can be
+    passed directly.
+
+    Args:
+        lines: Manuscript lines, including their line endings
+
+    Returns:
+        Manuscript statistics
+    """
+    chapters = [ChapterCount()]
+    current = chapters[0]
+    offset = 0
+
+    for line in lines:
+        heading = CHAPTER_HEADING.match(line)
+        if heading:
+            current = ChapterCount(title=heading.group(1).strip(), offset=offset)
+            chapters.append(current)
+        current.length += len(line)
+        current.word_count += count_words(line)
+        offset += len(line)
+
+    return ManuscriptStats(chapters=chapters)
+
+
+def count_text(text: str) -> ManuscriptStats:
+    """Count words and chapters in manuscript text.
+
+    Args:
+        text: Manuscript content
+
+    Returns:
+        Manuscript statistics
+    """
+    starts = [m.start() for m in CHAPTER_HEADING.finditer(text)]
+    bounds = [0] + starts + [len(text)]
+
+    chapters = []
+    for i in range(len(bounds) - 1):
+        start, end = bounds[i], bounds[i + 1]
+        segment = text[start:end]
+        title = ""
+        if i > 0:
+            title = CHAPTER_HEADING.match(segment).group(1).strip()
+        chapters.append(
+            ChapterCount(
+                title=title, offset=start, length=end - start, word_count=count_words(segment)
+            )
+        )
+    return ManuscriptStats(chapters=chapters)
+
+
+def find_edit(old: str, new: str) -> tuple[int, int, str]:
+    """Find the single region that changed between two texts.
+
+    Args:
+        old: Previous text
+        new: Current text
+
+    Returns:
+        (start, end, replacement) such that
+        ``old[:start] + replacement + old[end:] == new``
+    """
+    limit = min(len(old), len(new))
+
+    # Binary search on slice equality keeps the comparisons in C
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    prefix = lo
+
+    lo, hi = 0, limit - prefix
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid :] == new[len(new) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    suffix = lo
+
+    return prefix, len(old) - suffix, new[prefix : len(new) - suffix]
+
+
+def apply_edit(
+    stats: ManuscriptStats, old_text: str, start: int, end: int, replacement: str
+) -> ManuscriptStats:
+    """Update statistics for an edit using only the changed region.
+
+    The edit is widened to whole lines; the word delta is the difference
+    between the counts of the old and new lines. When the edit adds or
+    removes a chapter heading, only the chapters it touches are recounted.
+
+    Args:
+        stats: Statistics for ``old_text``
+        old_text: Text before the edit
+        start: Start of the replaced range in ``old_text``
+        end: End of the replaced range in ``old_text``
+        replacement: Text that replaces ``old_text[start:end]``
+
+    Returns:
+        Statistics for the edited text
+    """
+    line_start = old_text.rfind("\n", 0, start) + 1
+    newline = old_text.find("\n", end)
+    line_end = len(old_text) if newline == -1 else newline + 1
+
+    old_region = old_text[line_start:line_end]
+    new_region = old_text[line_start:start] + replacement + old_text[end:line_end]
+    delta_len = len(replacement) - (end - start)
+
+    chapters = [chapter.model_copy() for chapter in stats.chapters]
+    offsets = [chapter.offset for chapter in chapters]
+    first = bisect_right(offsets, line_start) - 1
+
+    if not CHAPTER_HEADING.search(old_region) and not CHAPTER_HEADING.search(new_region):
+        chapter = chapters[first]
+        chapter.word_count += count_words(new_region) - count_words(old_region)
+        chapter.length += delta_len
+        for chapter in chapters[first + 1 :]:
+            chapter.offset += delta_len
+        return ManuscriptStats(chapters=chapters)
+
+    # Recount the chapters spanned by the edit
+    last = bisect_right(offsets, max(line_end - 1, line_start)) - 1
+    span_start = chapters[first].offset
+    span_end = chapters[last + 1].offset if last + 1 < len(chapters) else len(old_text)
+    span = old_text[span_start:line_start] + new_region + old_text[line_end:span_end]
+    recounted = count_text(span).chapters
+
+    head = chapters[:first]
+    lead = recounted[0]
+    if first == 0:
+        head.append(lead)
+    elif lead.length:
+        # The chapter's heading was removed; its text joins the previous chapter
+        head[-1].length += lead.length
+        head[-1].word_count += lead.word_count
+
+    for chapter in recounted[1:]:
+        chapter.offset += span_start
+    tail = chapters[last + 1 :]
+    for chapter in tail:
+        chapter.offset += delta_len
+
+    return ManuscriptStats(chapters=head + recounted[1:] + tail)
+
+
+def utf16_to_indexes(pieces: Iterable[str], offsets: list[int]) -> list[int]:
+    """Convert UTF-16 code unit offsets to string indexes.
+
+    JavaScript strings index by UTF-16 code units, so every character
+    outside the Basic Multilingual Plane (most emoji) shifts later offsets
+    by one. Text is read from ``pieces`` only up to the last offset.
+
+    Args:
+        pieces: The text in consecutive parts, such as chapters
+        offsets: Code unit offsets into the joined text
+
+    Returns:
+        String indexes, in the order of ``offsets``
+
+    Raises:
+        ValueError: If an offset falls inside a surrogate pair
+    """
+    targets = iter(sorted(set(offsets)))
+    pending = next(targets, None)
+    indexes: dict[int, int] = {}
+    shift = 0  # Astral characters seen so far
+    base = 0  # Index of the current piece in the joined text
+
+    for piece in pieces:
+        if pending is None:
+            break
+        for match in ASTRAL.finditer(piece):
+            unit = base + match.start() + shift
+            while pending is not None and pending <= unit:
+                indexes[pending] = pending - shift
+                pending = next(targets, None)
+            if pending == unit + 1:
+                raise ValueError(f"Offset {pending} is inside a surrogate pair")
+            shift += 1
+        base += len(piece)
+
+    while pending is not None:
+        indexes[pending] = pending - shift
+        pending = next(targets, None)
+    return [indexes[offset] for offset in offsets]
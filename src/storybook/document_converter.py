@@ -1,27 +1,22 @@
 """Document conversion utilities for importing and exporting manuscripts."""
 
 import re
+from importlib.util import find_spec
 from pathlib import Path
 
-try:
-    from docx import Document
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
+# python-docx and pypdf are slow to import, so they are loaded on first use.
+# find_spec only looks the packages up without importing them.
+DOCX_AVAILABLE = find_spec("docx") is not None
+PDF_AVAILABLE = find_spec("pypdf") is not None or find_spec("PyPDF2") is not None
 
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
 
-try:
-    from pypdf import PdfReader
-
-    PDF_AVAILABLE = True
-except ImportError:
+def _pdf_reader():
+    """Import and return the PdfReader class from pypdf or PyPDF2."""
     try:
-        from PyPDF2 import PdfReader
-
-        PDF_AVAILABLE = True
+        from pypdf import PdfReader
     except ImportError:
-        PDF_AVAILABLE = False
+        from PyPDF2 import PdfReader
+    return PdfReader
 
 
 class DocumentConverter:
@@ -40,6 +35,8 @@ class DocumentConverter:
         if not DOCX_AVAILABLE:
             raise ImportError("python-docx is required for DOCX import")
 
+        from docx import Document
+
         doc = Document(file_path)
         markdown_lines = []
 
@@ -75,7 +72,7 @@ class DocumentConverter:
         if not PDF_AVAILABLE:
             raise ImportError("pypdf or PyPDF2 is required for PDF import")
 
-        reader = PdfReader(file_path)
+        reader = _pdf_reader()(file_path)
         text_lines = []
 
         for page in reader.pages:
@@ -114,6 +111,9 @@ class DocumentConverter:
         if not DOCX_AVAILABLE:
             raise ImportError("python-docx is required for DOCX export")
 
+        from docx import Document
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
         doc = Document()
 
         # Add title if provided
@@ -63,9 +63,13 @@ Provide feedback that is:
 When using tools:
 - Use track_character for each significant character you identify
 - Use track_plot_event for major plot points
-- Use check_character_consistency to verify character names and descriptions
-- Use analyze_prose_quality on representative samples
+- Use check_all_characters to check every tracked character in one pass
+- Use check_character_consistency to verify a single character's name
+- Use find_in_manuscript to locate where a name or phrase appears
+- Use analyze_prose_quality on representative chapters
 - Use detect_pacing_issues on each chapter
+- The analysis tools read the manuscript themselves: pass chapters (such as 3 or
+  "2-4") instead of copying text into them
 
 Always maintain a professional, supportive tone. Remember that you're helping
 the author improve their craft, not rewriting their work."""
@@ -92,7 +96,7 @@ the author improve their craft, not rewriting their work."""
         Yields:
             Review progress messages
         """
-        manuscript_path = project.get_manuscript_path(self.project_manager.data_dir)
+        manuscript_path = project.get_manuscript_location(self.project_manager.data_dir)
 
         # Build the review prompt
         prompt = f"""Please perform a comprehensive editorial review of this manuscript.
@@ -141,6 +145,8 @@ Structure your review as:
                 "mcp__storybook__track_character",
                 "mcp__storybook__list_characters",
                 "mcp__storybook__check_character_consistency",
+                "mcp__storybook__find_in_manuscript",
+                "mcp__storybook__check_all_characters",
                 "mcp__storybook__track_plot_event",
                 "mcp__storybook__list_plot_events",
                 "mcp__storybook__analyze_plot_timeline",
@@ -148,7 +154,7 @@ Structure your review as:
                 "mcp__storybook__detect_pacing_issues",
             ],
             system_prompt=self.FICTION_EDITOR_PROMPT,
-            mcp_servers={"storybook": self.tools},
+            mcp_servers={"storybook": create_storybook_tools(project, self.project_manager)},
             cwd=str(self.project_manager.data_dir),
             model="claude-sonnet-4-5",
             permission_mode="bypassPermissions",
@@ -167,6 +173,8 @@ Structure your review as:
                         elif isinstance(block, ToolUseBlock):
                             yield {"type": "tool_use", "tool": block.name, "input": block.input}
                 elif isinstance(message, ResultMessage):
+                    # Save characters and plot events tracked during the review
+                    self.project_manager.flush_entities()
                     yield {
                         "type": "complete",
                         "cost": message.total_cost_usd,
@@ -185,7 +193,7 @@ Structure your review as:
         Yields:
             Feedback messages
         """
-        manuscript_path = project.get_manuscript_path(self.project_manager.data_dir)
+        manuscript_path = project.get_manuscript_location(self.project_manager.data_dir)
 
         prompt = f"""As a fiction editor, please address this question about the manuscript:
 
@@ -204,12 +212,14 @@ Use the available tools to analyze the text as needed.
                 "Grep",
                 "mcp__storybook__track_character",
                 "mcp__storybook__check_character_consistency",
+                "mcp__storybook__find_in_manuscript",
+                "mcp__storybook__check_all_characters",
                 "mcp__storybook__analyze_plot_timeline",
                 "mcp__storybook__analyze_prose_quality",
                 "mcp__storybook__detect_pacing_issues",
             ],
             system_prompt=self.FICTION_EDITOR_PROMPT,
-            mcp_servers={"storybook": self.tools},
+            mcp_servers={"storybook": create_storybook_tools(project, self.project_manager)},
             cwd=str(self.project_manager.data_dir),
             model="claude-sonnet-4-5",
             permission_mode="bypassPermissions",
@@ -226,4 +236,5 @@ Use the available tools to analyze the text as needed.
                         elif isinstance(block, ToolUseBlock):
                             yield {"type": "tool_use", "tool": block.name}
                 elif isinstance(message, ResultMessage):
+                    self.project_manager.flush_entities()
                     yield {"type": "complete", "cost": message.total_cost_usd}
@@ -0,0 +1,218 @@
+"""Framed event stream shared by the chat and review bridges.
+
+Each frame is a 4-byte big-endian payload length followed by one JSON
+event, so a reader never depends on how the pipe splits the bytes. Every
+event carries a ``seq`` number that increases by one per frame, letting the
+reader detect lost or reordered events.
+
+Text deltas arrive at token rate, so consecutive events that differ only in
+their ``content`` are merged into one frame until ``flush_interval`` seconds
+have passed or ``max_text`` characters have accumulated. Events tagged with
+different ``session`` values are merged independently, so interleaved
+sessions sharing one stream keep their batching. Frames are written
+by one background thread; once more than ``high_water`` bytes are waiting,
+:meth:`EventStream.send` suspends the producer until the reader catches up,
+so a slow consumer stalls the stream instead of growing its buffer.
+"""
+
+import asyncio
+import json
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, BinaryIO, Iterator
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Partial event types whose consecutive deltas are merged into a single
+# frame; complete events such as a finished message are always kept apart
+COALESCED_TYPES = frozenset({"delta", "text_delta", "thinking_delta"})
+
+
+def encode_frame(event: dict[str, Any]) -> bytes:
+    """Encode one event as a length-prefixed frame."""
+    payload = json.dumps(event, separators=(",", ":"), default=str).encode("utf-8")
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ValueError(f"Event of {len(payload)} bytes exceeds frame limit")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def read_events(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    """Read events from a framed stream until it ends.
+
+    Args:
+        stream: Binary stream positioned at a frame boundary
+
+    Yields:
+        Decoded events
+
+    Raises:
+        ValueError: If a frame is truncated or oversized
+    """
+    while True:
+        header = stream.read(FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < FRAME_HEADER.size:
+            raise ValueError("Stream ended inside a frame header")
+        (length,) = FRAME_HEADER.unpack(header)
+        if length > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame of {length} bytes exceeds limit")
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Stream ended inside a frame")
+        yield json.loads(payload)
+
+
+def _mergeable(pending: dict[str, Any], event: dict[str, Any]) -> bool:
+    if pending.keys() != event.keys():
+        return False
+    return all(pending[key] == event[key] for key in pending if key != "content")
+
+
+class EventStream:
+    """Writes events as framed, coalesced, sequence-numbered JSON."""
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        flush_interval: float = 0.05,
+        max_text: int = 4096,
+        high_water: int = 256 * 1024,
+    ):
+        """Initialize the event stream.
+
+        Args:
+            stream: Binary stream to write frames to, e.g. ``sys.stdout.buffer``
+            flush_interval: Longest time a text delta is held back for merging
+            max_text: Characters of merged text that force a flush
+            high_water: Bytes waiting to be written before ``send`` blocks
+        """
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.max_text = max_text
+        self.high_water = high_water
+        self.seq = 0
+        self.frames_written = 0
+
+        # Per session: (merged event, time of first delta, flush timer)
+        self._pending: dict[Any, tuple[dict[str, Any], float, asyncio.TimerHandle]] = {}
+        self._frames: deque[bytes] = deque()
+        self._queued_bytes = 0
+        self._closing = False
+        self._error: OSError | None = None
+        self._condition = threading.Condition()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    async def send(self, event: dict[str, Any]) -> None:
+        """Queue an event, merging it with a pending text delta if possible.
+
+        Waits while more than ``high_water`` bytes are queued.
+
+        Args:
+            event: Event with a ``type`` key; ``seq`` is added on encoding
+
+        Raises:
+            OSError: If the reader has gone away
+        """
+        self._raise_if_failed()
+        channel = event.get("session")
+        if event.get("type") in COALESCED_TYPES and isinstance(event.get("content"), str):
+            pending = self._pending.get(channel)
+            if pending is not None and _mergeable(pending[0], event):
+                pending[0]["content"] += event["content"]
+            else:
+                self._flush_pending(channel)
+                timer = asyncio.get_running_loop().call_later(
+                    self.flush_interval, self._flush_pending, channel
+                )
+                pending = (dict(event), time.monotonic(), timer)
+                self._pending[channel] = pending
+            merged, since, _ = pending
+            if (
+                len(merged["content"]) >= self.max_text
+                or time.monotonic() - since >= self.flush_interval
+            ):
+                self._flush_pending(channel)
+        else:
+            self._flush_pending(channel)
+            self._enqueue(event)
+
+        if self._queued_bytes > self.high_water:
+            await asyncio.to_thread(self._wait_for_room)
+            self._raise_if_failed()
+
+    async def flush(self) -> None:
+        """Write any pending delta and wait until every frame is written."""
+        self._flush_all()
+        await asyncio.to_thread(self._wait_for_room, 0)
+        self._raise_if_failed()
+
+    async def close(self) -> None:
+        """Flush all events and stop the writer thread."""
+        self._flush_all()
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        await asyncio.to_thread(self._writer.join)
+        self._raise_if_failed()
+
+    def _flush_pending(self, channel: Any) -> None:
+        pending = self._pending.pop(channel, None)
+        if pending is not None:
+            event, _, timer = pending
+            timer.cancel()
+            self._enqueue(event)
+
+    def _flush_all(self) -> None:
+        for channel in list(self._pending):
+            self._flush_pending(channel)
+
+    def _enqueue(self, event: dict[str, Any]) -> None:
+        frame = encode_frame({**event, "seq": self.seq})
+        self.seq += 1
+        with self._condition:
+            self._frames.append(frame)
+            self._queued_bytes += len(frame)
+            self._condition.notify_all()
+
+    def _wait_for_room(self, limit: int | None = None) -> None:
+        limit = self.high_water if limit is None else limit
+        with self._condition:
+            while self._queued_bytes > limit and self._error is None:
+                self._condition.wait()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._frames and not self._closing:
+                    self._condition.wait()
+                if not self._frames:
+                    return
+                # Take everything queued so far and write it in one call
+                batch = b"".join(self._frames)
+                count = len(self._frames)
+                self._frames.clear()
+
+            try:
+                self.stream.write(batch)
+                self.stream.flush()
+            except OSError as e:
+                with self._condition:
+                    self._error = e
+                    self._frames.clear()
+                    self._queued_bytes = 0
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._queued_bytes -= len(batch)
+                self.frames_written += count
+                self._condition.notify_all()
@@ -0,0 +1,163 @@
+"""Parallel bulk import of manuscript files into projects."""
+
+import glob
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable
+
+from pydantic import BaseModel
+
+from .document_converter import DocumentConverter
+from .models import ManuscriptMetadata
+from .project_manager import ProjectManager
+
+SUPPORTED_SUFFIXES = {".docx", ".pdf", ".txt", ".md", ".markdown"}
+
+
+class ImportResult(BaseModel):
+    """Outcome of importing one file."""
+
+    path: str
+    name: str
+    project_id: str | None = None
+    size: int = 0  # File size in bytes
+    word_count: int = 0
+    seconds: float = 0.0  # Time spent converting the file
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was imported."""
+        return self.error is None
+
+
+def collect_files(sources: Iterable[str | Path]) -> list[Path]:
+    """Expand directories and glob patterns into a sorted list of files.
+
+    Directories are searched recursively for supported document types.
+    Anything else is treated as a glob pattern (``**`` is supported).
+
+    Args:
+        sources: Directories, files or glob patterns
+
+    Returns:
+        Unique matching files
+    """
+    found: set[Path] = set()
+    for source in sources:
+        path = Path(source).expanduser()
+        if path.is_dir():
+            found.update(
+                p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+            )
+        else:
+            found.update(Path(p) for p in glob.glob(str(path), recursive=True) if Path(p).is_file())
+    return sorted(found)
+
+
+def convert_file(path: str) -> tuple[str | None, str | None, float]:
+    """Convert one document to Markdown (runs in a worker process).
+
+    Args:
+        path: Path to the document
+
+    Returns:
+        (content, error, seconds); exactly one of content and error is set
+    """
+    start = time.perf_counter()
+    try:
+        content = DocumentConverter.import_document(Path(path))
+        return content, None, time.perf_counter() - start
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def bulk_import(
+    project_manager: ProjectManager,
+    files: Iterable[str | Path],
+    workers: int | None = None,
+    batch_size: int = 32,
+    on_result: Callable[[ImportResult], None] | None = None,
+) -> list[ImportResult]:
+    """Import many documents as new projects.
+
+    Documents are converted in a process pool and the resulting projects
+    are created in batches (one journal commit and one catalog transaction
+    per batch). A file that fails to convert is reported and skipped; it
+    never stops the rest of the import.
+
+    Args:
+        project_manager: Project manager to create projects in
+        files: Documents to import; each becomes a project named after its stem
+        workers: Worker processes, None for one per CPU, or 0 to convert in
+            the calling process
+        batch_size: Number of converted documents per project batch
+        on_result: Called with each result once its project is created (or failed)
+
+    Returns:
+        One result per file, in completion order
+    """
+    paths = [Path(f) for f in files]
+    results: list[ImportResult] = []
+    batch: list[tuple[ImportResult, str]] = []
+
+    def report(result: ImportResult) -> None:
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    def flush() -> None:
+        manuscripts = [
+            (result.name, content, ManuscriptMetadata(title=result.name))
+            for result, content in batch
+        ]
+        try:
+            projects = project_manager.create_projects(manuscripts)
+        except Exception as e:
+            for result, _ in batch:
+                result.error = f"{type(e).__name__}: {e}"
+                report(result)
+        else:
+            for (result, _), project in zip(batch, projects):
+                result.project_id = project.id
+                result.word_count = project.metadata.word_count
+                report(result)
+        batch.clear()
+
+    def collect(path: Path, outcome: tuple[str | None, str | None, float]) -> None:
+        content, error, seconds = outcome
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        result = ImportResult(
+            path=str(path), name=path.stem, size=size, seconds=seconds, error=error
+        )
+        if content is None:
+            report(result)
+            return
+        batch.append((result, content))
+        if len(batch) >= batch_size:
+            flush()
+
+    if workers == 0 or len(paths) <= 1:
+        for path in paths:
+            collect(path, convert_file(str(path)))
+    else:
+        max_workers = min(workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures: dict[Future, Path] = {
+                pool.submit(convert_file, str(path)): path for path in paths
+            }
+            for future in as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception as e:  # Worker crashed (e.g. BrokenProcessPool)
+                    outcome = (None, f"{type(e).__name__}: {e}", 0.0)
+                collect(futures[future], outcome)
+
+    if batch:
+        flush()
+    return results
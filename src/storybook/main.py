@@ -1,28 +1,45 @@
 """Main application entry point for Storybook."""
 
+import argparse
 import asyncio
 import sys
+import time
 from pathlib import Path
 
 from .ui import StorybookUI
 from .project_manager import ProjectManager
 from .document_converter import DocumentConverter
-from .editor import LiteraryEditor
-from .chat import ManuscriptChatSession
 from .models import ManuscriptMetadata
 
+# The editor, chat and importer modules pull in the Claude Agent SDK and
+# multiprocessing; they are imported where first needed to keep startup fast.
+
 
 class StorybookApp:
     """Main Storybook application."""
 
-    def __init__(self):
-        """Initialize the application."""
+    def __init__(self, stream_partial: bool = False):
+        """Initialize the application.
+
+        Args:
+            stream_partial: Show chat replies while they are being generated
+        """
+        self.stream_partial = stream_partial
         self.ui = StorybookUI()
         self.project_manager = ProjectManager()
-        self.editor = LiteraryEditor(self.project_manager)
+        self._editor = None
         self.converter = DocumentConverter()
         self.current_project = None
 
+    @property
+    def editor(self):
+        """Literary editor, created on first use."""
+        if self._editor is None:
+            from .editor import LiteraryEditor
+
+            self._editor = LiteraryEditor(self.project_manager)
+        return self._editor
+
     async def run(self) -> None:
         """Run the main application loop."""
         self.ui.show_banner()
@@ -68,7 +85,7 @@ class StorybookApp:
 
     async def open_project(self) -> None:
         """Open an existing project."""
-        projects = self.project_manager.list_projects()
+        projects = self.project_manager.list_project_summaries()
 
         if not projects:
             self.ui.show_message("No projects found. Create a new project first.", "yellow")
@@ -90,7 +107,10 @@ class StorybookApp:
             self.ui.show_error("Project not found.")
             return
 
-        self.current_project = project
+        self.current_project = self.project_manager.load_project(project.id)
+        if not self.current_project:
+            self.ui.show_error("Project not found.")
+            return
         await self.project_menu()
 
     async def import_project(self) -> None:
@@ -134,7 +154,7 @@ class StorybookApp:
 
     async def delete_project(self) -> None:
         """Delete a project."""
-        projects = self.project_manager.list_projects()
+        projects = self.project_manager.list_project_summaries()
 
         if not projects:
             self.ui.show_message("No projects found.", "yellow")
@@ -205,7 +225,11 @@ class StorybookApp:
         self.ui.show_message("Type your message and press Enter. Type 'quit' to exit.", "dim")
         self.ui.print_separator()
 
-        session = ManuscriptChatSession(self.current_project, self.project_manager)
+        from .chat import ManuscriptChatSession
+
+        session = ManuscriptChatSession(
+            self.current_project, self.project_manager, stream_partial=self.stream_partial
+        )
 
         try:
             await session.start()
@@ -229,8 +253,13 @@ class StorybookApp:
                 self.ui.console.print("\n[bold green]Editor:[/bold green]")
 
                 async for event in session.send_message(user_input):
-                    if event["type"] == "text":
-                        self.ui.show_markdown(event["content"])
+                    if event["type"] == "text_delta":
+                        self.ui.console.print(event["content"], end="", markup=False)
+                    elif event["type"] == "text":
+                        if event.get("streamed"):
+                            self.ui.console.print()  # Already shown as it arrived
+                        else:
+                            self.ui.show_markdown(event["content"])
                     elif event["type"] == "thinking":
                         self.ui.show_message(f"[Thinking: {event['content'][:100]}...]", "dim")
                     elif event["type"] == "tool_use":
@@ -239,6 +268,12 @@ class StorybookApp:
                     elif event["type"] == "complete":
                         if event.get("cost"):
                             self.ui.show_message(f"\n[Cost: ${event['cost']:.4f}]", "dim")
+                        if event.get("time_to_first_token") is not None:
+                            self.ui.show_message(
+                                f"[First token {event['time_to_first_token']:.1f}s, "
+                                f"done in {event['time_to_complete']:.1f}s]",
+                                "dim",
+                            )
 
         except Exception as e:
             self.ui.show_error(f"Chat error: {str(e)}")
@@ -350,9 +385,136 @@ class StorybookApp:
         self.ui.show_success("Settings updated!")
 
 
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(prog="storybook", description="AI-powered manuscript editor")
+    parser.add_argument(
+        "--stream", action="store_true", help="Show chat replies while they are being generated"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    history = subparsers.add_parser("history", help="List manuscript revisions of a project")
+    history.add_argument("project", help="Project ID (or its first characters)")
+
+    gc = subparsers.add_parser("gc", help="Compact a project's revision history")
+    gc.add_argument("project", help="Project ID (or its first characters)")
+    gc.add_argument("--keep", type=int, default=None, help="Number of recent revisions to keep")
+
+    bulk = subparsers.add_parser("import", help="Import many documents as new projects")
+    bulk.add_argument("sources", nargs="+", help="Directories, files or glob patterns")
+    bulk.add_argument(
+        "--workers", type=int, default=None, help="Conversion processes (default: one per CPU)"
+    )
+    bulk.add_argument("--batch-size", type=int, default=32, help="Projects created per batch")
+
+    return parser
+
+
+def find_project(project_manager: ProjectManager, project_id: str):
+    """Find a project by full or partial ID.
+
+    Args:
+        project_manager: Project manager instance
+        project_id: Project ID or prefix
+
+    Returns:
+        The project, or None if not found
+    """
+    for summary in project_manager.list_project_summaries():
+        if summary.id.startswith(project_id):
+            return project_manager.load_project(summary.id)
+    return None
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run a non-interactive command.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    ui = StorybookUI()
+    project_manager = ProjectManager()
+
+    if args.command == "import":
+        return run_import(ui, project_manager, args)
+
+    project = find_project(project_manager, args.project)
+    if not project:
+        ui.show_error("Project not found.")
+        return 1
+
+    if args.command == "history":
+        revisions = project_manager.list_revisions(project)
+        if not revisions:
+            ui.show_message("No revisions recorded yet.", "yellow")
+        for revision in revisions:
+            ui.show_message(
+                f"{revision.number:>5}  {revision.timestamp.strftime('%Y-%m-%d %H:%M:%S')}  "
+                f"{revision.size:>10,} chars  {revision.hash[:12]}",
+                "white",
+            )
+    elif args.command == "gc":
+        result = project_manager.compact_revisions(project, keep_last=args.keep)
+        ui.show_success(
+            f"Dropped {result['revisions_dropped']} revisions, "
+            f"removed {result['objects_removed']} objects."
+        )
+    return 0
+
+
+def run_import(ui: StorybookUI, project_manager: ProjectManager, args: argparse.Namespace) -> int:
+    """Run the bulk import command.
+
+    Returns:
+        Process exit code (1 if any file failed)
+    """
+    from .importer import ImportResult, bulk_import, collect_files
+
+    files = collect_files(args.sources)
+    if not files:
+        ui.show_error("No documents found.")
+        return 1
+
+    def show(result: ImportResult) -> None:
+        if result.ok:
+            rate = result.size / result.seconds / 1e6 if result.seconds else 0.0
+            ui.show_message(
+                f"✓ {result.name}  {result.word_count:,} words  "
+                f"{result.seconds:.2f}s ({rate:.1f} MB/s)  {result.project_id[:8]}",
+                "green",
+            )
+        else:
+            ui.show_error(f"{result.path}: {result.error}")
+
+    ui.show_message(f"Importing {len(files)} documents...", "cyan")
+    start = time.perf_counter()
+    results = bulk_import(
+        project_manager, files, workers=args.workers, batch_size=args.batch_size, on_result=show
+    )
+    elapsed = time.perf_counter() - start
+
+    imported = [r for r in results if r.ok]
+    failed = len(results) - len(imported)
+    ui.show_success(
+        f"Imported {len(imported)} of {len(results)} documents in {elapsed:.1f}s "
+        f"({len(results) / elapsed:.1f} files/s, "
+        f"{sum(r.word_count for r in imported):,} words)."
+    )
+    if failed:
+        ui.show_error(f"{failed} documents failed.")
+    return 1 if failed else 0
+
+
 def main() -> None:
     """Main entry point."""
-    app = StorybookApp()
+    args = build_parser().parse_args()
+    if args.command:
+        sys.exit(run_command(args))
+
+    app = StorybookApp(stream_partial=args.stream)
     try:
         asyncio.run(app.run())
     except KeyboardInterrupt:
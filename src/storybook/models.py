@@ -2,7 +2,12 @@
 
 from datetime import datetime
 from pathlib import Path
-from pydantic import BaseModel, Field
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .chapters import ChapterStore
+from .counting import ChapterCount, ManuscriptStats, apply_edit, count_lines, count_text
 
 
 class Character(BaseModel):
@@ -40,10 +45,30 @@ class ManuscriptMetadata(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     last_edited: datetime = Field(default_factory=datetime.now)
     notes: str = ""
+    chapters: list[ChapterCount] = Field(default_factory=list)  # Per-chapter counts
+
+
+class ManuscriptEdit(BaseModel):
+    """Replace ``text[start:end]`` of a manuscript with ``text``.
+
+    Offsets are string indexes; the web editor sends UTF-16 code units,
+    which ``apply_manuscript_patch(..., utf16=True)`` converts.
+    """
+
+    start: int
+    end: int
+    text: str = ""
+
+
+ENTITY_FIELDS = frozenset({"characters", "plot_events"})
 
 
 class Project(BaseModel):
-    """Represents a manuscript project."""
+    """Represents a manuscript project.
+
+    The ``characters`` and ``plot_events`` lists may be deferred (see
+    :meth:`defer_entities`), in which case they are decoded on first access.
+    """
 
     id: str
     name: str
@@ -53,6 +78,119 @@ class Project(BaseModel):
     characters: list[Character] = Field(default_factory=list)
     plot_events: list[PlotEvent] = Field(default_factory=list)
     manuscript_file: str = ""  # Path to the main manuscript file
+    storage_mode: str = "single"  # single (one manuscript file) or chapters
+    manuscript_version: int = 0  # Incremented on every manuscript save
+
+    # Case-folded lookup indexes into the lists above. They are not
+    # serialized; they are rebuilt whenever a project is constructed.
+    _character_index: dict[str, int] = PrivateAttr(default_factory=dict)
+    _alias_index: dict[str, int] = PrivateAttr(default_factory=dict)
+    _event_index: dict[str, int] = PrivateAttr(default_factory=dict)
+    # The lists as last indexed and their lengths then
+    _indexed_characters: tuple[list | None, int] = PrivateAttr(default=(None, 0))
+    _indexed_events: tuple[list | None, int] = PrivateAttr(default=(None, 0))
+    # Decoder for deferred entity lists and their (characters, plot_events) counts
+    _entity_loader: Callable[[], tuple[list[Character], list[PlotEvent]]] | None = PrivateAttr(
+        default=None
+    )
+    _entity_counts: tuple[int, int] = PrivateAttr(default=(0, 0))
+
+    def model_post_init(self, __context: Any) -> None:
+        self.reindex()
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ENTITY_FIELDS and self.__pydantic_private__:
+            if self.__pydantic_private__.get("_entity_loader") is not None:
+                self.load_entities()
+                return self.__dict__[name]
+        return super().__getattr__(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ENTITY_FIELDS:
+            # Decode the other list too, so an assigned list is saved with it
+            self.load_entities()
+        super().__setattr__(name, value)
+
+    def defer_entities(
+        self,
+        loader: Callable[[], tuple[list[Character], list[PlotEvent]]],
+        counts: tuple[int, int],
+    ) -> None:
+        """Replace the entity lists with a loader called on first access.
+
+        Args:
+            loader: Returns the (characters, plot_events) lists
+            counts: Number of characters and plot events the loader returns
+        """
+        self._entity_loader = loader
+        self._entity_counts = counts
+        for name in ENTITY_FIELDS:
+            self.__dict__.pop(name, None)
+
+    def load_entities(self) -> None:
+        """Decode deferred entity lists now."""
+        loader = self._entity_loader
+        if loader is None:
+            return
+        self.__dict__["characters"], self.__dict__["plot_events"] = loader()
+        self._entity_loader = None
+
+    @property
+    def entities_loaded(self) -> bool:
+        """Whether the character and plot event lists are decoded."""
+        return self._entity_loader is None
+
+    @property
+    def character_count(self) -> int:
+        """Number of characters, without decoding deferred lists."""
+        return len(self.characters) if self.entities_loaded else self._entity_counts[0]
+
+    @property
+    def plot_event_count(self) -> int:
+        """Number of plot events, without decoding deferred lists."""
+        return len(self.plot_events) if self.entities_loaded else self._entity_counts[1]
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        if not _excludes_entities(kwargs.get("exclude")):
+            self.load_entities()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        if not _excludes_entities(kwargs.get("exclude")):
+            self.load_entities()
+        return super().model_dump_json(**kwargs)
+
+    def model_copy(self, **kwargs: Any) -> "Project":
+        self.load_entities()
+        return super().model_copy(**kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        # Private attributes only hold derived lookup state, so compare fields
+        if not isinstance(other, Project):
+            return NotImplemented
+        self.load_entities()
+        other.load_entities()
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def __copy__(self) -> "Project":
+        self.load_entities()
+        return super().__copy__()
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> "Project":
+        self.load_entities()
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        self.load_entities()
+        return super().__getstate__()
+
+    def __repr_args__(self):
+        self.load_entities()
+        return super().__repr_args__()
+
+    def __iter__(self):
+        self.load_entities()
+        return super().__iter__()
 
     def get_project_dir(self, base_dir: Path) -> Path:
         """Get the directory for this project."""
@@ -64,39 +202,233 @@ class Project(BaseModel):
             return self.get_project_dir(base_dir) / self.manuscript_file
         return self.get_project_dir(base_dir) / "manuscript.md"
 
+    def get_chapters_dir(self, base_dir: Path) -> Path:
+        """Get the directory holding chapter files in chapters storage mode."""
+        return self.get_project_dir(base_dir) / "chapters"
+
+    def get_manuscript_location(self, base_dir: Path) -> Path:
+        """Get the manuscript file, or the chapters directory in chapters mode."""
+        if self.storage_mode == "chapters":
+            return self.get_chapters_dir(base_dir)
+        return self.get_manuscript_path(base_dir)
+
     def update_word_count(self, base_dir: Path) -> None:
         """Update the word count from the manuscript file."""
+        if self.storage_mode == "chapters":
+            manifest = ChapterStore(self.get_chapters_dir(base_dir)).manifest
+            self.metadata.word_count = manifest.word_count
+            self.metadata.chapter_count = manifest.chapter_count
+            self.metadata.chapters = [
+                ChapterCount(**entry.model_dump(exclude={"file"})) for entry in manifest.chapters
+            ]
+            self.metadata.last_edited = datetime.now()
+            return
+
         manuscript_path = self.get_manuscript_path(base_dir)
         if manuscript_path.exists():
-            content = manuscript_path.read_text()
-            self.metadata.word_count = len(content.split())
-            self.metadata.last_edited = datetime.now()
+            # Stream the file line by line to keep memory bounded
+            with open(manuscript_path, encoding="utf-8") as f:
+                self.set_manuscript_stats(count_lines(f))
+
+    def update_word_count_from_text(self, content: str) -> None:
+        """Update the word count from manuscript content already in memory."""
+        self.set_manuscript_stats(count_text(content))
+
+    def apply_manuscript_edit(self, old_content: str, start: int, end: int, text: str) -> None:
+        """Update word and chapter counts for an edit from the changed region alone.
+
+        Falls back to a full count when the stored statistics do not match
+        ``old_content`` (for example after an edit made outside Storybook).
+
+        Args:
+            old_content: Manuscript content before the edit
+            start: Start of the replaced range
+            end: End of the replaced range
+            text: Replacement text
+        """
+        stats = self.manuscript_stats
+        if stats is None or stats.length != len(old_content):
+            new_content = old_content[:start] + text + old_content[end:]
+            self.update_word_count_from_text(new_content)
+            return
+        self.set_manuscript_stats(apply_edit(stats, old_content, start, end, text))
+
+    @property
+    def manuscript_stats(self) -> ManuscriptStats | None:
+        """Stored per-chapter statistics, or None if never computed."""
+        if not self.metadata.chapters:
+            return None
+        return ManuscriptStats(chapters=self.metadata.chapters)
+
+    def set_manuscript_stats(self, stats: ManuscriptStats) -> None:
+        """Store manuscript statistics in the metadata."""
+        self.metadata.word_count = stats.word_count
+        self.metadata.chapter_count = stats.chapter_count
+        self.metadata.chapters = stats.chapters
+        self.metadata.last_edited = datetime.now()
 
     def add_character(self, character: Character) -> None:
-        """Add a character to the project."""
-        # Check if character already exists
-        for i, char in enumerate(self.characters):
-            if char.name.lower() == character.name.lower():
-                self.characters[i] = character
-                return
-        self.characters.append(character)
+        """Add a character to the project, replacing one with the same name."""
+        self._check_indexes()
+        key = character.name.casefold()
+        index = self._character_index.get(key)
+        if index is None:
+            index = len(self.characters)
+            self.characters.append(character)
+            self._character_index[key] = index
+            for alias in character.aliases:
+                self._alias_index.setdefault(alias.casefold(), index)
+            self._indexed_characters = (self.characters, len(self.characters))
+            return
+
+        previous = self.characters[index]
+        self.characters[index] = character
+        if _folded(previous.aliases) != _folded(character.aliases):
+            self._reindex_aliases()
 
     def add_plot_event(self, event: PlotEvent) -> None:
-        """Add a plot event to the project."""
-        # Check if event already exists
-        for i, evt in enumerate(self.plot_events):
-            if evt.id == event.id:
-                self.plot_events[i] = event
-                return
-        self.plot_events.append(event)
+        """Add a plot event to the project, replacing one with the same id."""
+        self._check_indexes()
+        index = self._event_index.get(event.id)
+        if index is None:
+            self._event_index[event.id] = len(self.plot_events)
+            self.plot_events.append(event)
+            self._indexed_events = (self.plot_events, len(self.plot_events))
+        else:
+            self.plot_events[index] = event
+
+    def rename_character(self, name: str, new_name: str) -> Character | None:
+        """Rename a character, keeping its aliases and other fields.
+
+        Args:
+            name: Current name or alias (case-insensitive)
+            new_name: New name
+
+        Returns:
+            The renamed character, or None if there is no such character
+        """
+        character = self.get_character(name)
+        if character is not None:
+            character.name = new_name
+            self._reindex_characters()
+        return character
+
+    def remove_character(self, name: str) -> Character | None:
+        """Remove a character by name or alias (case-insensitive).
+
+        Returns:
+            The removed character, or None if there is no such character
+        """
+        character = self.get_character(name)
+        if character is not None:
+            self.characters.remove(character)
+            self._reindex_characters()
+        return character
+
+    def remove_plot_event(self, event_id: str) -> PlotEvent | None:
+        """Remove a plot event by id.
+
+        Returns:
+            The removed plot event, or None if there is no such event
+        """
+        event = self.get_plot_event(event_id)
+        if event is not None:
+            self.plot_events.remove(event)
+            self._reindex_events()
+        return event
 
     def get_character(self, name: str) -> Character | None:
-        """Get a character by name."""
-        name_lower = name.lower()
-        for char in self.characters:
-            if char.name.lower() == name_lower or name_lower in [a.lower() for a in char.aliases]:
-                return char
-        return None
+        """Get a character by name or alias (case-insensitive)."""
+        self._check_indexes()
+        key = name.casefold()
+        index = self._character_index.get(key)
+        if index is None:
+            index = self._alias_index.get(key)
+        return None if index is None else self.characters[index]
+
+    def get_plot_event(self, event_id: str) -> PlotEvent | None:
+        """Get a plot event by id."""
+        self._check_indexes()
+        index = self._event_index.get(event_id)
+        return None if index is None else self.plot_events[index]
+
+    def reindex(self) -> None:
+        """Rebuild the character and plot event lookups.
+
+        Changes made through the Project methods, appends and removals on
+        the lists, and reassigned lists are picked up on their own. Call
+        this after replacing list elements or editing an entity's name,
+        aliases or id in place.
+        """
+        self._reindex_characters()
+        self._reindex_events()
+
+    def _check_indexes(self) -> None:
+        # A constant-time check for reassigned lists and changed lengths
+        if not _unchanged(self._indexed_characters, self.characters):
+            self._reindex_characters()
+        if not _unchanged(self._indexed_events, self.plot_events):
+            self._reindex_events()
+
+    def _reindex_characters(self) -> None:
+        self._character_index = {}
+        for index, character in enumerate(self.characters):
+            self._character_index.setdefault(character.name.casefold(), index)
+        self._reindex_aliases()
+
+    def _reindex_aliases(self) -> None:
+        self._alias_index = {}
+        for index, character in enumerate(self.characters):
+            for alias in character.aliases:
+                self._alias_index.setdefault(alias.casefold(), index)
+        self._indexed_characters = (self.characters, len(self.characters))
+
+    def _reindex_events(self) -> None:
+        self._event_index = {}
+        for index, event in enumerate(self.plot_events):
+            self._event_index.setdefault(event.id, index)
+        self._indexed_events = (self.plot_events, len(self.plot_events))
+
+
+def _unchanged(indexed: tuple[list | None, int], current: list) -> bool:
+    return indexed[0] is current and indexed[1] == len(current)
+
+
+def _folded(values: list[str]) -> list[str]:
+    return [value.casefold() for value in values]
+
+
+def _excludes_entities(exclude: Any) -> bool:
+    return exclude is not None and ENTITY_FIELDS <= set(exclude)
+
+
+class ProjectSummary(BaseModel):
+    """Lightweight view of a project used for listings."""
+
+    id: str
+    name: str
+    title: str
+    genre: str = "Fiction"
+    word_count: int = 0
+    character_count: int = 0
+    plot_event_count: int = 0
+    created_at: datetime
+    last_edited: datetime
+
+    @classmethod
+    def from_project(cls, project: Project) -> "ProjectSummary":
+        """Build a summary from a full project."""
+        return cls(
+            id=project.id,
+            name=project.name,
+            title=project.metadata.title,
+            genre=project.metadata.genre,
+            word_count=project.metadata.word_count,
+            character_count=project.character_count,
+            plot_event_count=project.plot_event_count,
+            created_at=project.created_at,
+            last_edited=project.last_edited,
+        )
 
 
 class ReviewSuggestion(BaseModel):
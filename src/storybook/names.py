@@ -0,0 +1,191 @@
+"""Find every character's mentions in one pass over the text.
+
+:class:`NameMatcher` compiles the names and aliases of all characters into
+a single Aho-Corasick automaton. The automaton steps over words rather than
+characters, so a name only ever matches whole words, in any capitalisation,
+with any spacing or line break between its words. A possessive ``'s`` still
+counts as a mention. Checking a whole cast costs one pass over the text
+instead of one pass per name.
+"""
+
+from collections import deque
+from typing import Iterable, Mapping
+
+from pydantic import BaseModel, Field
+
+from .analysis import WORD
+from .models import Character
+
+
+class NameMention(BaseModel):
+    """One mention of a character."""
+
+    character: str
+    name: str  # The tracked name or alias that matched
+    chapter: int
+    offset: int  # Character offset in the manuscript
+    text: str  # The name as written
+
+
+class CharacterMentions(BaseModel):
+    """All mentions of one character."""
+
+    character: str
+    count: int = 0
+    chapters: dict[int, int] = Field(default_factory=dict)  # Chapter -> mentions
+    # Tracked name or alias -> {text as written: occurrences}
+    variants: dict[str, dict[str, int]] = Field(default_factory=dict)
+
+    @property
+    def issues(self) -> list[str]:
+        """Names written with more than one capitalisation."""
+        return [
+            f"Inconsistent capitalization of '{name}': {', '.join(sorted(forms))}"
+            for name, forms in self.variants.items()
+            if len(forms) > 1
+        ]
+
+
+def _word(token: str) -> tuple[str, int]:
+    # Case-fold a word and drop a possessive suffix, so "Sarah's" is "sarah";
+    # also returns how many characters were dropped from the end
+    word = token.casefold()
+    if len(word) > 2 and word.endswith(("'s", "’s")):
+        return word[:-2], 2
+    return word, 0
+
+
+class NameMatcher:
+    """Aho-Corasick automaton over the words of many names."""
+
+    def __init__(self, names: dict[str, list[str]]):
+        """Build the automaton.
+
+        Args:
+            names: Character name -> names to look for (usually the name and
+                its aliases); a name shared by several characters counts for
+                each of them
+        """
+        self.patterns: list[tuple[str, str]] = []  # (character, name)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, int]]] = [[]]  # (pattern, length in words)
+        self.longest = 0
+
+        for character, character_names in names.items():
+            for name in dict.fromkeys(character_names):
+                words = [_word(token)[0] for token in WORD.findall(name)]
+                if words:
+                    self._add(len(self.patterns), words)
+                    self.patterns.append((character, name))
+        self._link()
+
+    @classmethod
+    def from_characters(cls, characters: Iterable[Character]) -> "NameMatcher":
+        """Build a matcher for the names and aliases of characters."""
+        return cls({c.name: [c.name, *c.aliases] for c in characters})
+
+    def scan(self, text: str, chapter: int = 0, offset: int = 0) -> list[NameMention]:
+        """Find all mentions in a text.
+
+        Where names overlap, the leftmost longest one wins: "Sarah Jones"
+        is one mention, not also a mention of "Sarah".
+
+        Args:
+            text: Text to scan
+            chapter: Chapter index to record on the mentions
+            offset: Manuscript offset of the start of ``text``
+
+        Returns:
+            Mentions in text order
+        """
+        # (start, end) of the most recent words, enough for the longest name
+        spans: deque[tuple[int, int]] = deque(maxlen=max(self.longest, 1))
+        candidates = []
+        state = 0
+        for match in WORD.finditer(text):
+            word, dropped = _word(match.group())
+            end = match.end() - dropped
+            spans.append((match.start(), end))
+
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+            for pattern, length in self._out[state]:
+                candidates.append((spans[-length][0], end, pattern))
+
+        mentions = []
+        last = (-1, -1)
+        for start, end, pattern in sorted(candidates, key=lambda c: (c[0], -c[1], c[2])):
+            if start < last[1] and (start, end) != last:
+                continue
+            last = (start, end)
+            character, name = self.patterns[pattern]
+            mentions.append(
+                NameMention(
+                    character=character,
+                    name=name,
+                    chapter=chapter,
+                    offset=offset + start,
+                    text=" ".join(text[start:end].split()),
+                )
+            )
+        return mentions
+
+    def report(
+        self, chapters: list[str] | Mapping[int, str], selected: Iterable[int] | None = None
+    ) -> list[CharacterMentions]:
+        """Count every character's mentions across a manuscript.
+
+        Args:
+            chapters: Chapter texts in order (index 0 is the preamble), or
+                the texts of some chapters by index
+            selected: Indexes of the chapters to scan, or None for all
+
+        Returns:
+            One entry per character, in the order the matcher was built with,
+            including characters that are never mentioned
+        """
+        reports = {
+            character: CharacterMentions(character=character) for character, _ in self.patterns
+        }
+        items = chapters.items() if isinstance(chapters, Mapping) else enumerate(chapters)
+        scanned = None if selected is None else set(selected)
+        for index, text in items:
+            if scanned is not None and index not in scanned:
+                continue
+            for mention in self.scan(text, index):
+                entry = reports[mention.character]
+                entry.count += 1
+                entry.chapters[index] = entry.chapters.get(index, 0) + 1
+                forms = entry.variants.setdefault(mention.name, {})
+                forms[mention.text] = forms.get(mention.text, 0) + 1
+        return list(reports.values())
+
+    def _add(self, pattern: int, words: list[str]) -> None:
+        state = 0
+        for word in words:
+            following = self._goto[state].get(word)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][word] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = following
+        self._out[state].append((pattern, len(words)))
+        self.longest = max(self.longest, len(words))
+
+    def _link(self) -> None:
+        # Breadth-first, so a state's failure target is linked before the state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[following] = target if target != following else 0
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
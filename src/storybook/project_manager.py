@@ -1,25 +1,118 @@
 """Project management for Storybook."""
 
-import json
+import asyncio
+import hashlib
+import os
 import shutil
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
-from .models import Project, ManuscriptMetadata
+from pydantic import BaseModel
+
+from .analysis import ANALYZERS
+from .catalog import ProjectCatalog
+from .chapters import ChapterStore, is_chapter_text, select_chapters, split_chapters
+from .counting import ChapterCount, find_edit, utf16_to_indexes
+from .models import (
+    ENTITY_FIELDS,
+    Character,
+    ManuscriptEdit,
+    ManuscriptMetadata,
+    PlotEvent,
+    Project,
+    ProjectSummary,
+)
+from .names import CharacterMentions, NameMatcher
+from .reader import ManuscriptReader
+from .results import RESULTS_FILE, ResultCache
+from .revisions import Revision, RevisionStore
+from .search import INDEX_FILE, ManuscriptIndex, Posting, digest
+from .serialization import (
+    ENTITIES_FILE,
+    PROJECT_FILE,
+    encode_entities,
+    encode_header,
+    read_project,
+)
+from .storage import WriteJournal
+
+
+class StaleVersionError(ValueError):
+    """Raised when a manuscript patch targets an outdated version."""
+
+
+def _stat_token(paths: list[Path], *extra: object) -> str:
+    parts = [repr(extra)]
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append("-")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+
+
+def _file_version(project_dir: Path) -> tuple[tuple[int, ...], int]:
+    # Cache key covering the header and the entity file, which is saved on
+    # its own by entity flushes, plus the header mtime for the catalog
+    stat = os.stat(project_dir / PROJECT_FILE)
+    version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    try:
+        entities = os.stat(project_dir / ENTITIES_FILE)
+        version += (entities.st_ino, entities.st_mtime_ns, entities.st_size)
+    except FileNotFoundError:
+        pass
+    return version, stat.st_mtime_ns
 
 
 class ProjectManager:
     """Manages manuscript projects."""
 
-    def __init__(self, data_dir: str | Path = "~/.storybook/projects"):
+    def __init__(
+        self,
+        data_dir: str | Path = "~/.storybook/projects",
+        keep_history: bool = True,
+        cache_size: int = 64,
+        text_cache_chars: int = 32 * 1024 * 1024,
+        entity_flush_delay: float = 2.0,
+        result_cache_bytes: int = 16 * 1024 * 1024,
+    ):
         """Initialize the project manager.
 
         Args:
             data_dir: Directory to store project data
+            keep_history: Record a revision on every manuscript save
+            cache_size: Maximum number of parsed projects kept in memory
+            text_cache_chars: Maximum characters of manuscript text kept in memory
+            entity_flush_delay: Seconds that tracked characters and plot events
+                are buffered before being saved
+            result_cache_bytes: Maximum size of each project's stored
+                analysis results
         """
         self.data_dir = Path(data_dir).expanduser()
+        self.keep_history = keep_history
+        self.cache_size = cache_size
+        self.text_cache_chars = text_cache_chars
+        self.entity_flush_delay = entity_flush_delay
+        self.result_cache_bytes = result_cache_bytes
+        # project_id -> (stat of project.json and entities.json, parsed project)
+        self._cache: OrderedDict[str, tuple[tuple[int, ...], Project]] = OrderedDict()
+        # project_id -> (manuscript version token, chapter texts, total length)
+        self._texts: OrderedDict[str, tuple[str, list[str], int]] = OrderedDict()
+        self._revisions: OrderedDict[str, RevisionStore] = OrderedDict()
+        # project_id -> (project, characters by folded name, plot events by
+        # id) tracked but not saved yet, and the pending flush
+        self._unsaved: dict[str, tuple[Project, dict[str, Character], dict[str, PlotEvent]]] = {}
+        self._flush_handle: tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle] | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.journal = WriteJournal(self.data_dir / "journal.wal", self.data_dir)
+        self.journal.recover()
+        self.catalog = ProjectCatalog(self.data_dir / "catalog.db")
 
     def create_project(self, name: str, metadata: ManuscriptMetadata | None = None) -> Project:
         """Create a new project.
@@ -42,12 +135,8 @@ class ProjectManager:
         project_dir = project.get_project_dir(self.data_dir)
         project_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create empty manuscript file
-        manuscript_path = project.get_manuscript_path(self.data_dir)
-        manuscript_path.write_text(f"# {name}\n\n")
-
-        # Save project metadata
-        self._save_project(project)
+        # Save an empty manuscript together with the project metadata
+        self._save_project(project, manuscript=f"# {name}\n\n")
 
         return project
 
@@ -66,17 +155,11 @@ class ProjectManager:
         """
         # Create the project
         project = self.create_project(name, metadata)
-        project_dir = project.get_project_dir(self.data_dir)
-
-        # Copy the manuscript file
-        dest_path = project_dir / "manuscript.md"
-        shutil.copy(manuscript_path, dest_path)
 
-        # Update word count
-        project.update_word_count(self.data_dir)
-
-        # Save project
-        self._save_project(project)
+        # Copy the manuscript and update word count in one commit
+        content = Path(manuscript_path).read_text()
+        project.update_word_count_from_text(content)
+        self._save_project(project, manuscript=content)
 
         return project
 
@@ -87,25 +170,44 @@ class ProjectManager:
             List of all projects
         """
         projects = []
-        for project_dir in self.data_dir.iterdir():
-            if project_dir.is_dir():
-                metadata_file = project_dir / "project.json"
-                if metadata_file.exists():
-                    try:
-                        project = self.load_project(project_dir.name)
-                        if project:
-                            projects.append(project)
-                    except Exception:
-                        # Skip invalid projects
-                        continue
-
-        # Sort by last edited
-        projects.sort(key=lambda p: p.last_edited, reverse=True)
+        for summary in self.list_project_summaries():
+            project = self.load_project(summary.id)
+            if project:
+                projects.append(project)
         return projects
 
+    def list_project_summaries(
+        self,
+        sort: str = "last_edited",
+        descending: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[ProjectSummary]:
+        """List project summaries from the catalog.
+
+        Stale catalog entries are refreshed first, so projects changed by
+        another process are picked up without loading unchanged ones.
+
+        Args:
+            sort: Field to sort by (last_edited, name, title, word_count, created_at)
+            descending: Sort in descending order
+            limit: Maximum number of summaries, or None for all
+            offset: Number of summaries to skip
+
+        Returns:
+            List of project summaries
+        """
+        self.catalog.refresh(self.data_dir, self.load_project)
+        return self.catalog.query(sort=sort, descending=descending, limit=limit, offset=offset)
+
     def load_project(self, project_id: str) -> Project | None:
         """Load a project by ID.
 
+        Parsed projects are kept in a bounded LRU cache and reused while the
+        ``project.json`` and ``entities.json`` inode, mtime and size are
+        unchanged. The cached instance is shared between callers, so changes
+        should be saved or discarded.
+
         Args:
             project_id: Project ID
 
@@ -113,31 +215,259 @@ class ProjectManager:
             The loaded project, or None if not found
         """
         project_dir = self.data_dir / project_id
-        metadata_file = project_dir / "project.json"
-
-        if not metadata_file.exists():
+        try:
+            version, _ = _file_version(project_dir)
+        except OSError:
+            self._cache.pop(project_id, None)
             return None
 
+        cached = self._cache.get(project_id)
+        if cached and cached[0] == version:
+            self.cache_hits += 1
+            self._cache.move_to_end(project_id)
+            return cached[1]
+
+        self.cache_misses += 1
         try:
-            data = json.loads(metadata_file.read_text())
-            return Project(**data)
+            project = read_project(project_dir)
         except Exception:
+            # Deleted or rewritten since the stat; drop any stale entry
+            self._cache.pop(project_id, None)
             return None
 
-    def save_project(self, project: Project) -> None:
+        self._cache_project(project, version)
+        return project
+
+    def cache_info(self) -> dict[str, int]:
+        """Get project cache statistics.
+
+        Returns:
+            Hit and miss counters, current size and capacity
+        """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+        }
+
+    def clear_cache(self) -> None:
+        """Drop all cached projects."""
+        self._cache.clear()
+
+    def version_tokens(self, project: Project) -> dict[str, str]:
+        """Get change tokens for a project's data and its manuscript.
+
+        Tokens come from file metadata only, so they are cheap to compute and
+        change whenever the underlying files are rewritten. Every save goes
+        through an atomic rename, so the inode alone already differs between
+        versions even within one timestamp tick.
+
+        Args:
+            project: The project
+
+        Returns:
+            ``project`` (header and entities) and ``manuscript`` tokens
+        """
+        project_dir = project.get_project_dir(self.data_dir)
+        if project.storage_mode == "chapters":
+            manuscript_files = [self.chapter_store(project).manifest_path]
+        else:
+            manuscript_files = [project.get_manuscript_path(self.data_dir)]
+        return {
+            "project": _stat_token([project_dir / PROJECT_FILE, project_dir / ENTITIES_FILE]),
+            "manuscript": _stat_token(manuscript_files, project.manuscript_version),
+        }
+
+    def _cache_project(self, project: Project, version: tuple[int, ...]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[project.id] = (version, project)
+        self._cache.move_to_end(project.id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def save_project(self, project: Project, manuscript: str | None = None) -> None:
         """Save a project.
 
         Args:
             project: Project to save
+            manuscript: Optional manuscript content committed together with the metadata
         """
         project.last_edited = datetime.now()
-        self._save_project(project)
+        self._save_project(project, manuscript=manuscript)
+
+    def add_character(self, project: Project, character: Character) -> None:
+        """Track a character, replacing one with the same name.
+
+        The save is deferred; see :meth:`flush_entities`.
+
+        Args:
+            project: The project
+            character: Character to add
+        """
+        project.add_character(character)
+        self._buffered(project)[1][character.name.casefold()] = character
+        self._schedule_flush()
+
+    def add_plot_event(self, project: Project, event: PlotEvent) -> None:
+        """Track a plot event, replacing one with the same id.
+
+        The save is deferred; see :meth:`flush_entities`.
+
+        Args:
+            project: The project
+            event: Plot event to add
+        """
+        project.add_plot_event(event)
+        self._buffered(project)[2][event.id] = event
+        self._schedule_flush()
+
+    def flush_entities(self) -> int:
+        """Save tracked characters and plot events that are still buffered.
+
+        Characters and plot events added through :meth:`add_character` and
+        :meth:`add_plot_event` from within an event loop are kept in memory
+        and saved together, once per project, ``entity_flush_delay`` seconds
+        after the first of them or when this is called, typically at the end
+        of an agent turn. Outside an event loop they are saved right away.
+
+        Only ``entities.json`` is written: the buffered entities are merged
+        into the collections on disk, so saves made meanwhile by another
+        manager are kept.
+
+        Returns:
+            Number of projects saved
+        """
+        if self._flush_handle is not None:
+            self._flush_handle[1].cancel()
+            self._flush_handle = None
+        pending, self._unsaved = self._unsaved, {}
+
+        saved = []
+        with self.journal.locked():
+            for project, characters, events in pending.values():
+                project_dir = project.get_project_dir(self.data_dir)
+                try:
+                    current = read_project(project_dir)
+                except (OSError, ValueError):
+                    continue  # Deleted meanwhile
+                for character in characters.values():
+                    current.add_character(character)
+                for event in events.values():
+                    current.add_plot_event(event)
+                self.journal.commit({project_dir / ENTITIES_FILE: encode_entities(current)})
+                saved.append(current)
+
+        self._recache(saved)
+        return len(saved)
+
+    def _buffered(
+        self, project: Project
+    ) -> tuple[Project, dict[str, Character], dict[str, PlotEvent]]:
+        return self._unsaved.setdefault(project.id, (project, {}, {}))
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or self.entity_flush_delay <= 0:
+            self.flush_entities()
+        elif self._flush_handle is None or self._flush_handle[0] is not loop:
+            # Counted from the first buffered change, so a long run of
+            # changes is still saved in bounded time
+            handle = loop.call_later(self.entity_flush_delay, self.flush_entities)
+            self._flush_handle = (loop, handle)
 
-    def _save_project(self, project: Project) -> None:
-        """Internal method to save project metadata."""
+    def create_projects(
+        self, manuscripts: list[tuple[str, str, ManuscriptMetadata | None]]
+    ) -> list[Project]:
+        """Create several projects from manuscript text in one batch.
+
+        All files go through a single journal commit and the catalog is
+        updated in one transaction, which is much cheaper than calling
+        :meth:`create_project` and :meth:`save_manuscript_content` per file.
+
+        Args:
+            manuscripts: (name, content, metadata) for each project
+
+        Returns:
+            The created projects, in input order
+        """
+        projects = []
+        files: dict[Path, str | bytes] = {}
+        for name, content, metadata in manuscripts:
+            project = Project(
+                id=str(uuid.uuid4()),
+                name=name,
+                metadata=metadata or ManuscriptMetadata(title=name),
+            )
+            project.update_word_count_from_text(content)
+            project.get_project_dir(self.data_dir).mkdir(parents=True, exist_ok=True)
+            files.update(self._stage_project(project, manuscript=content))
+            projects.append(project)
+
+        if not projects:
+            return []
+        self.journal.commit(files)
+        self._saved(projects)
+
+        if self.keep_history:
+            for project, (_, content, _) in zip(projects, manuscripts):
+                self.revisions(project).record(content)
+        return projects
+
+    def _save_project(
+        self,
+        project: Project,
+        manuscript: str | None = None,
+        files: dict[Path, str | bytes] | None = None,
+    ) -> None:
+        """Internal method to save project metadata.
+
+        The metadata (and manuscript or other staged files, when given) are
+        committed through the write journal, so they are replaced atomically
+        and together.
+        """
+        self.journal.commit(self._stage_project(project, manuscript, files))
+        self._saved([project])
+
+    def _stage_project(
+        self,
+        project: Project,
+        manuscript: str | None = None,
+        files: dict[Path, str | bytes] | None = None,
+    ) -> dict[Path, str | bytes]:
+        # Entity collections that were never decoded are unchanged and are not rewritten
         project_dir = project.get_project_dir(self.data_dir)
-        metadata_file = project_dir / "project.json"
-        metadata_file.write_text(project.model_dump_json(indent=2))
+        entities_file = project_dir / ENTITIES_FILE
+        files = dict(files or {})
+        files[project_dir / PROJECT_FILE] = encode_header(project)
+        if project.entities_loaded or not entities_file.exists():
+            files[entities_file] = encode_entities(project)
+        if manuscript is not None:
+            files[project.get_manuscript_path(self.data_dir)] = manuscript
+        return files
+
+    def _saved(self, projects: list[Project]) -> None:
+        # Refresh the cache and catalog after a journal commit
+        for project in projects:
+            self._unsaved.pop(project.id, None)
+        self._recache(projects)
+
+    def _recache(self, projects: list[Project]) -> None:
+        entries = []
+        for project in projects:
+            try:
+                version, mtime_ns = _file_version(project.get_project_dir(self.data_dir))
+            except OSError:
+                # Deleted since the commit; never cache a project that is gone
+                self._cache.pop(project.id, None)
+                continue
+            self._cache_project(project, version)
+            entries.append((project, mtime_ns))
+        self.catalog.upsert_many(entries)
 
     def delete_project(self, project_id: str) -> bool:
         """Delete a project.
@@ -151,6 +481,11 @@ class ProjectManager:
         project_dir = self.data_dir / project_id
         if project_dir.exists():
             shutil.rmtree(project_dir)
+            self._cache.pop(project_id, None)
+            self._texts.pop(project_id, None)
+            self._unsaved.pop(project_id, None)
+            self._revisions.pop(project_id, None)
+            self.catalog.remove(project_id)
             return True
         return False
 
@@ -163,11 +498,58 @@ class ProjectManager:
         Returns:
             Manuscript content
         """
+        if project.storage_mode == "chapters":
+            return self.chapter_store(project).read_all()
+
         manuscript_path = project.get_manuscript_path(self.data_dir)
         if manuscript_path.exists():
             return manuscript_path.read_text()
         return ""
 
+    def iter_manuscript_content(self, project: Project) -> Iterator[str]:
+        """Stream the manuscript content in pieces.
+
+        In chapters storage mode one chapter is read at a time, so callers
+        that write the text elsewhere never hold the whole book in memory.
+
+        Args:
+            project: The project
+
+        Yields:
+            Consecutive pieces of the manuscript
+        """
+        if project.storage_mode == "chapters":
+            yield from self.chapter_store(project).iter_text()
+            return
+
+        manuscript_path = project.get_manuscript_path(self.data_dir)
+        if manuscript_path.exists():
+            with open(manuscript_path, encoding="utf-8") as f:
+                while chunk := f.read(1 << 16):
+                    yield chunk
+
+    def open_manuscript(self, project: Project, chapter: int | None = None) -> ManuscriptReader:
+        """Open a memory-mapped reader over the manuscript.
+
+        Args:
+            project: The project
+            chapter: Chapter index to open in chapters storage mode
+
+        Returns:
+            Reader for the manuscript file (or the chapter file); use it as a
+            context manager so the mapping is released
+        """
+        if project.storage_mode == "chapters":
+            if chapter is None:
+                raise ValueError("A chapter index is required in chapters storage mode")
+            store = self.chapter_store(project)
+            return ManuscriptReader(store.chapters_dir / store.manifest.chapters[chapter].file)
+
+        manuscript_path = project.get_manuscript_path(self.data_dir)
+        if not manuscript_path.exists():
+            manuscript_path.touch()
+        return ManuscriptReader(manuscript_path)
+
     def save_manuscript_content(self, project: Project, content: str) -> None:
         """Save manuscript content.
 
@@ -175,10 +557,560 @@ class ProjectManager:
             project: The project
             content: Manuscript content
         """
-        manuscript_path = project.get_manuscript_path(self.data_dir)
-        manuscript_path.write_text(content)
-        project.update_word_count(self.data_dir)
-        self.save_project(project)
+        project.manuscript_version += 1
+        if project.storage_mode == "chapters":
+            self._save_chapters(project, content)
+        else:
+            # Count only the changed region when the previous version is on disk
+            manuscript_path = project.get_manuscript_path(self.data_dir)
+            if project.manuscript_stats is not None and manuscript_path.exists():
+                old_content = manuscript_path.read_text()
+                project.apply_manuscript_edit(old_content, *find_edit(old_content, content))
+            else:
+                project.update_word_count_from_text(content)
+            self.save_project(project, manuscript=content)
+
+        self._update_index(project, content)
+        if self.keep_history:
+            self.revisions(project).record(content)
+
+    def apply_manuscript_patch(
+        self,
+        project: Project,
+        base_version: int,
+        edits: list[ManuscriptEdit | dict],
+        utf16: bool = False,
+    ) -> int:
+        """Apply text edits made against a known manuscript version.
+
+        Edits use offsets into the base version's text and must not overlap.
+        Word and chapter counts are updated for the edited region only; in
+        chapters storage mode only the affected chapter is rewritten when
+        the edits stay inside one chapter.
+
+        Args:
+            project: The project
+            base_version: Manuscript version the edits were made against
+            edits: Edits as ManuscriptEdit objects or dicts with start, end, text
+            utf16: Offsets count UTF-16 code units, as JavaScript string
+                indexes do, instead of characters
+
+        Returns:
+            The new manuscript version
+
+        Raises:
+            StaleVersionError: If the manuscript changed since ``base_version``
+            ValueError: If an edit is out of range, edits overlap or a UTF-16
+                offset splits a character
+        """
+        edits = sorted(
+            (ManuscriptEdit.model_validate(edit) for edit in edits), key=lambda e: e.start
+        )
+        # Check the version on disk and commit under one journal lock, so
+        # another manager cannot save between the check and the commit
+        with self.journal.locked():
+            self._refresh_header(project)
+            if base_version != project.manuscript_version:
+                raise StaleVersionError(
+                    f"Manuscript is at version {project.manuscript_version}, "
+                    f"patch is based on version {base_version}"
+                )
+            if not edits:
+                return project.manuscript_version
+            return self._apply_patch(project, edits, utf16)
+
+    def _refresh_header(self, project: Project) -> None:
+        # Another manager or process may have saved since this instance was
+        # loaded; take its header fields, keeping the entity collections
+        header_file = project.get_project_dir(self.data_dir) / PROJECT_FILE
+        current = Project.model_validate_json(header_file.read_bytes())
+        if current.manuscript_version != project.manuscript_version:
+            for name in Project.model_fields.keys() - ENTITY_FIELDS:
+                setattr(project, name, getattr(current, name))
+
+    def _apply_patch(self, project: Project, edits: list[ManuscriptEdit], utf16: bool) -> int:
+        # Apply validated, sorted edits; the caller holds the journal lock
+
+        chapters = project.storage_mode == "chapters"
+        if chapters:
+            store = self.chapter_store(project)
+            last = store.manifest.chapters[-1]
+            length = last.offset + last.length
+            pieces = self._cached_texts(project) or (
+                store.read_chapter(index) for index in range(len(store))
+            )
+        else:
+            base = self.get_manuscript_content(project)
+            length = len(base)
+            pieces = [base]
+
+        if utf16:
+            offsets = [offset for edit in edits for offset in (edit.start, edit.end)]
+            indexes = iter(utf16_to_indexes(pieces, offsets))
+            edits = [
+                ManuscriptEdit(start=next(indexes), end=next(indexes), text=edit.text)
+                for edit in edits
+            ]
+
+        position = 0
+        for edit in edits:
+            if edit.start < position or edit.end < edit.start or edit.end > length:
+                raise ValueError(f"Invalid or overlapping edit at {edit.start}-{edit.end}")
+            position = edit.end
+
+        def splice(text: str, offset: int) -> str:
+            # Apply the edits to text that starts at the given manuscript offset
+            pieces = []
+            position = offset
+            for edit in edits:
+                pieces.append(text[position - offset : edit.start - offset])
+                pieces.append(edit.text)
+                position = edit.end
+            pieces.append(text[position - offset :])
+            return "".join(pieces)
+
+        if chapters:
+            index = store.locate(edits[0].start)
+            entry = store.manifest.chapters[index]
+            if edits[-1].end <= entry.offset + entry.length:
+                text = splice(store.read_chapter(index), entry.offset)
+                # The chapter must keep exactly its own heading (none for the preamble)
+                if is_chapter_text(text, index):
+                    self.write_chapter(project, index, text)
+                    return project.manuscript_version
+            # The edits span chapters or add or remove headings
+            self.save_manuscript_content(project, splice(store.read_all(), 0))
+            return project.manuscript_version
+
+        # Count only the edited region: from the first edit's start to the last edit's end
+        start, end = edits[0].start, edits[-1].end
+        content = splice(base, 0)
+        replacement = content[start : len(content) - (length - end)]
+        project.manuscript_version += 1
+        project.apply_manuscript_edit(base, start, end, replacement)
+        self.save_project(project, manuscript=content)
+        self._update_index(project, content)
+        if self.keep_history:
+            self.revisions(project).record(content)
+        return project.manuscript_version
+
+    def revisions(self, project: Project) -> RevisionStore:
+        """Get the manuscript revision store for a project.
+
+        Stores are kept per project (up to ``cache_size``), so each save
+        reuses the newest revision's text and chain depth instead of
+        rereading the revision log.
+
+        Args:
+            project: The project
+
+        Returns:
+            Revision store in the project's ``.revisions`` directory
+        """
+        store = self._revisions.get(project.id)
+        if store is None:
+            store = RevisionStore(project.get_project_dir(self.data_dir) / ".revisions")
+            self._revisions[project.id] = store
+            while len(self._revisions) > max(self.cache_size, 1):
+                self._revisions.popitem(last=False)
+        self._revisions.move_to_end(project.id)
+        return store
+
+    def list_revisions(self, project: Project) -> list[Revision]:
+        """List the saved manuscript revisions of a project, oldest first.
+
+        Args:
+            project: The project
+
+        Returns:
+            List of revisions
+        """
+        return self.revisions(project).list_revisions()
+
+    def get_revision(self, project: Project, number: int) -> str:
+        """Get the manuscript content of a revision.
+
+        Args:
+            project: The project
+            number: Revision number
+
+        Returns:
+            Manuscript content at that revision
+        """
+        return self.revisions(project).get(number)
+
+    def compact_revisions(self, project: Project, keep_last: int | None = None) -> dict[str, int]:
+        """Drop old revisions and remove unreferenced revision objects.
+
+        Args:
+            project: The project
+            keep_last: Number of most recent revisions to keep, or None for all
+
+        Returns:
+            Counts of revisions dropped and objects removed
+        """
+        return self.revisions(project).compact(keep_last)
+
+    def search_index(self, project: Project, refresh: bool = True) -> ManuscriptIndex:
+        """Open the positional word index of a project's manuscript.
+
+        The index is built on first use and kept up to date by every
+        manuscript save made through this manager. Changes made behind its
+        back (an editor writing the file directly) are picked up here: only
+        the chapters whose text changed are re-analyzed.
+
+        Args:
+            project: The project
+            refresh: Build or refresh the index if it is missing or stale
+
+        Returns:
+            Index in the project's ``.index.db``; close it when done
+        """
+        index = ManuscriptIndex(project.get_project_dir(self.data_dir) / INDEX_FILE)
+        if refresh:
+            source = self.version_tokens(project)["manuscript"]
+            if index.source != source:
+                index.update(self.chapter_texts(project), source)
+        return index
+
+    def find_in_manuscript(
+        self, project: Project, query: str, limit: int | None = None
+    ) -> list[Posting]:
+        """Find where a word or phrase appears in the manuscript, ignoring case.
+
+        Args:
+            project: The project
+            query: Word or phrase, e.g. a character name
+            limit: Maximum number of occurrences to return
+
+        Returns:
+            Occurrences with chapter, paragraph and offset, in manuscript order
+        """
+        with self.search_index(project) as index:
+            return index.lookup(query, limit)
+
+    def character_mentions(self, project: Project) -> list[CharacterMentions]:
+        """Count the mentions of every tracked character in the manuscript.
+
+        All names and aliases are matched together in a single pass over
+        each chapter.
+
+        Args:
+            project: The project
+
+        Returns:
+            One entry per character with mentions per chapter and the ways
+            each name is written
+        """
+        matcher = NameMatcher.from_characters(project.characters)
+        if not matcher.patterns:
+            return []
+        return matcher.report(self.chapter_texts(project))
+
+    def analysis_results(
+        self, project: Project, analyzer: str, selector: str | int | None = None
+    ) -> list[BaseModel]:
+        """Get an analysis tool's results for each selected chapter.
+
+        Results are stored in the project's ``.analysis.db`` by chapter text
+        and analyzer version, so only chapters edited since they were last
+        analyzed are analyzed again.
+
+        Args:
+            project: The project
+            analyzer: Name of the analysis, a key of :data:`~storybook.analysis.ANALYZERS`
+            selector: Chapter selector as accepted by
+                :func:`~storybook.chapters.select_chapters`, or None for all chapters
+
+        Returns:
+            One result per selected chapter, in chapter order
+
+        Raises:
+            ValueError: If the selector is malformed or out of range
+        """
+        model = ANALYZERS[analyzer]
+        chapters = list(self.read_chapters(project, selector).values())
+        keys = [digest(text) for text in chapters]
+
+        db_path = project.get_project_dir(self.data_dir) / RESULTS_FILE
+        with ResultCache(db_path, self.result_cache_bytes) as cache:
+            results = cache.get_many(analyzer, keys)
+            computed = {
+                key: model.from_text(text)
+                for key, text in zip(keys, chapters)
+                if key not in results
+            }
+            cache.put_many(analyzer, computed)
+        results.update(computed)
+        return [results[key] for key in keys]
+
+    def chapter_texts(self, project: Project) -> list[str]:
+        """Get the manuscript text split into chapters.
+
+        Texts are kept in a bounded in-process cache shared by the tools,
+        the search index and the web API, and reused while the manuscript's
+        version token is unchanged.
+
+        Args:
+            project: The project
+
+        Returns:
+            Chapter texts in order; index 0 is the preamble
+        """
+        cached = self._cached_texts(project)
+        if cached is not None:
+            return list(cached)
+
+        if project.storage_mode == "chapters":
+            texts = list(self.chapter_store(project).iter_text())
+        else:
+            texts = [text for _, text in split_chapters(self.get_manuscript_content(project))]
+        self._cache_texts(project, texts)
+        return list(texts)
+
+    def chapter_count(self, project: Project) -> int:
+        """Get the number of chapters, including the preamble.
+
+        Args:
+            project: The project
+
+        Returns:
+            Number of chapters
+        """
+        cached = self._cached_texts(project)
+        if cached is not None:
+            return len(cached)
+        if project.storage_mode == "chapters":
+            return len(self.chapter_store(project))
+        with self.open_manuscript(project) as reader:
+            return len(reader.chapter_spans())
+
+    def read_chapters(self, project: Project, selector: str | int | None = None) -> dict[int, str]:
+        """Read the chapters picked by a selector.
+
+        Only the selected chapters are read: from the text cache when it is
+        current, otherwise from their chapter files in chapters storage mode
+        or as byte ranges of the memory-mapped manuscript.
+
+        Args:
+            project: The project
+            selector: Chapter selector as accepted by
+                :func:`~storybook.chapters.select_chapters`, or None for all chapters
+
+        Returns:
+            Chapter texts by index, in chapter order
+
+        Raises:
+            ValueError: If the selector is malformed or out of range
+        """
+        cached = self._cached_texts(project)
+        if cached is not None:
+            return {index: cached[index] for index in select_chapters(selector, len(cached))}
+        if project.storage_mode == "chapters":
+            store = self.chapter_store(project)
+            selected = select_chapters(selector, len(store))
+            return {index: store.read_chapter(index) for index in selected}
+        with self.open_manuscript(project) as reader:
+            spans = reader.chapter_spans()
+            return {
+                index: reader.read_text(spans[index][0], spans[index][1])
+                for index in select_chapters(selector, len(spans))
+            }
+
+    def _cached_texts(self, project: Project) -> list[str] | None:
+        cached = self._texts.get(project.id)
+        if cached and cached[0] == self.version_tokens(project)["manuscript"]:
+            self._texts.move_to_end(project.id)
+            return cached[1]
+        return None
+
+    def _cache_texts(self, project: Project, texts: list[str]) -> None:
+        size = sum(len(text) for text in texts)
+        self._texts.pop(project.id, None)
+        if size > self.text_cache_chars:
+            return
+        token = self.version_tokens(project)["manuscript"]
+        self._texts[project.id] = (token, texts, size)
+        total = sum(entry[2] for entry in self._texts.values())
+        while total > self.text_cache_chars:
+            _, (_, _, evicted) = self._texts.popitem(last=False)
+            total -= evicted
+
+    def _update_index(self, project: Project, content: str) -> None:
+        # Indexes are built lazily; once one exists, keep it current on save.
+        # Likewise, refresh cached text only for projects already in use.
+        indexed = (project.get_project_dir(self.data_dir) / INDEX_FILE).exists()
+        if not indexed and project.id not in self._texts:
+            return
+        segments = [segment for _, segment in split_chapters(content)]
+        self._cache_texts(project, segments)
+        if indexed:
+            with self.search_index(project, refresh=False) as index:
+                index.update(segments, self.version_tokens(project)["manuscript"])
+
+    def chapter_store(self, project: Project, commit=None) -> ChapterStore:
+        """Get the chapter store for a project.
+
+        Args:
+            project: The project
+            commit: Optional callable that receives the files to write
+
+        Returns:
+            Chapter store backed by the write journal
+        """
+        return ChapterStore(project.get_chapters_dir(self.data_dir), commit or self.journal.commit)
+
+    def enable_chapter_storage(self, project: Project) -> None:
+        """Convert a project to chapters storage mode.
+
+        The manuscript is split at chapter headings into one file per
+        chapter and the single manuscript file is removed.
+
+        Args:
+            project: The project
+        """
+        if project.storage_mode == "chapters":
+            return
+
+        content = self.get_manuscript_content(project)
+        # Commit the chapter files, manifest and header together
+        staged: dict[Path, str] = {}
+        store = self.chapter_store(project, commit=staged.update)
+        old_files = self._chapter_files(store)
+        store.create_from_text(content, remove_old=False)
+        project.storage_mode = "chapters"
+        self._apply_manifest_counts(project, store)
+        project.metadata.last_edited = project.last_edited = datetime.now()
+        self._save_project(project, files=staged)
+        self._remove_files(old_files)
+        project.get_manuscript_path(self.data_dir).unlink(missing_ok=True)
+
+    def read_chapter(self, project: Project, index: int) -> str:
+        """Read one chapter of a project.
+
+        In single-file mode only the chapter's byte range is read from a
+        memory-mapped manuscript. Index 0 is the preamble before the first
+        chapter heading.
+
+        Args:
+            project: The project
+            index: Chapter index
+
+        Returns:
+            Chapter text
+        """
+        if project.storage_mode == "chapters":
+            return self.chapter_store(project).read_chapter(index)
+
+        with self.open_manuscript(project) as reader:
+            start, end, _ = reader.chapter_spans()[index]
+            return reader.read_text(start, end)
+
+    def write_chapter(self, project: Project, index: int, text: str) -> None:
+        """Replace one chapter of a project in chapters storage mode.
+
+        Only the chapter file, the manifest and ``project.json`` are
+        rewritten, in a single journaled commit, and a revision is recorded
+        as for any other manuscript save. Writing a chapter's current text
+        again changes nothing.
+
+        Args:
+            project: The project
+            index: Chapter index in manifest order
+            text: New chapter text, including its heading
+
+        Raises:
+            ValueError: If the project is not in chapters storage mode or the
+                text is not exactly one chapter
+        """
+        self._require_chapter_mode(project)
+        # A stale index or text cache entry is left to be refreshed as a whole
+        token = self.version_tokens(project)["manuscript"]
+        indexed = False
+        if (project.get_project_dir(self.data_dir) / INDEX_FILE).exists():
+            with self.search_index(project, refresh=False) as search:
+                indexed = search.source == token
+        cached = self._texts.get(project.id)
+        texts = list(cached[1]) if cached and cached[0] == token else None
+
+        staged: dict[Path, str] = {}
+        store = self.chapter_store(project, commit=staged.update)
+        offset = store.manifest.chapters[index].offset
+        old_text = store.read_chapter(index)
+        if old_text == text:
+            return
+        last = store.manifest.chapters[-1]
+        old_length = last.offset + last.length
+        store.write_chapter(index, text)
+        project.manuscript_version += 1
+        self._apply_manifest_counts(project, store)
+        project.last_edited = datetime.now()
+        self._save_project(project, files=staged)
+
+        if texts is not None:
+            texts[index] = text
+            self._cache_texts(project, texts)
+        if indexed:
+            with self.search_index(project, refresh=False) as search:
+                search.replace_chapter(index, text, self.version_tokens(project)["manuscript"])
+        if self.keep_history:
+            self._record_chapter_edit(project, offset, old_text, text, old_length)
+
+    def _record_chapter_edit(
+        self, project: Project, offset: int, old_text: str, text: str, old_length: int
+    ) -> None:
+        # Build the revision from the newest one in memory; assemble the
+        # manuscript only if that revision is not the text before this write
+        revisions = self.revisions(project)
+        try:
+            revisions.record_edit(offset, offset + len(old_text), old_text, text, old_length)
+        except (ValueError, KeyError):
+            revisions.record(self.get_manuscript_content(project))
+
+    def _save_chapters(self, project: Project, content: str) -> None:
+        """Save full manuscript content in chapters mode, rewriting only changed chapters."""
+        staged: dict[Path, str] = {}
+        store = self.chapter_store(project, commit=staged.update)
+        segments = split_chapters(content)
+        old_files: list[Path] = []
+
+        if len(segments) == len(store):
+            for index, (_, segment) in enumerate(segments):
+                entry = store.manifest.chapters[index]
+                if entry.length != len(segment) or store.read_chapter(index) != segment:
+                    store.write_chapter(index, segment)
+        else:
+            # The re-split is committed together with the header
+            old_files = self._chapter_files(store)
+            store.create_from_text(content, remove_old=False)
+
+        self._apply_manifest_counts(project, store)
+        project.last_edited = datetime.now()
+        self._save_project(project, files=staged)
+        self._remove_files(old_files)
+
+    @staticmethod
+    def _chapter_files(store: ChapterStore) -> list[Path]:
+        return [store.chapters_dir / entry.file for entry in store.manifest.chapters]
+
+    @staticmethod
+    def _remove_files(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _apply_manifest_counts(project: Project, store: ChapterStore) -> None:
+        project.metadata.word_count = store.manifest.word_count
+        project.metadata.chapter_count = store.manifest.chapter_count
+        project.metadata.chapters = [
+            ChapterCount(**entry.model_dump(exclude={"file"})) for entry in store.manifest.chapters
+        ]
+        project.metadata.last_edited = datetime.now()
+
+    @staticmethod
+    def _require_chapter_mode(project: Project) -> None:
+        if project.storage_mode != "chapters":
+            raise ValueError(f"Project {project.id} does not use chapters storage mode")
 
     def export_project(self, project: Project, export_path: Path, format: str = "md") -> None:
         """Export a project to a file.
@@ -0,0 +1,185 @@
+"""Memory-mapped, range-addressable manuscript reader."""
+
+import mmap
+import re
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+# Byte-level equivalents of the patterns in counting.py
+_CHAPTER_HEADING = re.compile(rb"^##[ \t]+(.*)$", re.MULTILINE)
+_PARAGRAPH_BREAK = re.compile(rb"\n[ \t]*\n\s*")
+_WHITESPACE = b" \t\r\n\f\v"
+
+
+class ManuscriptReader:
+    """Read ranges of a manuscript file without loading it into a string.
+
+    The file is memory-mapped, so byte ranges, line ranges, chapter spans
+    and paragraphs are served straight from the page cache. Methods that
+    return ``memoryview`` objects do not copy; release them (or let them go
+    out of scope) before calling :meth:`close`.
+
+    Example:
+        with ManuscriptReader(path) as reader:
+            for start, end, title in reader.chapter_spans():
+                print(title, reader.read_text(start, end)[:40])
+    """
+
+    def __init__(self, path: str | Path):
+        """Open and map a manuscript file.
+
+        Args:
+            path: Path to the manuscript file
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self.size = self.path.stat().st_size
+        # Empty files cannot be mapped
+        self._map: mmap.mmap | bytes = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        )
+        self._line_starts: array | None = None
+
+    def __enter__(self) -> "ManuscriptReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def view(self, start: int = 0, end: int | None = None) -> memoryview:
+        """Get a zero-copy view of a byte range.
+
+        Args:
+            start: Start byte offset
+            end: End byte offset (exclusive), or None for end of file
+
+        Returns:
+            Memory view over the mapped bytes
+        """
+        end = self.size if end is None else min(end, self.size)
+        return memoryview(self._map)[start:end]
+
+    def read_bytes(self, start: int = 0, end: int | None = None) -> bytes:
+        """Read a byte range.
+
+        Args:
+            start: Start byte offset
+            end: End byte offset (exclusive), or None for end of file
+
+        Returns:
+            The bytes in the range
+        """
+        end = self.size if end is None else min(end, self.size)
+        return self._map[start:end]
+
+    def read_text(self, start: int = 0, end: int | None = None) -> str:
+        """Read and decode a byte range.
+
+        Args:
+            start: Start byte offset
+            end: End byte offset (exclusive), or None for end of file
+
+        Returns:
+            The decoded text
+        """
+        return self.read_bytes(start, end).decode("utf-8", errors="replace")
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the file."""
+        return len(self._line_index())
+
+    def line_offset(self, line: int) -> int:
+        """Get the byte offset where a line starts.
+
+        Args:
+            line: Zero-based line number (may equal ``line_count`` for end of file)
+
+        Returns:
+            Byte offset
+        """
+        starts = self._line_index()
+        return starts[line] if line < len(starts) else self.size
+
+    def read_lines(self, start: int, end: int | None = None) -> str:
+        """Read a range of lines.
+
+        Args:
+            start: First line (zero-based)
+            end: Line to stop before, or None for end of file
+
+        Returns:
+            The lines, including line endings
+        """
+        end = self.line_count if end is None else end
+        return self.read_text(self.line_offset(start), self.line_offset(end))
+
+    def chapter_spans(self) -> list[tuple[int, int, str]]:
+        """Find the byte spans of the preamble and every chapter.
+
+        Entry 0 is always the preamble (possibly empty), matching
+        :func:`storybook.counting.count_text`.
+
+        Returns:
+            List of (start, end, title) tuples
+        """
+        spans = [[0, 0, ""]]
+        for match in _CHAPTER_HEADING.finditer(self._map):
+            spans[-1][1] = match.start()
+            title = match.group(1).decode("utf-8", errors="replace").strip()
+            spans.append([match.start(), 0, title])
+        spans[-1][1] = self.size
+        return [tuple(span) for span in spans]
+
+    def iter_paragraphs(self, start: int = 0, end: int | None = None) -> Iterator[memoryview]:
+        """Iterate over paragraphs without copying them.
+
+        Paragraphs are separated by blank lines and trimmed of surrounding
+        whitespace; empty paragraphs are skipped.
+
+        Args:
+            start: Start byte offset
+            end: End byte offset, or None for end of file
+
+        Yields:
+            Memory views over each paragraph's bytes
+        """
+        end = self.size if end is None else min(end, self.size)
+        position = start
+        for match in _PARAGRAPH_BREAK.finditer(self._map, start, end):
+            paragraph = self._trimmed_view(position, match.start())
+            if paragraph is not None:
+                yield paragraph
+            position = match.end()
+        paragraph = self._trimmed_view(position, end)
+        if paragraph is not None:
+            yield paragraph
+
+    def _trimmed_view(self, start: int, end: int) -> memoryview | None:
+        data = self._map
+        while start < end and data[start] in _WHITESPACE:
+            start += 1
+        while end > start and data[end - 1] in _WHITESPACE:
+            end -= 1
+        if start == end:
+            return None
+        return memoryview(data)[start:end]
+
+    def _line_index(self) -> array:
+        if self._line_starts is None:
+            starts = array("q")
+            if self.size:
+                starts.append(0)
+            position = self._map.find(b"\n")
+            while position != -1 and position + 1 < self.size:
+                starts.append(position + 1)
+                position = self._map.find(b"\n", position + 1)
+            self._line_starts = starts
+        return self._line_starts
@@ -0,0 +1,126 @@
+"""Persistent per-chapter cache of analysis results.
+
+Running the prose, pacing and timeline analysis over a long manuscript costs
+a full pass over its text, although between two reviews usually only a few
+chapters change. The cache stores each tool's result model for each chapter
+text in an SQLite database in the project directory, keyed by the chapter's
+content hash (which includes the analyzer version) and the tool. Only
+chapters whose text is not in the cache are analyzed again.
+
+The database is bounded by the total size of the stored results; the least
+recently used results are evicted first.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from .analysis import ANALYZERS
+
+RESULTS_FILE = ".analysis.db"
+
+
+class ResultCache:
+    """Analysis results per chapter text, stored in an SQLite database."""
+
+    def __init__(self, db_path: str | Path, max_bytes: int = 16 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path to the database file, usually ``<project>/.analysis.db``
+            max_bytes: Maximum total size of the stored results
+        """
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    digest TEXT NOT NULL,
+                    analyzer TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    used REAL NOT NULL,
+                    PRIMARY KEY (digest, analyzer)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_results_used ON results (used);
+                """
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_many(self, analyzer: str, digests: list[str]) -> dict[str, BaseModel]:
+        """Read stored results and mark them as recently used.
+
+        Args:
+            analyzer: Name of the analysis, a key of :data:`ANALYZERS`
+            digests: Content hashes of the chapter texts
+
+        Returns:
+            Results by digest, for the digests that are stored
+        """
+        model = ANALYZERS[analyzer]
+        keys = list(dict.fromkeys(digests))
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT digest, data FROM results "
+                f"WHERE analyzer = ? AND digest IN ({', '.join('?' * len(keys))})",
+                [analyzer, *keys],
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE results SET used = ? WHERE digest = ? AND analyzer = ?",
+                [(time.time(), key, analyzer) for key, _ in rows],
+            )
+        return {key: model.model_validate_json(data) for key, data in rows}
+
+    def put_many(self, analyzer: str, results: dict[str, BaseModel]) -> None:
+        """Store results, evicting the least recently used ones over the limit.
+
+        Args:
+            analyzer: Name of the analysis, a key of :data:`ANALYZERS`
+            results: Results by chapter digest
+        """
+        if not results:
+            return
+        now = time.time()
+        rows = []
+        for key, result in results.items():
+            data = result.model_dump_json()
+            rows.append((key, analyzer, data, len(data), now))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (digest, analyzer, data, size, used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for key, name, size in self._conn.execute(
+                "SELECT digest, analyzer, size FROM results ORDER BY used"
+            ):
+                if total <= self.max_bytes:
+                    break
+                evicted.append((key, name))
+                total -= size
+            self._conn.executemany("DELETE FROM results WHERE digest = ? AND analyzer = ?", evicted)
+
+    def size(self) -> int:
+        """Total size of the stored results in bytes."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
@@ -0,0 +1,335 @@
+"""Content-addressed manuscript revision history."""
+
+import hashlib
+import json
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from pydantic import BaseModel
+
+from .counting import find_edit
+from .storage import LOCKING_AVAILABLE, atomic_write
+
+if LOCKING_AVAILABLE:
+    import fcntl
+
+
+class Revision(BaseModel):
+    """One entry in a manuscript's revision log."""
+
+    number: int
+    hash: str
+    timestamp: datetime
+    size: int  # Length of the manuscript in characters
+    depth: int = 0  # Number of deltas between this revision and a full snapshot
+
+
+class RevisionStore:
+    """Stores every saved manuscript version as a compressed object.
+
+    Objects are named by the SHA-256 of the manuscript text, so saving
+    identical content twice costs nothing. Each object is either a full
+    snapshot or a delta against the previous revision (the text between
+    the common prefix and suffix), and a snapshot is forced every
+    ``snapshot_every`` revisions so retrieval never walks a long chain.
+
+    Layout inside ``<project>/.revisions/``::
+
+        log.jsonl            one Revision per line, oldest first
+        log.lock             held while the log is read and appended to
+        objects/ab/cdef...   zlib-compressed full or delta objects
+
+    Recording and compacting hold a lock across threads and processes, so
+    concurrent writers never reuse a revision number or interleave lines.
+    """
+
+    def __init__(self, root: str | Path, snapshot_every: int = 32):
+        """Initialize the revision store.
+
+        Args:
+            root: Directory holding the revision log and objects
+            snapshot_every: Maximum delta chain length before a full snapshot
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.log_path = self.root / "log.jsonl"
+        self.lock_path = self.root / "log.lock"
+        self._lock = threading.Lock()
+        self.snapshot_every = snapshot_every
+        self._last: tuple[str, str] | None = None  # (hash, text) of the newest revision
+        # The log as of its last (size, mtime_ns): newest revision and all hashes
+        self._log_state: tuple[int, int] | None = None
+        self._head: Revision | None = None
+        self._hashes: set[str] = set()
+        self._depths: dict[str, int] = {}  # Object hash -> deltas down to its snapshot
+
+    def record(self, content: str) -> Revision | None:
+        """Record a new manuscript version.
+
+        Args:
+            content: Manuscript content
+
+        Returns:
+            The new revision, or None if the content matches the latest one
+        """
+        with self._locked():
+            return self._record(content)
+
+    def record_edit(
+        self, start: int, end: int, replaced: str, text: str, size: int
+    ) -> Revision | None:
+        """Record a new manuscript version given as one edit to the latest.
+
+        The new content is built from the latest revision's text (kept in
+        memory after each record), so callers that only changed a small
+        range need not assemble the whole manuscript.
+
+        Args:
+            start: Start of the replaced range in the latest revision
+            end: End of the replaced range in the latest revision
+            replaced: Text the edit expects at ``start:end``
+            text: Replacement text
+            size: Length of the manuscript the edit was made against
+
+        Returns:
+            The new revision, or None if the content matches the latest one
+
+        Raises:
+            ValueError: If the latest revision is not the text the edit was
+                made against
+        """
+        with self._locked():
+            latest = self._load_head()
+            if latest is None or latest.size != size:
+                raise ValueError("The latest revision is not the edited text")
+            previous = self.get_object(latest.hash)
+            if previous[start:end] != replaced:
+                raise ValueError("The latest revision is not the edited text")
+            return self._record(previous[:start] + text + previous[end:])
+
+    def _record(self, content: str) -> Revision | None:
+        digest = self._hash(content)
+        latest = self._load_head()
+        if latest and latest.hash == digest:
+            return None
+
+        if digest in self._hashes:
+            # Content seen before: reuse the stored object
+            depth = self._depth(digest)
+        elif latest and self._depth(latest.hash) + 1 < self.snapshot_every:
+            depth = self._depth(latest.hash) + 1
+            previous = self.get_object(latest.hash)
+            self._write_delta(digest, latest.hash, previous, content)
+        else:
+            depth = 0
+            self._write_full(digest, content)
+        self._depths[digest] = depth
+
+        revision = Revision(
+            number=latest.number + 1 if latest else 1,
+            hash=digest,
+            timestamp=datetime.now(),
+            size=len(content),
+            depth=depth,
+        )
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(revision.model_dump_json() + "\n")
+        self._last = (digest, content)
+        self._head = revision
+        self._hashes.add(digest)
+        self._log_state = self._stat_log()
+        return revision
+
+    def list_revisions(self) -> list[Revision]:
+        """List all revisions, oldest first."""
+        if not self.log_path.exists():
+            return []
+        with open(self.log_path, encoding="utf-8") as f:
+            return [Revision.model_validate_json(line) for line in f if line.strip()]
+
+    def get(self, number: int) -> str:
+        """Retrieve the manuscript text of a revision.
+
+        Args:
+            number: Revision number
+
+        Returns:
+            Manuscript content
+
+        Raises:
+            KeyError: If the revision does not exist
+        """
+        for revision in self.list_revisions():
+            if revision.number == number:
+                return self.get_object(revision.hash)
+        raise KeyError(f"Revision {number} not found")
+
+    def get_object(self, digest: str) -> str:
+        """Reconstruct the text stored under a content hash.
+
+        Args:
+            digest: SHA-256 of the text
+
+        Returns:
+            The text
+        """
+        if self._last and self._last[0] == digest:
+            return self._last[1]
+
+        # Walk back to the nearest snapshot, then apply deltas forwards
+        chain = []
+        current = digest
+        while True:
+            kind, header, body = self._read_object(current)
+            if kind == b"F":
+                text = body.decode("utf-8")
+                break
+            chain.append((header, body))
+            current = header["base"]
+
+        for header, body in reversed(chain):
+            text = text[: header["start"]] + body.decode("utf-8") + text[header["end"] :]
+        return text
+
+    def compact(self, keep_last: int | None = None) -> dict[str, int]:
+        """Drop old revisions and garbage-collect unreferenced objects.
+
+        The oldest kept revision is rewritten as a full snapshot so that no
+        kept revision depends on a dropped one.
+
+        Args:
+            keep_last: Number of most recent revisions to keep, or None to
+                keep all and only collect garbage
+
+        Returns:
+            Counts of revisions dropped and objects removed
+        """
+        with self._locked():
+            return self._compact(keep_last)
+
+    def _compact(self, keep_last: int | None) -> dict[str, int]:
+        revisions = self.list_revisions()
+        dropped = 0
+        if keep_last is not None and len(revisions) > keep_last:
+            kept = revisions[len(revisions) - keep_last :] if keep_last else []
+            dropped = len(revisions) - len(kept)
+
+            if kept:
+                oldest = kept[0]
+                self._write_full(oldest.hash, self.get_object(oldest.hash), replace=True)
+                self._depths.clear()
+                for revision in kept:
+                    revision.depth = self._depth(revision.hash)
+            atomic_write(
+                self.log_path, "".join(revision.model_dump_json() + "\n" for revision in kept)
+            )
+            self._log_state = None  # Reread on the next record
+            revisions = kept
+
+        referenced = self._referenced(revisions)
+        removed = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob("*/*"):
+                if path.parent.name + path.name not in referenced:
+                    path.unlink()
+                    removed += 1
+        return {"revisions_dropped": dropped, "objects_removed": removed}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if not LOCKING_AVAILABLE:
+                yield
+                return
+            with open(self.lock_path, "ab") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load_head(self) -> Revision | None:
+        # The newest revision, rereading the log only if it changed on disk
+        state = self._stat_log()
+        if state != self._log_state:
+            revisions = self.list_revisions()
+            self._head = revisions[-1] if revisions else None
+            self._hashes = {revision.hash for revision in revisions}
+            self._depths.clear()
+            if self._last and (self._head is None or self._last[0] != self._head.hash):
+                self._last = None
+            self._log_state = state
+        return self._head
+
+    def _stat_log(self) -> tuple[int, int] | None:
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _depth(self, digest: str) -> int:
+        # Length of the delta chain from an object down to its snapshot
+        chain = []
+        current = digest
+        while current not in self._depths:
+            kind, header, _ = self._read_object(current)
+            if kind == b"F":
+                self._depths[current] = 0
+                break
+            chain.append(current)
+            current = header["base"]
+        depth = self._depths[current]
+        for link in reversed(chain):
+            depth += 1
+            self._depths[link] = depth
+        return self._depths[digest]
+
+    def _referenced(self, revisions: list[Revision]) -> set[str]:
+        referenced = set()
+        for revision in revisions:
+            current = revision.hash
+            while current not in referenced:
+                referenced.add(current)
+                kind, header, _ = self._read_object(current)
+                if kind == b"F":
+                    break
+                current = header["base"]
+        return referenced
+
+    @staticmethod
+    def _hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _write_full(self, digest: str, content: str, replace: bool = False) -> None:
+        self._write_object(digest, b"F", {}, content, replace)
+
+    def _write_delta(self, digest: str, base: str, previous: str, content: str) -> None:
+        start, end, replacement = find_edit(previous, content)
+        self._write_object(digest, b"D", {"base": base, "start": start, "end": end}, replacement)
+
+    def _write_object(
+        self, digest: str, kind: bytes, header: dict, body: str, replace: bool = False
+    ) -> None:
+        path = self._object_path(digest)
+        if path.exists() and not replace:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        raw = kind + json.dumps(header).encode("utf-8") + b"\n" + body.encode("utf-8")
+        atomic_write(path, zlib.compress(raw), durable=False)
+
+    def _read_object(self, digest: str) -> tuple[bytes, dict, bytes]:
+        path = self._object_path(digest)
+        if not path.exists():
+            raise KeyError(f"Revision object {digest} not found")
+        raw = zlib.decompress(path.read_bytes())
+        header_end = raw.index(b"\n")
+        return raw[:1], json.loads(raw[1:header_end]), raw[header_end + 1 :]
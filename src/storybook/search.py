@@ -0,0 +1,335 @@
+"""Positional inverted index of a manuscript's words.
+
+The index maps every case-folded word to where it occurs: chapter,
+paragraph, character offset and word position. Phrase queries match words at
+consecutive positions, so "where does X appear" is answered from the index
+alone, without scanning the text.
+
+It is an SQLite database in the project directory. Postings are stored per
+word and per chapter text, identified by a hash of that text, and a layout
+table lists the chapters in manuscript order. A lookup reads only the rows
+of the words it asks for, and updating the index after a save analyzes only
+the chapters whose text changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from bisect import bisect_right
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from .analysis import ANALYZER_VERSION, WORD, analyze, possessives
+
+INDEX_FILE = ".index.db"
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class Posting(BaseModel):
+    """One occurrence of a word or phrase."""
+
+    chapter: int  # Chapter index; 0 is the preamble
+    paragraph: int  # Paragraph index within the chapter
+    offset: int  # Character offset in the manuscript
+    text: str  # The words as written, joined by single spaces
+
+
+class ChapterPostings(BaseModel):
+    """Postings for the words of one chapter text."""
+
+    words: int = 0
+    paragraphs: list[int] = Field(default_factory=list)  # Paragraph start offsets
+    # Case-folded word -> [word position, offset] per occurrence, with the
+    # text as written appended when it differs from the word
+    terms: dict[str, list[list]] = Field(default_factory=dict)
+
+
+def digest(text: str) -> str:
+    """Content hash identifying a chapter text in the index.
+
+    The analyzer version is part of the hash, so postings built by an older
+    analyzer are never reused.
+    """
+    return hashlib.sha256(f"{ANALYZER_VERSION}:{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def build_postings(text: str) -> ChapterPostings:
+    """Index the words of one chapter text.
+
+    Args:
+        text: Chapter text
+
+    Returns:
+        Postings with offsets relative to the start of the text
+    """
+    analysis = analyze(text)
+    order = sorted(start for starts in analysis.positions.values() for start in starts)
+    position = {start: i for i, start in enumerate(order)}
+
+    terms: dict[str, list[list]] = {}
+    for word, starts in analysis.positions.items():
+        postings = []
+        for start in starts:
+            surface = text[start : start + len(word)]
+            if surface != word:
+                surface = WORD.match(text, start).group()
+            posting = [position[start], start]
+            if surface != word:
+                posting.append(surface)
+            postings.append(posting)
+        terms[word] = postings
+
+    # Built from trusted data, so skip re-validating it
+    return ChapterPostings.model_construct(
+        words=analysis.word_count,
+        paragraphs=[start for start, *_ in analysis.paragraphs],
+        terms=terms,
+    )
+
+
+class ManuscriptIndex:
+    """Positional index of one manuscript, stored in an SQLite database."""
+
+    def __init__(self, db_path: str | Path):
+        """Initialize the index.
+
+        Args:
+            db_path: Path to the database file, usually ``<project>/.index.db``
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS chapters (
+                    digest TEXT PRIMARY KEY,
+                    words INTEGER NOT NULL,
+                    paragraphs TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS layout (
+                    position INTEGER PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (term, digest)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_postings_digest ON postings (digest);
+                """
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ManuscriptIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def exists(self) -> bool:
+        """Return True if the index was built by the current analyzer."""
+        return self._meta("version") == str(ANALYZER_VERSION)
+
+    @property
+    def source(self) -> str:
+        """Version token of the manuscript the index was built from."""
+        return (self._meta("source") or "") if self.exists() else ""
+
+    def chapter_count(self) -> int:
+        """Number of indexed chapters, including the preamble."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM layout").fetchone()[0]
+
+    def update(self, chapters: list[str], source: str = "") -> int:
+        """Bring the index in line with the manuscript's chapters.
+
+        Only chapters whose text is not already indexed are analyzed.
+
+        Args:
+            chapters: Chapter texts in order; index 0 is the preamble
+            source: Version token of the manuscript being indexed
+
+        Returns:
+            Number of chapters that were analyzed
+        """
+        layout = [(digest(text), len(text)) for text in chapters]
+        return self._store(layout, {key: text for (key, _), text in zip(layout, chapters)}, source)
+
+    def replace_chapter(self, index: int, text: str, source: str = "") -> None:
+        """Re-index one chapter after it was rewritten.
+
+        Args:
+            index: Chapter index
+            text: New chapter text
+            source: Version token of the manuscript after the change
+        """
+        with self._lock:
+            layout = self._conn.execute(
+                "SELECT digest, length FROM layout ORDER BY position"
+            ).fetchall()
+        key = digest(text)
+        layout[index] = (key, len(text))
+        self._store(layout, {key: text}, source)
+
+    def lookup(self, query: str, limit: int | None = None) -> list[Posting]:
+        """Find a word or phrase, ignoring case.
+
+        A phrase matches its words at consecutive positions, whatever
+        punctuation or line breaks separate them. A possessive ``'s`` on the
+        last word still matches.
+
+        Args:
+            query: Word or phrase to look for
+            limit: Maximum number of postings to return
+
+        Returns:
+            Occurrences in manuscript order
+        """
+        words = WORD.findall(query.casefold())
+        if not words:
+            return []
+        forms = sorted({*words, *possessives(words[-1])})
+
+        # Read the layout and postings in one transaction, so a concurrent
+        # update is seen either entirely or not at all
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            layout = self._conn.execute(
+                "SELECT digest, offset FROM layout ORDER BY position"
+            ).fetchall()
+            terms: dict[str, dict[str, list]] = {}
+            for key, term, data in self._conn.execute(
+                f"SELECT digest, term, data FROM postings WHERE term IN ({_marks(forms)})",
+                forms,
+            ):
+                terms.setdefault(key, {})[term] = json.loads(data)
+            paragraphs = {
+                key: json.loads(data)
+                for key, data in self._conn.execute(
+                    f"SELECT digest, paragraphs FROM chapters WHERE digest IN ({_marks(terms)})",
+                    list(terms),
+                )
+            }
+
+        found: list[Posting] = []
+        for index, (key, chapter_offset) in enumerate(layout):
+            if key not in terms:
+                continue
+            for offset, text in _match(terms[key], words):
+                paragraph = max(bisect_right(paragraphs[key], offset) - 1, 0)
+                found.append(
+                    Posting(
+                        chapter=index,
+                        paragraph=paragraph,
+                        offset=chapter_offset + offset,
+                        text=text,
+                    )
+                )
+                if limit is not None and len(found) >= limit:
+                    return found
+        return found
+
+    def count(self, query: str) -> int:
+        """Count occurrences of a word or phrase, ignoring case."""
+        return len(self.lookup(query))
+
+    def _meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _store(self, layout: list[tuple[str, int]], texts: dict[str, str], source: str) -> int:
+        # Replace the layout, indexing those of ``texts`` not indexed yet and
+        # dropping chapters no longer referenced, in one transaction
+        analyzed = 0
+        with self._lock, self._conn:
+            known = {
+                key
+                for (key,) in self._conn.execute(
+                    f"SELECT digest FROM chapters WHERE digest IN ({_marks(texts)})", list(texts)
+                )
+            }
+            for key, text in texts.items():
+                if key in known:
+                    continue
+                postings = build_postings(text)
+                self._conn.execute(
+                    "INSERT INTO chapters (digest, words, paragraphs) VALUES (?, ?, ?)",
+                    (key, postings.words, json.dumps(postings.paragraphs)),
+                )
+                self._conn.executemany(
+                    "INSERT INTO postings (term, digest, data) VALUES (?, ?, ?)",
+                    [
+                        (term, key, _ENCODER.encode(postings.terms[term]))
+                        for term in sorted(postings.terms)
+                    ],
+                )
+                analyzed += 1
+
+            rows = []
+            offset = 0
+            for position, (key, length) in enumerate(layout):
+                rows.append((position, key, offset, length))
+                offset += length
+            self._conn.execute("DELETE FROM layout")
+            self._conn.executemany(
+                "INSERT INTO layout (position, digest, offset, length) VALUES (?, ?, ?, ?)", rows
+            )
+
+            stale = self._conn.execute(
+                "SELECT digest FROM chapters WHERE digest NOT IN (SELECT digest FROM layout)"
+            ).fetchall()
+            self._conn.executemany("DELETE FROM postings WHERE digest = ?", stale)
+            self._conn.executemany("DELETE FROM chapters WHERE digest = ?", stale)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("version", str(ANALYZER_VERSION)), ("source", source)],
+            )
+        return analyzed
+
+
+def _marks(values) -> str:
+    return ", ".join("?" * len(values))
+
+
+def _match(terms: dict[str, list], words: list[str]) -> list[tuple[int, str]]:
+    """Find a phrase in one chapter's postings as (offset, text as written)."""
+    # Position -> (offset, text as written) for each word of the phrase
+    found = [_surfaces(terms, word, i == len(words) - 1) for i, word in enumerate(words)]
+    matches = []
+    for position in sorted(found[0]):
+        texts = []
+        for i, surfaces in enumerate(found):
+            hit = surfaces.get(position + i)
+            if hit is None:
+                break
+            texts.append(hit[1])
+        else:
+            matches.append((found[0][position][0], " ".join(texts)))
+    return matches
+
+
+def _surfaces(terms: dict[str, list], word: str, last: bool) -> dict[int, tuple[int, str]]:
+    # The last word of a phrase may carry a possessive suffix, which is cut off
+    forms = [word, *possessives(word)] if last else [word]
+    surfaces = {}
+    for form in forms:
+        for posting in terms.get(form, ()):
+            text = posting[2] if len(posting) > 2 else form
+            surfaces[posting[0]] = (posting[1], text if form == word else text[:-2])
+    return surfaces
@@ -0,0 +1,138 @@
+"""Split on-disk format for project files.
+
+A project is stored as two files that are always committed together:
+
+``project.json``
+    The project header: ids, timestamps, storage mode and manuscript
+    metadata. Listing projects and updating word counts only need this.
+``entities.json``
+    A one-line ``{"characters": N, "plot_events": M}`` count header
+    followed by the character and plot event collections.
+
+Both files are compact JSON produced and parsed by pydantic-core. The
+entity collections are read together with the header (so the pair stays
+consistent) but are only validated into models on first access.
+
+Projects saved before the split have everything in ``project.json`` and
+no ``entities.json``; they load eagerly and are split on the next save.
+
+Run ``python -m storybook.serialization`` for a benchmark against the
+single indented ``project.json`` format.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from .models import ENTITY_FIELDS, Character, PlotEvent, Project
+
+PROJECT_FILE = "project.json"
+ENTITIES_FILE = "entities.json"
+
+
+class ProjectEntities(BaseModel):
+    """Entity collections stored in ``entities.json``."""
+
+    characters: list[Character] = Field(default_factory=list)
+    plot_events: list[PlotEvent] = Field(default_factory=list)
+
+
+def encode_header(project: Project) -> bytes:
+    """Encode a project's header, without its entity collections."""
+    return project.model_dump_json(exclude=ENTITY_FIELDS).encode("utf-8")
+
+
+def encode_entities(project: Project) -> bytes:
+    """Encode a project's entity collections, decoding them if deferred."""
+    counts = {"characters": project.character_count, "plot_events": project.plot_event_count}
+    body = project.model_dump_json(include=ENTITY_FIELDS)
+    return (json.dumps(counts) + "\n" + body).encode("utf-8")
+
+
+def decode_project(header: bytes, entities: bytes | None = None) -> Project:
+    """Decode a project.
+
+    Args:
+        header: Contents of ``project.json``
+        entities: Contents of ``entities.json``, or None for the legacy
+            single-file format
+
+    Returns:
+        The project, with its entity lists deferred when ``entities`` is given
+    """
+    project = Project.model_validate_json(header)
+    if entities is not None:
+        first_line, _, body = entities.partition(b"\n")
+        counts = json.loads(first_line)
+
+        def load() -> tuple[list[Character], list[PlotEvent]]:
+            decoded = ProjectEntities.model_validate_json(body)
+            return decoded.characters, decoded.plot_events
+
+        project.defer_entities(load, (counts["characters"], counts["plot_events"]))
+    return project
+
+
+def read_project(project_dir: Path) -> Project:
+    """Read a project from its directory in either format.
+
+    Raises:
+        OSError: If ``project.json`` cannot be read
+        ValueError: If either file is malformed
+    """
+    header = (project_dir / PROJECT_FILE).read_bytes()
+    try:
+        entities = (project_dir / ENTITIES_FILE).read_bytes()
+    except FileNotFoundError:
+        entities = None
+    return decode_project(header, entities)
+
+
+def benchmark(characters: int = 500, plot_events: int = 3000, rounds: int = 20) -> dict:
+    """Compare the split format with the single indented JSON file.
+
+    Args:
+        characters: Number of characters in the synthetic project
+        plot_events: Number of plot events in the synthetic project
+        rounds: Number of repetitions per measurement
+
+    Returns:
+        Mean seconds per operation for each format and operation
+    """
+    project = Project(id="benchmark", name="benchmark")
+    project.characters = [
+        Character(name=f"Character {i}", aliases=[f"C{i}"], description="x" * 200)
+        for i in range(characters)
+    ]
+    project.plot_events = [
+        PlotEvent(id=f"event-{i}", title=f"Event {i}", description="y" * 200)
+        for i in range(plot_events)
+    ]
+
+    def timed(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds
+
+    single = project.model_dump_json(indent=2).encode("utf-8")
+    header, entities = encode_header(project), encode_entities(project)
+    return {
+        "single_bytes": len(single),
+        "split_bytes": len(header) + len(entities),
+        "single_encode": timed(lambda: project.model_dump_json(indent=2).encode("utf-8")),
+        "split_encode": timed(lambda: (encode_header(project), encode_entities(project))),
+        "single_decode": timed(lambda: Project.model_validate_json(single)),
+        "split_decode_header": timed(lambda: decode_project(header, entities)),
+        "split_decode_full": timed(lambda: decode_project(header, entities).load_entities()),
+    }
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        if name.endswith("_bytes"):
+            print(f"{name:>20}: {value:,}")
+        else:
+            print(f"{name:>20}: {value * 1000:.2f} ms")
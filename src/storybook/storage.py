@@ -0,0 +1,281 @@
+"""Crash-safe file storage for projects and manuscripts."""
+
+import atexit
+import json
+import os
+import struct
+import threading
+import time
+import weakref
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+
+    LOCKING_AVAILABLE = True
+except ImportError:
+    LOCKING_AVAILABLE = False
+
+
+# Record layout: payload length, CRC32 of the payload, then the payload. The
+# payload is a JSON header line followed by the raw bytes of every file.
+_RECORD_HEADER = struct.Struct(">II")
+
+_open_journals: "weakref.WeakSet[WriteJournal]" = weakref.WeakSet()
+
+
+@atexit.register
+def _checkpoint_open_journals() -> None:
+    for journal in list(_open_journals):
+        try:
+            journal.checkpoint()
+        except OSError:
+            pass
+
+
+def fsync_dir(path: Path) -> None:
+    """Flush a directory entry to disk so renames inside it are durable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, data: str | bytes, durable: bool = True) -> None:
+    """Atomically replace a file's contents.
+
+    The data is written to a temporary file in the same directory and then
+    renamed over the destination, so readers see either the old or the new
+    contents, never a torn mix.
+
+    Args:
+        path: Destination path
+        data: File contents
+        durable: Fsync the file and its directory before returning
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if durable:
+        fsync_dir(path.parent)
+
+
+class WriteJournal:
+    """Write-ahead journal that commits several files as one unit.
+
+    Every commit appends a checksummed record holding the new contents of all
+    files in the transaction and fsyncs the journal once. The files are then
+    replaced atomically without their own fsync. Data files are flushed in
+    batches at checkpoints (every ``checkpoint_every`` commits, after
+    ``checkpoint_interval`` seconds, or at interpreter exit), after which the
+    journal is truncated. On startup :meth:`recover` replays any committed
+    records, so a crash can never leave a manuscript and its metadata out of
+    step.
+    """
+
+    def __init__(
+        self,
+        journal_path: str | Path,
+        root: str | Path,
+        checkpoint_every: int = 32,
+        checkpoint_interval: float = 5.0,
+    ):
+        """Initialize the journal.
+
+        Args:
+            journal_path: Path to the journal file
+            root: Directory that journaled paths are relative to
+            checkpoint_every: Number of commits between checkpoints
+            checkpoint_interval: Maximum seconds between checkpoints
+        """
+        self.journal_path = Path(journal_path)
+        self.root = Path(root)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self._lock = threading.RLock()
+        self._depth = 0  # Nesting of locked() in the thread holding the lock
+        self._pending = 0
+        self._first_pending_at = 0.0
+        self.journal_path.touch(exist_ok=True)
+        _open_journals.add(self)
+
+    def commit(self, files: dict[Path, str | bytes]) -> None:
+        """Write several files as one atomic, durable unit.
+
+        Args:
+            files: Mapping of destination path to new contents
+        """
+        entries = []
+        for path, data in files.items():
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            entries.append((Path(path), data))
+
+        record = self._encode(entries)
+
+        with self.locked():
+            with open(self.journal_path, "ab") as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+
+            for path, data in entries:
+                atomic_write(path, data, durable=False)
+
+            if self._pending == 0:
+                self._first_pending_at = time.monotonic()
+            self._pending += 1
+            due = (
+                self._pending >= self.checkpoint_every
+                or time.monotonic() - self._first_pending_at >= self.checkpoint_interval
+            )
+            if due:
+                self._checkpoint_locked()
+
+    def checkpoint(self) -> None:
+        """Flush all journaled files to disk and truncate the journal."""
+        if not self.journal_path.parent.exists():
+            return
+        with self.locked():
+            self._checkpoint_locked()
+
+    def recover(self) -> int:
+        """Replay committed records left behind by an interrupted process.
+
+        A torn or corrupt record at the end of the journal is discarded,
+        since its files were never touched. Files whose directory no longer
+        exists (a project deleted after the commit) are skipped.
+
+        Returns:
+            Number of records replayed
+        """
+        with self.locked():
+            replayed = 0
+            for entries in self._read_records():
+                for path, data in entries:
+                    if path.parent.is_dir():
+                        atomic_write(path, data, durable=False)
+                replayed += 1
+            if replayed or self.journal_path.stat().st_size:
+                self._checkpoint_locked()
+            return replayed
+
+    def _checkpoint_locked(self) -> None:
+        if not self.journal_path.exists() or self.journal_path.stat().st_size == 0:
+            self._pending = 0
+            return
+
+        dirs = set()
+        for path in self._journaled_paths():
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            dirs.add(path.parent)
+        for directory in dirs:
+            fsync_dir(directory)
+
+        with open(self.journal_path, "r+b") as f:
+            f.truncate(0)
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = 0
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the journal lock, across threads and processes.
+
+        Commits made while holding it do not wait for it again, so a caller
+        can read files, check them and commit its changes as one step.
+        """
+        with self._lock:
+            if self._depth or not LOCKING_AVAILABLE:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            with open(self.journal_path, "ab") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _encode(self, entries: list[tuple[Path, bytes]]) -> bytes:
+        header = {
+            "files": [
+                {"path": os.path.relpath(path, self.root), "size": len(data)}
+                for path, data in entries
+            ]
+        }
+        payload = json.dumps(header).encode("utf-8") + b"\n" + b"".join(d for _, d in entries)
+        return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def _read_records(self) -> Iterator[list[tuple[Path, bytes]]]:
+        with open(self.journal_path, "rb") as f:
+            while True:
+                raw = f.read(_RECORD_HEADER.size)
+                if len(raw) < _RECORD_HEADER.size:
+                    return
+                length, crc = _RECORD_HEADER.unpack(raw)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+
+                header_end = payload.index(b"\n")
+                header = json.loads(payload[:header_end])
+                offset = header_end + 1
+                entries = []
+                for item in header["files"]:
+                    data = payload[offset : offset + item["size"]]
+                    offset += item["size"]
+                    entries.append((self.root / item["path"], data))
+                yield entries
+
+    def _journaled_paths(self) -> set[Path]:
+        paths = set()
+        with open(self.journal_path, "rb") as f:
+            while True:
+                raw = f.read(_RECORD_HEADER.size)
+                if len(raw) < _RECORD_HEADER.size:
+                    break
+                length, _ = _RECORD_HEADER.unpack(raw)
+                start = f.tell()
+                header_line = f.readline()
+                try:
+                    header = json.loads(header_line)
+                except ValueError:
+                    break
+                paths.update(self.root / item["path"] for item in header["files"])
+                f.seek(start + length)
+        return paths
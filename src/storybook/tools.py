@@ -1,11 +1,14 @@
 """Custom MCP tools for manuscript editing."""
 
-import re
 from typing import Any
 
 from claude_agent_sdk import tool, create_sdk_mcp_server
 
-from .models import Character, PlotEvent
+from .analysis import ANALYZERS, PacingStats, ProseStats, TimelineStats, analyze
+from .chapters import select_chapters
+from .models import Character, PlotEvent, Project
+from .names import CharacterMentions, NameMatcher
+from .project_manager import ProjectManager
 
 
 # Character tracking tools
@@ -95,10 +98,12 @@ async def check_character_consistency(args: dict[str, Any]) -> dict[str, Any]:
             "is_error": True,
         }
 
-    # Find all mentions
-    pattern = re.compile(rf"\b{re.escape(character_name)}\b", re.IGNORECASE)
-    mentions = pattern.findall(manuscript_text)
+    mentions = [surface for _, surface in analyze(manuscript_text).mentions(character_name)]
+    return _consistency_report(character_name, mentions)
 
+
+def _consistency_report(character_name: str, mentions: list[str]) -> dict[str, Any]:
+    """Report on a character's mentions, given as the text as written."""
     # Analyze capitalization consistency
     capitalizations = set(mentions)
     issues = []
@@ -185,19 +190,12 @@ async def analyze_plot_timeline(args: dict[str, Any]) -> dict[str, Any]:
     Examines time references and sequence of events to identify potential issues.
     """
     manuscript_text = args.get("manuscript_text", "")
+    return _timeline_report(TimelineStats.from_text(manuscript_text))
 
-    # Find time references
-    time_patterns = [
-        r"\b(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b",
-        r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\b",
-        r"\bday (\d+)\b",
-        r"\b(\d+) days? (later|ago|before|after)\b",
-    ]
 
-    time_references = []
-    for pattern in time_patterns:
-        matches = re.finditer(pattern, manuscript_text, re.IGNORECASE)
-        time_references.extend([m.group() for m in matches])
+def _timeline_report(stats: TimelineStats) -> dict[str, Any]:
+    """Report on the time references found in a text."""
+    time_references = stats.time_references
 
     result = f"Found {len(time_references)} time references in the manuscript.\n"
     if time_references[:10]:
@@ -228,41 +226,34 @@ async def analyze_prose_quality(args: dict[str, Any]) -> dict[str, Any]:
             "is_error": True,
         }
 
-    # Basic analysis
-    sentences = re.split(r"[.!?]+", text_sample)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    words = text_sample.split()
+    return _prose_report(ProseStats.from_text(text_sample))
+
+
+def _prose_report(stats: ProseStats) -> dict[str, Any]:
+    """Report on the prose quality figures of a text."""
+    word_count = stats.words
 
-    avg_sentence_length = len(words) / len(sentences) if sentences else 0
+    avg_sentence_length = word_count / stats.sentences if stats.sentences else 0
 
     # Check for common issues
     issues = []
 
     # Passive voice detection (simplified)
-    passive_indicators = ["was", "were", "been", "being"]
-    passive_count = sum(1 for word in words if word.lower() in passive_indicators)
-    if passive_count / len(words) > 0.05:
+    if word_count and stats.passive / word_count > 0.05:
         issues.append("High use of passive voice detected")
 
     # Adverb overuse
-    adverbs = [w for w in words if w.lower().endswith("ly")]
-    if len(adverbs) / len(words) > 0.05:
-        issues.append(f"Frequent adverb use ({len(adverbs)} adverbs)")
+    if word_count and stats.adverbs / word_count > 0.05:
+        issues.append(f"Frequent adverb use ({stats.adverbs} adverbs)")
 
     # Repetitive words
-    word_freq = {}
-    for word in words:
-        word_lower = word.lower()
-        if len(word_lower) > 3:
-            word_freq[word_lower] = word_freq.get(word_lower, 0) + 1
-
-    repeated = [word for word, count in word_freq.items() if count > 3]
+    repeated = [word for word, count in stats.frequencies.items() if count > 3]
     if repeated:
         issues.append(f"Repetitive words: {', '.join(repeated[:5])}")
 
     result = "Prose Analysis:\n"
-    result += f"- Sentences: {len(sentences)}\n"
-    result += f"- Words: {len(words)}\n"
+    result += f"- Sentences: {stats.sentences}\n"
+    result += f"- Words: {word_count}\n"
     result += f"- Avg. sentence length: {avg_sentence_length:.1f} words\n"
 
     if issues:
@@ -286,19 +277,19 @@ async def detect_pacing_issues(args: dict[str, Any]) -> dict[str, Any]:
     """
     chapter_text = args.get("chapter_text", "")
 
-    # Split into paragraphs
-    paragraphs = [p.strip() for p in chapter_text.split("\n\n") if p.strip()]
+    return _pacing_report(PacingStats.from_text(chapter_text))
+
 
-    # Analyze paragraph lengths
-    para_lengths = [len(p.split()) for p in paragraphs]
+def _pacing_report(stats: PacingStats) -> dict[str, Any]:
+    """Report on the paragraph figures of a text."""
+    para_lengths = stats.paragraph_words
     avg_para_length = sum(para_lengths) / len(para_lengths) if para_lengths else 0
 
-    # Detect dialogue vs. narrative
-    dialogue_paras = sum(1 for p in paragraphs if '"' in p or "'" in p)
-    dialogue_ratio = dialogue_paras / len(paragraphs) if paragraphs else 0
+    # Dialogue vs. narrative
+    dialogue_ratio = stats.dialogue_paragraphs / len(para_lengths) if para_lengths else 0
 
     result = "Pacing Analysis:\n"
-    result += f"- Paragraphs: {len(paragraphs)}\n"
+    result += f"- Paragraphs: {len(para_lengths)}\n"
     result += f"- Avg. paragraph length: {avg_para_length:.1f} words\n"
     result += f"- Dialogue ratio: {dialogue_ratio:.0%}\n"
 
@@ -320,20 +311,387 @@ async def detect_pacing_issues(args: dict[str, Any]) -> dict[str, Any]:
     return {"content": [{"type": "text", "text": result}]}
 
 
-# Create the MCP server with all tools
-def create_storybook_tools():
-    """Create the Storybook MCP server with all custom tools."""
-    return create_sdk_mcp_server(
-        name="storybook",
-        version="1.0.0",
-        tools=[
-            track_character,
-            list_characters,
-            check_character_consistency,
-            track_plot_event,
-            list_plot_events,
+# Project-bound tools
+
+# Lets a tool read the manuscript itself instead of receiving its text
+_SELECTOR_PROPERTIES = {
+    "project_id": {
+        "type": "string",
+        "description": "Project to read; defaults to the current project",
+    },
+    "chapters": {
+        "type": ["string", "integer"],
+        "description": 'Chapter index, range or list such as 3, "2-4" or "1,5"; '
+        "0 is the text before the first chapter. Defaults to all chapters.",
+    },
+}
+
+
+def _selector_schema(text_key: str | None = None, **properties: Any) -> dict[str, Any]:
+    """JSON schema for a tool taking optional text or a chapter selector."""
+    schema_properties = dict(properties)
+    if text_key:
+        schema_properties[text_key] = {
+            "type": "string",
+            "description": "Text to analyze instead of the manuscript",
+        }
+    schema_properties.update(_SELECTOR_PROPERTIES)
+    return {"type": "object", "properties": schema_properties}
+
+
+def _error(message: str) -> dict[str, Any]:
+    return {"content": [{"type": "text", "text": message}], "is_error": True}
+
+
+def _project_tools(project: Project, project_manager: ProjectManager) -> list:
+    """Create tools that read the manuscript server-side.
+
+    Instead of the model reading the manuscript and passing its text back in,
+    these tools take a project id and a chapter selector and load the text
+    from the project manager's shared cache. Passing text still works.
+    """
+
+    def target(args: dict[str, Any]) -> Project:
+        project_id = args.get("project_id")
+        if not project_id or project_id == project.id:
+            return project
+        other = project_manager.load_project(project_id)
+        if other is None:
+            raise ValueError(f"Project {project_id} not found")
+        return other
+
+    def selection(args: dict[str, Any]) -> tuple[Project, list[int]]:
+        # The project and the selected chapter indexes, without reading any text
+        selected_project = target(args)
+        count = project_manager.chapter_count(selected_project)
+        return selected_project, select_chapters(args.get("chapters"), count)
+
+    def text_tool(name: str, description: str, text_key: str, analyze_text, analyzer, report):
+        # Chapters are analyzed through the project's result cache, so only
+        # those edited since the last run are analyzed again
+        @tool(name, description, _selector_schema(text_key))
+        async def handler(args: dict[str, Any]) -> dict[str, Any]:
+            if args.get(text_key):
+                return await analyze_text.handler({text_key: args[text_key]})
+            try:
+                selected_project = target(args)
+                results = project_manager.analysis_results(
+                    selected_project, analyzer, args.get("chapters")
+                )
+            except ValueError as e:
+                return _error(str(e))
+            return report(ANALYZERS[analyzer].merge(results))
+
+        return handler
+
+    @tool(
+        "track_character",
+        "Track or update a character in the project; fields left out keep their values",
+        {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "aliases": {"type": "array", "items": {"type": "string"}},
+                "description": {"type": "string"},
+                "traits": {"type": "array", "items": {"type": "string"}},
+                "first_appearance": {"type": "string"},
+                "notes": {"type": "string"},
+            },
+            "required": ["name"],
+        },
+    )
+    async def track_project_character(args: dict[str, Any]) -> dict[str, Any]:
+        """Track a character in the project, merging with one already tracked."""
+        name = args.get("name", "")
+        if not name:
+            return _error("name is required")
+        try:
+            existing = project.get_character(name)
+            update = {key: args[key] for key in Character.model_fields if key in args}
+            if existing is not None and existing.name.casefold() == name.casefold():
+                update.pop("name")  # Keep the tracked spelling
+                character = Character.model_validate({**existing.model_dump(), **update})
+            else:
+                character = Character.model_validate(update)
+            project_manager.add_character(project, character)
+        except Exception as e:
+            return _error(f"Error tracking character: {str(e)}")
+
+        result = f"Character '{character.name}' tracked successfully."
+        if character.aliases:
+            result += f" Aliases: {', '.join(character.aliases)}"
+        return {"content": [{"type": "text", "text": result}]}
+
+    @tool(
+        "list_characters",
+        "List all tracked characters in the project",
+        {"type": "object", "properties": {"project_id": _SELECTOR_PROPERTIES["project_id"]}},
+    )
+    async def list_project_characters(args: dict[str, Any]) -> dict[str, Any]:
+        """List the project's tracked characters."""
+        try:
+            characters = target(args).characters
+        except ValueError as e:
+            return _error(str(e))
+        if not characters:
+            text = "No characters tracked yet. Use track_character to add characters."
+        else:
+            text = f"{len(characters)} tracked characters:\n" + "\n".join(
+                _character_line(character) for character in characters
+            )
+        return {"content": [{"type": "text", "text": text}]}
+
+    @tool(
+        "track_plot_event",
+        "Track a plot event or story beat in the project. An event with the id "
+        "of a tracked one replaces it.",
+        {
+            "type": "object",
+            "properties": {
+                "id": {"type": "string"},
+                "title": {"type": "string"},
+                "description": {"type": "string"},
+                "chapter_reference": {"type": "string"},
+                "timestamp_in_story": {"type": "string"},
+                "characters_involved": {"type": "array", "items": {"type": "string"}},
+                "importance": {"type": "string", "enum": ["low", "medium", "high", "critical"]},
+                "notes": {"type": "string"},
+            },
+            "required": ["title"],
+        },
+    )
+    async def track_project_plot_event(args: dict[str, Any]) -> dict[str, Any]:
+        """Track a plot event in the project."""
+        try:
+            fields = {key: args[key] for key in PlotEvent.model_fields if key in args}
+            fields.setdefault("description", "")
+            if not fields.get("id"):
+                fields["id"] = _next_event_id(project)
+            event = PlotEvent.model_validate(fields)
+            project_manager.add_plot_event(project, event)
+        except Exception as e:
+            return _error(f"Error tracking plot event: {str(e)}")
+
+        result = f"Plot event '{event.title}' tracked successfully as {event.id}."
+        if event.characters_involved:
+            result += f" Characters: {', '.join(event.characters_involved)}"
+        return {"content": [{"type": "text", "text": result}]}
+
+    @tool(
+        "list_plot_events",
+        "List all tracked plot events in the project",
+        {"type": "object", "properties": {"project_id": _SELECTOR_PROPERTIES["project_id"]}},
+    )
+    async def list_project_plot_events(args: dict[str, Any]) -> dict[str, Any]:
+        """List the project's tracked plot events."""
+        try:
+            events = target(args).plot_events
+        except ValueError as e:
+            return _error(str(e))
+        if not events:
+            text = "No plot events tracked yet. Use track_plot_event to add events."
+        else:
+            text = f"{len(events)} tracked plot events:\n" + "\n".join(
+                _event_line(event) for event in events
+            )
+        return {"content": [{"type": "text", "text": text}]}
+
+    @tool(
+        "check_character_consistency",
+        "Check for character consistency issues in the manuscript. The project's "
+        "manuscript is searched unless manuscript_text is given.",
+        {
+            **_selector_schema("manuscript_text", character_name={"type": "string"}),
+            "required": ["character_name"],
+        },
+    )
+    async def check_project_character_consistency(args: dict[str, Any]) -> dict[str, Any]:
+        """Check for character consistency issues using the manuscript index."""
+        if args.get("manuscript_text"):
+            return await check_character_consistency.handler(args)
+
+        character_name = args.get("character_name", "")
+        if not character_name:
+            return _error("character_name is required")
+        try:
+            selected_project, selected = selection(args)
+        except ValueError as e:
+            return _error(str(e))
+        chapters = set(selected)
+        postings = project_manager.find_in_manuscript(selected_project, character_name)
+        mentions = [posting.text for posting in postings if posting.chapter in chapters]
+        return _consistency_report(character_name, mentions)
+
+    @tool(
+        "find_in_manuscript",
+        "Find where a word or phrase (such as a character name) appears in the "
+        "manuscript, by chapter and paragraph",
+        {
+            **_selector_schema(query={"type": "string"}, limit={"type": "integer", "minimum": 1}),
+            "required": ["query"],
+        },
+    )
+    async def find_in_manuscript(args: dict[str, Any]) -> dict[str, Any]:
+        """Look a word or phrase up in the manuscript index."""
+        query = args.get("query", "")
+        limit = args.get("limit", 50)
+        try:
+            selected_project, selected = selection(args)
+        except ValueError as e:
+            return _error(str(e))
+        chapters = set(selected)
+        postings = [
+            posting
+            for posting in project_manager.find_in_manuscript(selected_project, query)
+            if posting.chapter in chapters
+        ]
+        if not postings:
+            return {"content": [{"type": "text", "text": f"'{query}' does not appear."}]}
+
+        found_in = len({posting.chapter for posting in postings})
+        result = f"Found {len(postings)} occurrences of '{query}' in {found_in} chapters.\n\n"
+        result += "\n".join(
+            f"- Chapter {p.chapter}, paragraph {p.paragraph}, offset {p.offset}: {p.text}"
+            for p in postings[:limit]
+        )
+        if len(postings) > limit:
+            result += f"\n- ... and {len(postings) - limit} more"
+        return {"content": [{"type": "text", "text": result}]}
+
+    @tool(
+        "check_all_characters",
+        "Check every tracked character's name and aliases at once: mentions per "
+        "chapter and capitalization issues. The project's manuscript is scanned "
+        "unless manuscript_text is given.",
+        _selector_schema("manuscript_text"),
+    )
+    async def check_all_characters(args: dict[str, Any]) -> dict[str, Any]:
+        """Check all tracked characters in a single pass over the manuscript."""
+        try:
+            selected_project = target(args)
+            if not selected_project.characters:
+                return {
+                    "content": [
+                        {"type": "text", "text": "No characters tracked yet. Use track_character."}
+                    ]
+                }
+            matcher = NameMatcher.from_characters(selected_project.characters)
+            if args.get("manuscript_text"):
+                reports = matcher.report([args["manuscript_text"]])
+            else:
+                chapters = project_manager.read_chapters(selected_project, args.get("chapters"))
+                reports = matcher.report(chapters)
+        except ValueError as e:
+            return _error(str(e))
+        return {"content": [{"type": "text", "text": _cast_report(reports)}]}
+
+    return [
+        track_project_character,
+        list_project_characters,
+        track_project_plot_event,
+        list_project_plot_events,
+        check_project_character_consistency,
+        find_in_manuscript,
+        check_all_characters,
+        text_tool(
+            "analyze_plot_timeline",
+            "Analyze the plot timeline for consistency issues, in the project's "
+            "manuscript or the given chapters",
+            "manuscript_text",
             analyze_plot_timeline,
+            "timeline",
+            _timeline_report,
+        ),
+        text_tool(
+            "analyze_prose_quality",
+            "Analyze prose quality and style of the project's manuscript or the given chapters",
+            "text_sample",
             analyze_prose_quality,
+            "prose",
+            _prose_report,
+        ),
+        text_tool(
+            "detect_pacing_issues",
+            "Detect potential pacing issues in the project's manuscript or the given chapters",
+            "chapter_text",
             detect_pacing_issues,
-        ],
-    )
+            "pacing",
+            _pacing_report,
+        ),
+    ]
+
+
+def _next_event_id(project: Project) -> str:
+    # One past the highest "event-N" id, so ids never repeat after deletions
+    numbers = [
+        int(suffix)
+        for event in project.plot_events
+        for prefix, _, suffix in [event.id.partition("-")]
+        if prefix == "event" and suffix.isdigit()
+    ]
+    return f"event-{max(numbers, default=0) + 1}"
+
+
+def _character_line(character: Character) -> str:
+    """Summarize a tracked character on one line."""
+    line = f"- {character.name}"
+    if character.aliases:
+        line += f" (aka {', '.join(character.aliases)})"
+    if character.description:
+        line += f": {character.description}"
+    if character.traits:
+        line += f" [{', '.join(character.traits)}]"
+    return line
+
+
+def _event_line(event: PlotEvent) -> str:
+    """Summarize a tracked plot event on one line."""
+    where = ", ".join(part for part in (event.chapter_reference, event.importance) if part)
+    line = f"- {event.id}: {event.title} ({where})"
+    if event.characters_involved:
+        line += f" with {', '.join(event.characters_involved)}"
+    return line
+
+
+def _cast_report(reports: list[CharacterMentions]) -> str:
+    """Summarize the mentions of several characters."""
+    lines = [f"Checked {len(reports)} characters.\n"]
+    for report in reports:
+        if not report.count:
+            lines.append(f"- {report.character}: not mentioned")
+            continue
+        chapters = ", ".join(f"ch. {index}: {count}" for index, count in report.chapters.items())
+        lines.append(
+            f"- {report.character}: {report.count} mentions in "
+            f"{len(report.chapters)} chapters ({chapters})"
+        )
+        lines.extend(f"  - {issue}" for issue in report.issues)
+    return "\n".join(lines)
+
+
+# Create the MCP server with all tools
+def create_storybook_tools(
+    project: Project | None = None, project_manager: ProjectManager | None = None
+):
+    """Create the Storybook MCP server with all custom tools.
+
+    Args:
+        project: Project the session works on; with ``project_manager``, the
+            analysis tools read its manuscript themselves instead of taking
+            the text as an argument, and search tools are added
+        project_manager: Project manager instance
+    """
+    tools = [
+        track_character,
+        list_characters,
+        check_character_consistency,
+        track_plot_event,
+        list_plot_events,
+        analyze_plot_timeline,
+        analyze_prose_quality,
+        detect_pacing_issues,
+    ]
+    if project is not None and project_manager is not None:
+        bound = _project_tools(project, project_manager)
+        tools = [t for t in tools if t.name not in {b.name for b in bound}] + bound
+    return create_sdk_mcp_server(name="storybook", version="1.0.0", tools=tools)
@@ -7,7 +7,7 @@ from rich.prompt import Prompt, Confirm
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.markdown import Markdown
 
-from .models import Project
+from .models import Project, ProjectSummary
 
 
 class StorybookUI:
@@ -77,11 +77,11 @@ class StorybookUI:
         choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6", "7"])
         return choice
 
-    def list_projects(self, projects: list[Project]) -> None:
+    def list_projects(self, projects: list[Project] | list[ProjectSummary]) -> None:
         """Display a list of projects.
 
         Args:
-            projects: List of projects to display
+            projects: List of projects or project summaries to display
         """
         if not projects:
             self.console.print("[yellow]No projects found.[/yellow]")
@@ -95,11 +95,13 @@ class StorybookUI:
         table.add_column("Last Edited", style="yellow")
 
         for project in projects:
+            if isinstance(project, Project):
+                project = ProjectSummary.from_project(project)
             table.add_row(
                 project.id[:8],
                 project.name,
-                project.metadata.title,
-                f"{project.metadata.word_count:,}",
+                project.title,
+                f"{project.word_count:,}",
                 project.last_edited.strftime("%Y-%m-%d"),
             )
 
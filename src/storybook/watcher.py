@@ -0,0 +1,339 @@
+"""Watch the project data directory and report debounced change events.
+
+Edits reach project files from many places: the web server, the CLI, and
+the agent's own ``Write``/``Edit`` tools during a chat. The watcher observes
+the files themselves, so every writer is seen the same way.
+
+On Linux the kernel's inotify API is used through ctypes; elsewhere, or if
+inotify is unavailable, the directory tree is rescanned every
+``poll_interval`` seconds. Raw file events are classified per project as
+``manuscript`` (manuscript file or chapters), ``metadata`` (project header or
+entities), ``created`` or ``deleted``, and bursts are merged: an event is
+reported once its project has been quiet for ``debounce`` seconds, or after
+``max_delay`` seconds of continuous writes.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from .serialization import ENTITIES_FILE, PROJECT_FILE
+
+ChangeKind = Literal["manuscript", "metadata", "created", "deleted"]
+
+METADATA_FILES = frozenset({PROJECT_FILE, ENTITIES_FILE})
+# Files in a project directory that belong to neither the manuscript nor metadata
+IGNORED_FILES = frozenset({"latest_review.md"})
+CHAPTERS_DIR = "chapters"
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+_ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+_PROJECT_MASK = IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class ChangeEvent(BaseModel):
+    """A debounced change to one project."""
+
+    project_id: str
+    kind: ChangeKind
+    paths: list[str] = Field(default_factory=list)  # Changed files, relative to the project
+
+
+def classify(root: Path, path: Path, is_dir: bool) -> tuple[str, ChangeKind] | None:
+    """Map a changed path to the project it belongs to and the kind of change.
+
+    Args:
+        root: Project data directory
+        path: Changed path
+        is_dir: Whether the path is (or was) a directory
+
+    Returns:
+        (project id, kind), or None if the path is not project content
+    """
+    parts = path.relative_to(root).parts
+    if not parts or parts[0].startswith("."):
+        return None
+    project_id = parts[0]
+    if len(parts) == 1:
+        # Top-level files are the catalog and journal, not projects
+        if not is_dir:
+            return None
+        return project_id, "created" if path.is_dir() else "deleted"
+    # Temporary files, revision history and other hidden entries
+    if any(part.startswith(".") for part in parts[1:]):
+        return None
+    if len(parts) == 2 and parts[1] in METADATA_FILES:
+        return project_id, "metadata"
+    if len(parts) == 2 and parts[1] in IGNORED_FILES:
+        return None
+    return project_id, "manuscript"
+
+
+class _InotifyBackend:
+    """Reports changed paths using inotify."""
+
+    name = "inotify"
+
+    def __init__(self, root: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, Path] = {}
+        self._add(root, _ROOT_MASK)
+        for entry in os.scandir(root):
+            if entry.is_dir() and not entry.name.startswith("."):
+                self._add_project(Path(entry.path))
+
+    def read(self, timeout: float | None) -> list[tuple[Path, bool]]:
+        """Wait up to ``timeout`` seconds and return (path, is_dir) changes."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        data = b""
+        while True:
+            try:
+                data += os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+        changes = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: report everything as changed
+                changes.extend(self._everything())
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = directory / os.fsdecode(name)
+            is_dir = bool(mask & IN_ISDIR)
+            if is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                if directory == self.root:
+                    self._add_project(path)
+                elif path.name == CHAPTERS_DIR:
+                    self._add(path, _PROJECT_MASK)
+            changes.append((path, is_dir))
+        return changes
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _add(self, path: Path, mask: int) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return  # Removed before we got to it
+            raise OSError(error, f"inotify_add_watch failed for {path}")
+        self.watches[wd] = path
+
+    def _add_project(self, path: Path) -> None:
+        self._add(path, _PROJECT_MASK)
+        if (path / CHAPTERS_DIR).is_dir():
+            self._add(path / CHAPTERS_DIR, _PROJECT_MASK)
+
+    def _everything(self) -> list[tuple[Path, bool]]:
+        changes = []
+        for path in self.root.iterdir():
+            if path.is_dir():
+                changes.append((path / PROJECT_FILE, False))
+                changes.append((path / CHAPTERS_DIR, True))
+        return changes
+
+
+class _PollingBackend:
+    """Reports changed paths by comparing periodic directory scans."""
+
+    name = "polling"
+
+    def __init__(self, root: Path, interval: float):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def read(self, timeout: float | None) -> list[tuple[Path, bool]]:
+        """Wait up to ``timeout`` seconds and return (path, is_dir) changes."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self._scan()
+        changes = [
+            (path, state[0])
+            for path, state in snapshot.items()
+            if self._snapshot.get(path) != state
+        ]
+        changes.extend(
+            (path, state[0]) for path, state in self._snapshot.items() if path not in snapshot
+        )
+        self._snapshot = snapshot
+        return changes
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+    def _scan(self) -> dict[Path, tuple[bool, int, int]]:
+        # Path -> (is_dir, mtime_ns, size); directories only record existence
+        snapshot: dict[Path, tuple[bool, int, int]] = {}
+        for project in _scandir(self.root):
+            if not project.is_dir() or project.name.startswith("."):
+                continue
+            snapshot[Path(project.path)] = (True, 0, 0)
+            for directory in (project.path, os.path.join(project.path, CHAPTERS_DIR)):
+                for entry in _scandir(directory):
+                    if entry.name.startswith(".") or entry.is_dir():
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[Path(entry.path)] = (False, stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+
+def _scandir(path: str | Path) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+class ProjectWatcher:
+    """Watches a project data directory and reports debounced changes."""
+
+    def __init__(
+        self,
+        data_dir: str | Path,
+        debounce: float = 0.2,
+        max_delay: float = 2.0,
+        backend: Literal["auto", "inotify", "polling"] = "auto",
+        poll_interval: float = 1.0,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            data_dir: Project data directory, as used by ProjectManager
+            debounce: Quiet time before a project's changes are reported
+            max_delay: Longest time changes are held back during a burst
+            backend: ``inotify``, ``polling``, or ``auto`` to prefer inotify
+            poll_interval: Seconds between scans for the polling backend
+        """
+        self.data_dir = Path(data_dir).expanduser()
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self._backend: _InotifyBackend | _PollingBackend
+        if backend == "polling":
+            self._backend = _PollingBackend(self.data_dir, poll_interval)
+        else:
+            try:
+                self._backend = _InotifyBackend(self.data_dir)
+            except (OSError, AttributeError):
+                if backend == "inotify":
+                    raise
+                self._backend = _PollingBackend(self.data_dir, poll_interval)
+
+        # (project id, kind) -> [first seen, last seen, changed paths]
+        self._pending: dict[tuple[str, ChangeKind], list] = {}
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend in use."""
+        return self._backend.name
+
+    def poll(self, timeout: float | None = None) -> list[ChangeEvent]:
+        """Wait for debounced changes.
+
+        Args:
+            timeout: Longest time to wait in seconds, or None to wait until
+                there is something to report
+
+        Returns:
+            Changes that are ready, possibly empty if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            ready = self._take_ready(now)
+            if ready:
+                return ready
+            if deadline is not None and now >= deadline:
+                return []
+
+            waits = [] if deadline is None else [deadline - now]
+            if self._pending:
+                waits.append(self._next_due() - now)
+            wait = max(min(waits), 0.0) if waits else None
+            self._record(self._backend.read(wait))
+
+    def close(self) -> None:
+        """Stop watching."""
+        self._backend.close()
+
+    def __enter__(self) -> "ProjectWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _record(self, changes: list[tuple[Path, bool]]) -> None:
+        now = time.monotonic()
+        for path, is_dir in changes:
+            classified = classify(self.data_dir, path, is_dir)
+            if classified is None:
+                continue
+            entry = self._pending.setdefault(classified, [now, now, set()])
+            entry[1] = now
+            if len(path.relative_to(self.data_dir).parts) > 1:
+                entry[2].add(path.relative_to(self.data_dir / classified[0]).as_posix())
+
+    def _next_due(self) -> float:
+        return min(
+            min(last + self.debounce, first + self.max_delay)
+            for first, last, _ in self._pending.values()
+        )
+
+    def _take_ready(self, now: float) -> list[ChangeEvent]:
+        ready = []
+        for key, (first, last, paths) in list(self._pending.items()):
+            if now - last >= self.debounce or now - first >= self.max_delay:
+                del self._pending[key]
+                ready.append(ChangeEvent(project_id=key[0], kind=key[1], paths=sorted(paths)))
+        return ready
@@ -4,9 +4,10 @@ This module provides functions that can be called from the Node.js backend
 to interact with the Storybook CLI functionality.
 """
 
+import codecs
 import json
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
 from .project_manager import ProjectManager
 from .models import Project, ManuscriptMetadata, Character, PlotEvent
@@ -20,7 +21,30 @@ pm = ProjectManager()
 def list_projects() -> List[Dict[str, Any]]:
     """List all projects as JSON-serializable dicts."""
     projects = pm.list_projects()
-    return [project.model_dump() for project in projects]
+    return [project.model_dump(mode="json") for project in projects]
+
+
+def list_project_summaries(
+    sort: str = "last_edited",
+    descending: bool = True,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """List project summaries from the catalog as JSON-serializable dicts.
+
+    Args:
+        sort: Field to sort by
+        descending: Sort in descending order
+        limit: Maximum number of summaries, or None for all
+        offset: Number of summaries to skip
+
+    Returns:
+        List of project summary dicts
+    """
+    summaries = pm.list_project_summaries(
+        sort=sort, descending=descending, limit=limit, offset=offset
+    )
+    return [summary.model_dump(mode="json") for summary in summaries]
 
 
 def load_project(project_id: str) -> Dict[str, Any]:
@@ -28,7 +52,26 @@ def load_project(project_id: str) -> Dict[str, Any]:
     project = pm.load_project(project_id)
     if not project:
         raise ValueError(f"Project {project_id} not found")
-    return project.model_dump()
+    return project.model_dump(mode="json")
+
+
+def get_versions(project_id: str) -> Dict[str, str]:
+    """Get change tokens for a project, for use as HTTP ETags.
+
+    Only file metadata is read, so this is much cheaper than loading the
+    data the tokens stand for.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        ``project`` token (metadata, characters, plot events) and
+        ``manuscript`` token (manuscript text and chapters)
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+    return pm.version_tokens(project)
 
 
 def create_project(name: str, import_file: Optional[str] = None) -> Dict[str, Any]:
@@ -45,7 +88,7 @@ def create_project(name: str, import_file: Optional[str] = None) -> Dict[str, An
         project = pm.import_project(name, Path(import_file))
     else:
         project = pm.create_project(name)
-    return project.model_dump()
+    return project.model_dump(mode="json")
 
 
 def delete_project(project_id: str) -> None:
@@ -53,6 +96,38 @@ def delete_project(project_id: str) -> None:
     pm.delete_project(project_id)
 
 
+def list_characters(project_id: str) -> List[Dict[str, Any]]:
+    """List a project's characters.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Character dicts
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return [character.model_dump(mode="json") for character in project.characters]
+
+
+def list_plot_events(project_id: str) -> List[Dict[str, Any]]:
+    """List a project's plot events.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Plot event dicts
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return [event.model_dump(mode="json") for event in project.plot_events]
+
+
 def update_metadata(project_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
     """Update project metadata.
 
@@ -73,7 +148,7 @@ def update_metadata(project_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]
             setattr(project.metadata, key, value)
 
     pm._save_project(project)
-    return project.model_dump()
+    return project.model_dump(mode="json")
 
 
 def read_manuscript(project_id: str) -> str:
@@ -89,11 +164,7 @@ def read_manuscript(project_id: str) -> str:
     if not project:
         raise ValueError(f"Project {project_id} not found")
 
-    manuscript_path = project.get_manuscript_path(pm.data_dir)
-    if not manuscript_path.exists():
-        return ""
-
-    return manuscript_path.read_text()
+    return pm.get_manuscript_content(project)
 
 
 def write_manuscript(project_id: str, content: str) -> None:
@@ -107,12 +178,222 @@ def write_manuscript(project_id: str, content: str) -> None:
     if not project:
         raise ValueError(f"Project {project_id} not found")
 
-    manuscript_path = project.get_manuscript_path(pm.data_dir)
-    manuscript_path.write_text(content)
+    # Write manuscript and updated word count in one journaled commit
+    pm.save_manuscript_content(project, content)
 
-    # Update word count
-    project.update_word_count(pm.data_dir)
-    pm._save_project(project)
+
+def apply_manuscript_patch(
+    project_id: str, base_version: int, ops: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Apply text edits made against a manuscript version.
+
+    Args:
+        project_id: Project ID
+        base_version: Manuscript version the edits were made against
+        ops: Edits, each {"start": int, "end": int, "text": str} in
+            UTF-16 code unit offsets of the base version, as produced by
+            JavaScript string indexes
+
+    Returns:
+        The new version and updated word and chapter counts
+
+    Raises:
+        StaleVersionError: If the manuscript changed since base_version
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    version = pm.apply_manuscript_patch(project, base_version, ops, utf16=True)
+    return {
+        "version": version,
+        "word_count": project.metadata.word_count,
+        "chapter_count": project.metadata.chapter_count,
+    }
+
+
+def read_manuscript_body(project_id: str) -> Iterator[bytes]:
+    """Stream manuscript content as UTF-8 chunks.
+
+    Used by python_runner's streamed responses so a long manuscript is never
+    held whole in memory or in a single frame.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Iterator over consecutive UTF-8 encoded pieces of the manuscript
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return (chunk.encode("utf-8") for chunk in pm.iter_manuscript_content(project))
+
+
+def write_manuscript_body(project_id: str, body: Iterable[bytes]) -> None:
+    """Write manuscript content received as a stream of UTF-8 chunks.
+
+    Args:
+        project_id: Project ID
+        body: Consecutive UTF-8 encoded pieces of the new manuscript
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    # Chunks may split multi-byte characters
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = [decoder.decode(chunk) for chunk in body]
+    parts.append(decoder.decode(b"", final=True))
+
+    pm.save_manuscript_content(project, "".join(parts))
+
+
+def list_chapters(project_id: str) -> List[Dict[str, Any]]:
+    """List the chapters of a project.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Chapter entries (title, offset, length, word count) in order;
+        entry 0 is the preamble
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    if project.storage_mode == "chapters":
+        return [
+            entry.model_dump(mode="json") for entry in pm.chapter_store(project).manifest.chapters
+        ]
+    if not project.metadata.chapters:
+        project.update_word_count(pm.data_dir)
+    return [chapter.model_dump(mode="json") for chapter in project.metadata.chapters]
+
+
+def read_chapter(project_id: str, index: int) -> str:
+    """Read a single chapter.
+
+    Args:
+        project_id: Project ID
+        index: Chapter index
+
+    Returns:
+        Chapter content
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return pm.read_chapter(project, index)
+
+
+def write_chapter(project_id: str, index: int, content: str) -> None:
+    """Replace a single chapter.
+
+    Args:
+        project_id: Project ID
+        index: Chapter index
+        content: New chapter content, including its heading
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    pm.write_chapter(project, index, content)
+
+
+def search_manuscript(
+    project_id: str, query: str, limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Find where a word or phrase appears in a project's manuscript.
+
+    Answered from the project's positional index, which is built on first
+    use and updated on every save.
+
+    Args:
+        project_id: Project ID
+        query: Word or phrase to look for, ignoring case
+        limit: Maximum number of occurrences, or None for all
+
+    Returns:
+        Occurrences (chapter, paragraph, offset, text) in manuscript order
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    postings = pm.find_in_manuscript(project, query, limit)
+    return [posting.model_dump(mode="json") for posting in postings]
+
+
+def enable_chapter_storage(project_id: str) -> Dict[str, Any]:
+    """Switch a project to one file per chapter.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Updated project data
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    pm.enable_chapter_storage(project)
+    return project.model_dump(mode="json")
+
+
+def list_revisions(project_id: str) -> List[Dict[str, Any]]:
+    """List manuscript revisions, oldest first.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Revision entries (number, hash, timestamp, size)
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return [revision.model_dump(mode="json") for revision in pm.list_revisions(project)]
+
+
+def read_revision(project_id: str, number: int) -> str:
+    """Read the manuscript content of a revision.
+
+    Args:
+        project_id: Project ID
+        number: Revision number
+
+    Returns:
+        Manuscript content at that revision
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return pm.get_revision(project, number)
+
+
+def compact_revisions(project_id: str, keep_last: Optional[int] = None) -> Dict[str, int]:
+    """Compact a project's revision history.
+
+    Args:
+        project_id: Project ID
+        keep_last: Number of most recent revisions to keep, or None for all
+
+    Returns:
+        Counts of revisions dropped and objects removed
+    """
+    project = pm.load_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    return pm.compact_revisions(project, keep_last)
 
 
 def export_project(project_id: str, format: str) -> str:
@@ -136,10 +417,17 @@ def export_project(project_id: str, format: str) -> str:
 
     if format == "docx":
         output_path = project_dir / f"{project.name}.docx"
-        converter.markdown_to_docx(manuscript_path, output_path)
+        converter.export_to_docx(
+            pm.get_manuscript_content(project), output_path, title=project.metadata.title
+        )
         return str(output_path)
 
     elif format == "markdown":
+        if project.storage_mode == "chapters":
+            # Assemble the chapters into a single file, one chapter at a time
+            manuscript_path = project_dir / f"{project.name}.md"
+            with open(manuscript_path, "w", encoding="utf-8") as f:
+                f.writelines(pm.iter_manuscript_content(project))
         return str(manuscript_path)
 
     elif format == "pdf":
@@ -161,35 +449,37 @@ def import_document(project_id: str, file_path: str) -> None:
     if not project:
         raise ValueError(f"Project {project_id} not found")
 
-    converter = DocumentConverter()
-    project_dir = project.get_project_dir(pm.data_dir)
-    manuscript_path = project_dir / "manuscript.md"
-
-    input_path = Path(file_path)
+    # Convert to markdown (raises ValueError for unsupported formats)
+    content = DocumentConverter.import_document(Path(file_path))
 
-    if input_path.suffix.lower() == '.docx':
-        converter.docx_to_markdown(input_path, manuscript_path)
-    elif input_path.suffix.lower() == '.pdf':
-        converter.pdf_to_markdown(input_path, manuscript_path)
-    elif input_path.suffix.lower() in ['.txt', '.md']:
-        manuscript_path.write_text(input_path.read_text())
-    else:
-        raise ValueError(f"Unsupported file format: {input_path.suffix}")
-
-    # Update word count
-    project.update_word_count(pm.data_dir)
-    pm._save_project(project)
+    # Write manuscript and updated word count in one journaled commit
+    pm.save_manuscript_content(project, content)
 
 
 # Expose functions for the python_runner
 __all__ = [
     'list_projects',
+    'list_project_summaries',
     'load_project',
+    'get_versions',
     'create_project',
     'delete_project',
+    'list_characters',
+    'list_plot_events',
     'update_metadata',
     'read_manuscript',
     'write_manuscript',
+    'apply_manuscript_patch',
+    'read_manuscript_body',
+    'write_manuscript_body',
+    'list_chapters',
+    'read_chapter',
+    'write_chapter',
+    'enable_chapter_storage',
+    'search_manuscript',
+    'list_revisions',
+    'read_revision',
+    'compact_revisions',
     'export_project',
     'import_document',
 ]
@@ -6,6 +6,7 @@ import { projectRoutes } from './routes/projects';
 import { chatRoutes } from './routes/chat';
 import { reviewRoutes } from './routes/review';
 import { setupSocketHandlers } from './services/socket';
+import { pythonBridge } from './services/python-bridge';
 
 const app = express();
 const httpServer = createServer(app);
@@ -28,7 +29,12 @@ app.use('/api/review', reviewRoutes);
 
 // Health check
 app.get('/health', (req, res) => {
-  res.json({ status: 'ok', timestamp: new Date().toISOString() });
+  res.json({
+    status: 'ok',
+    timestamp: new Date().toISOString(),
+    python: pythonBridge.poolStats(),
+    chat: pythonBridge.chatStats(),
+  });
 });
 
 // Socket.IO setup
@@ -4,10 +4,55 @@
 
 import express from 'express';
 import { pythonBridge } from '../services/python-bridge';
-import { ApiResponse, Project, ManuscriptMetadata } from '../types';
+import {
+  ApiResponse,
+  Project,
+  ProjectSummary,
+  ProjectListOptions,
+  ChapterEntry,
+  ManuscriptMetadata,
+  ManuscriptPatchResult,
+  SearchHit
+} from '../types';
 
 export const projectRoutes = express.Router();
 
+/**
+ * Whether an If-None-Match header matches an entity tag
+ */
+function etagMatches(header: string | undefined, etag: string): boolean {
+  if (!header) return false;
+  return header
+    .split(',')
+    .map((tag) => tag.trim().replace(/^W\//, ''))
+    .some((tag) => tag === '*' || tag === etag);
+}
+
+/**
+ * Tag a project resource with its version token and answer 304 Not Modified
+ * when the client already has it, so the data is never loaded. Returns true
+ * when the response has been sent.
+ *
+ * The token is taken before the data is read, so a concurrent write can only
+ * make the tag older than the body, which costs the client one extra full
+ * response rather than serving it stale data.
+ */
+async function sendNotModified(
+  req: express.Request,
+  res: express.Response,
+  scope: 'project' | 'manuscript'
+): Promise<boolean> {
+  const versions = await pythonBridge.getVersions(req.params.id);
+  const etag = `"${scope}-${versions[scope]}"`;
+  res.setHeader('ETag', etag);
+  res.setHeader('Cache-Control', 'no-cache');
+  if (etagMatches(req.headers['if-none-match'], etag)) {
+    res.status(304).end();
+    return true;
+  }
+  return false;
+}
+
 /**
  * GET /api/projects - List all projects
  */
@@ -27,11 +72,37 @@ projectRoutes.get('/', async (req, res) => {
   }
 });
 
+/**
+ * GET /api/projects/summaries - List project summaries (sorted, paginated)
+ */
+projectRoutes.get('/summaries', async (req, res) => {
+  try {
+    const { sort, order, limit, offset } = req.query;
+    const summaries = await pythonBridge.listProjectSummaries({
+      sort: sort as ProjectListOptions['sort'],
+      descending: order !== 'asc',
+      limit: limit !== undefined ? Number(limit) : undefined,
+      offset: offset !== undefined ? Number(offset) : undefined
+    });
+    const response: ApiResponse<ProjectSummary[]> = {
+      success: true,
+      data: summaries
+    };
+    res.json(response);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to list project summaries'
+    });
+  }
+});
+
 /**
  * GET /api/projects/:id - Get a single project
  */
 projectRoutes.get('/:id', async (req, res) => {
   try {
+    if (await sendNotModified(req, res, 'project')) return;
     const project = await pythonBridge.getProject(req.params.id);
     const response: ApiResponse<Project> = {
       success: true,
@@ -121,6 +192,7 @@ projectRoutes.delete('/:id', async (req, res) => {
  */
 projectRoutes.get('/:id/manuscript', async (req, res) => {
   try {
+    if (await sendNotModified(req, res, 'manuscript')) return;
     const content = await pythonBridge.readManuscript(req.params.id);
     const response: ApiResponse<string> = {
       success: true,
@@ -164,11 +236,185 @@ projectRoutes.put('/:id/manuscript', async (req, res) => {
   }
 });
 
+/**
+ * PATCH /api/projects/:id/manuscript - Apply edits against a manuscript version
+ */
+projectRoutes.patch('/:id/manuscript', async (req, res) => {
+  try {
+    const { baseVersion, ops } = req.body;
+
+    if (typeof baseVersion !== 'number' || !Array.isArray(ops)) {
+      return res.status(400).json({
+        success: false,
+        error: 'baseVersion must be a number and ops an array of edits'
+      });
+    }
+
+    const result = await pythonBridge.applyManuscriptPatch(req.params.id, baseVersion, ops);
+    const response: ApiResponse<ManuscriptPatchResult> = {
+      success: true,
+      data: result
+    };
+    res.json(response);
+  } catch (error: any) {
+    const stale = error.type === 'StaleVersionError';
+    res.status(stale ? 409 : 500).json({
+      success: false,
+      error: error.message || 'Failed to patch manuscript'
+    });
+  }
+});
+
+/**
+ * GET /api/projects/:id/manuscript/raw - Stream manuscript content as Markdown
+ */
+projectRoutes.get('/:id/manuscript/raw', async (req, res) => {
+  try {
+    if (await sendNotModified(req, res, 'manuscript')) return;
+    const stream = await pythonBridge.readManuscriptStream(req.params.id);
+    res.type('text/markdown; charset=utf-8');
+    stream.on('error', () => res.destroy());
+    req.on('close', () => stream.destroy());
+    stream.pipe(res);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to read manuscript'
+    });
+  }
+});
+
+/**
+ * PUT /api/projects/:id/manuscript/raw - Replace manuscript content from a raw
+ * UTF-8 request body, streamed to Python without buffering the whole book
+ */
+projectRoutes.put('/:id/manuscript/raw', async (req, res) => {
+  try {
+    await pythonBridge.writeManuscriptStream(req.params.id, req);
+
+    const response: ApiResponse = {
+      success: true,
+      message: 'Manuscript updated successfully'
+    };
+    res.json(response);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to update manuscript'
+    });
+  }
+});
+
+/**
+ * GET /api/projects/:id/search?q=...&limit=... - Find a word or phrase in the manuscript
+ */
+projectRoutes.get('/:id/search', async (req, res) => {
+  try {
+    const query = typeof req.query.q === 'string' ? req.query.q : '';
+    if (!query.trim()) {
+      return res.status(400).json({
+        success: false,
+        error: 'Query parameter q is required'
+      });
+    }
+    const limit = req.query.limit !== undefined ? Number(req.query.limit) : undefined;
+    if (limit !== undefined && (!Number.isInteger(limit) || limit < 1)) {
+      return res.status(400).json({
+        success: false,
+        error: 'limit must be a positive integer'
+      });
+    }
+
+    if (await sendNotModified(req, res, 'manuscript')) return;
+    const hits = await pythonBridge.searchManuscript(req.params.id, query, limit);
+    const response: ApiResponse<SearchHit[]> = {
+      success: true,
+      data: hits
+    };
+    res.json(response);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to search manuscript'
+    });
+  }
+});
+
+/**
+ * GET /api/projects/:id/chapters - List chapters (chapters storage mode)
+ */
+projectRoutes.get('/:id/chapters', async (req, res) => {
+  try {
+    if (await sendNotModified(req, res, 'manuscript')) return;
+    const chapters = await pythonBridge.listChapters(req.params.id);
+    const response: ApiResponse<ChapterEntry[]> = {
+      success: true,
+      data: chapters
+    };
+    res.json(response);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to list chapters'
+    });
+  }
+});
+
+/**
+ * GET /api/projects/:id/chapters/:index - Get a single chapter
+ */
+projectRoutes.get('/:id/chapters/:index', async (req, res) => {
+  try {
+    if (await sendNotModified(req, res, 'manuscript')) return;
+    const content = await pythonBridge.readChapter(req.params.id, Number(req.params.index));
+    const response: ApiResponse<string> = {
+      success: true,
+      data: content
+    };
+    res.json(response);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to read chapter'
+    });
+  }
+});
+
+/**
+ * PUT /api/projects/:id/chapters/:index - Replace a single chapter
+ */
+projectRoutes.put('/:id/chapters/:index', async (req, res) => {
+  try {
+    const { content } = req.body;
+
+    if (typeof content !== 'string') {
+      return res.status(400).json({
+        success: false,
+        error: 'Chapter content must be a string'
+      });
+    }
+
+    await pythonBridge.writeChapter(req.params.id, Number(req.params.index), content);
+
+    const response: ApiResponse = {
+      success: true,
+      message: 'Chapter updated successfully'
+    };
+    res.json(response);
+  } catch (error: any) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Failed to update chapter'
+    });
+  }
+});
+
 /**
  * GET /api/projects/:id/characters - Get all characters
  */
 projectRoutes.get('/:id/characters', async (req, res) => {
   try {
+    if (await sendNotModified(req, res, 'project')) return;
     const characters = await pythonBridge.getCharacters(req.params.id);
     const response: ApiResponse = {
       success: true,
@@ -188,6 +434,7 @@ projectRoutes.get('/:id/characters', async (req, res) => {
  */
 projectRoutes.get('/:id/plot-events', async (req, res) => {
   try {
+    if (await sendNotModified(req, res, 'project')) return;
     const plotEvents = await pythonBridge.getPlotEvents(req.params.id);
     const response: ApiResponse = {
       success: true,
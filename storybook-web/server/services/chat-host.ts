@@ -0,0 +1,197 @@
+/**
+ * Chat Host Client
+ *
+ * Runs one long-lived `chat_bridge.py --host` process that serves every chat
+ * session on a single asyncio loop, instead of one interpreter, SDK client
+ * and tool server per connected socket.
+ *
+ * Commands go to the host as length-prefixed JSON frames on stdin; events
+ * come back through `readEventStream`, each tagged with its session id.
+ * Sessions share the host's stdout, so it is never paused: each session has
+ * its own delivery queue, and a handler that applies backpressure only holds
+ * up its own session. A session that falls far behind drops partial reply
+ * text, which the final message replaces anyway.
+ */
+
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import { readEventStream, BridgeEvent } from './event-stream';
+
+export interface ChatHostOptions {
+  pythonPath: string;
+  scriptPath: string;
+  /** Turns running at once across all sessions */
+  maxConcurrent?: number;
+  /** Sessions open at once */
+  maxSessions?: number;
+  /** Seconds without activity before the host closes a session */
+  idleTimeoutSeconds?: number;
+  /** Send `delta` events with reply text as it is generated */
+  streamPartial?: boolean;
+}
+
+interface HostedChat {
+  onEvent: (event: BridgeEvent) => void | Promise<void>;
+  onClose: () => void;
+  /** Events waiting for the handler, in order */
+  queue: BridgeEvent[];
+  delivering: boolean;
+}
+
+// Events after which the host has forgotten the session
+const TERMINAL_EVENTS = new Set(['closed', 'evicted']);
+
+// Queued events per session beyond which partial reply text is dropped
+const MAX_QUEUED_EVENTS = 1000;
+const PARTIAL_EVENTS = new Set(['delta']);
+
+function encodeCommand(command: Record<string, any>): Buffer {
+  const payload = Buffer.from(JSON.stringify(command), 'utf8');
+  const header = Buffer.alloc(4);
+  header.writeUInt32BE(payload.length, 0);
+  return Buffer.concat([header, payload]);
+}
+
+export class ChatHostClient {
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private sessions = new Map<string, HostedChat>();
+
+  constructor(private options: ChatHostOptions) {}
+
+  /**
+   * Open a session; the host starts it in the background and reports
+   * `opened` or `error`
+   */
+  open(
+    sessionId: string,
+    projectId: string,
+    onEvent: (event: BridgeEvent) => void | Promise<void>,
+    onClose: () => void
+  ): void {
+    this.sessions.set(sessionId, { onEvent, onClose, queue: [], delivering: false });
+    this.command({ op: 'open', session: sessionId, project_id: projectId });
+  }
+
+  send(sessionId: string, content: string): void {
+    this.requireSession(sessionId);
+    this.command({ op: 'send', session: sessionId, content });
+  }
+
+  cancel(sessionId: string): void {
+    this.requireSession(sessionId);
+    this.command({ op: 'cancel', session: sessionId });
+  }
+
+  close(sessionId: string): void {
+    if (!this.sessions.has(sessionId)) return;
+    this.command({ op: 'close', session: sessionId });
+  }
+
+  has(sessionId: string): boolean {
+    return this.sessions.has(sessionId);
+  }
+
+  stats() {
+    return { running: this.process !== null, sessions: this.sessions.size };
+  }
+
+  /**
+   * Stop the host process; every session is closed
+   */
+  shutdown(): void {
+    if (this.process) {
+      this.process.stdin.end();
+      this.process.kill();
+    }
+  }
+
+  private requireSession(sessionId: string): void {
+    if (!this.sessions.has(sessionId)) {
+      throw new Error(`Chat session ${sessionId} not found`);
+    }
+  }
+
+  private command(command: Record<string, any>): void {
+    this.ensureProcess().stdin.write(encodeCommand(command));
+  }
+
+  private ensureProcess(): ChildProcessWithoutNullStreams {
+    if (this.process) return this.process;
+
+    const args = [this.options.scriptPath, '--host'];
+    if (this.options.streamPartial) args.push('--stream');
+    if (this.options.maxConcurrent) args.push('--max-concurrent', String(this.options.maxConcurrent));
+    if (this.options.maxSessions) args.push('--max-sessions', String(this.options.maxSessions));
+    if (this.options.idleTimeoutSeconds) {
+      args.push('--idle-timeout', String(this.options.idleTimeoutSeconds));
+    }
+
+    const child = spawn(this.options.pythonPath, args);
+    this.process = child;
+
+    readEventStream(child.stdout, (event) => this.dispatch(event));
+
+    child.stderr.on('data', (data) => {
+      console.error('Chat host error:', data.toString());
+    });
+
+    child.stdin.on('error', (err) => {
+      console.error('Chat host stdin error:', err.message);
+    });
+
+    child.on('close', (code) => {
+      if (this.process === child) this.process = null;
+      // The host is gone, and so is every session it held; the next open
+      // starts a fresh host
+      const sessions = Array.from(this.sessions.values());
+      this.sessions.clear();
+      sessions.forEach((session) => {
+        // After whatever the session still had queued
+        session.queue.push(
+          { type: 'error', seq: -1, message: `Chat host exited (${code})` },
+          { type: 'closed', seq: -1 }
+        );
+        void this.deliver(session);
+      });
+    });
+
+    return child;
+  }
+
+  private dispatch(event: BridgeEvent): void {
+    const session = this.sessions.get(event.session);
+    if (!session) return;
+
+    if (TERMINAL_EVENTS.has(event.type)) {
+      this.sessions.delete(event.session);
+    } else if (session.queue.length >= MAX_QUEUED_EVENTS && PARTIAL_EVENTS.has(event.type)) {
+      return;
+    }
+    session.queue.push(event);
+    void this.deliver(session);
+  }
+
+  /**
+   * Hand a session's queued events to its handler, waiting whenever the
+   * handler applies backpressure
+   */
+  private async deliver(session: HostedChat): Promise<void> {
+    if (session.delivering) return;
+    session.delivering = true;
+    try {
+      while (session.queue.length) {
+        const event = session.queue.shift()!;
+        if (TERMINAL_EVENTS.has(event.type)) {
+          session.onClose();
+          continue;
+        }
+        try {
+          await session.onEvent(event);
+        } catch (err: any) {
+          console.error('Chat event handler error:', err?.message ?? err);
+        }
+      }
+    } finally {
+      session.delivering = false;
+    }
+  }
+}
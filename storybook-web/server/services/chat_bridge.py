@@ -1,111 +1,171 @@
 #!/usr/bin/env python3
 """
 Chat Bridge - Handles real-time chat streaming from Python to Node.js
+
+Events leave on stdout as length-prefixed frames written by
+``storybook.events.EventStream``, which merges text deltas and blocks when
+Node stops reading.
+
+Two modes:
+
+- ``chat_bridge.py <project_id>`` runs one session; messages arrive on
+  stdin as JSON lines.
+- ``chat_bridge.py --host`` runs many sessions on one event loop
+  (``storybook.chat_host.ChatHost``); commands arrive on stdin as frames
+  and every event carries the ``session`` it belongs to.
 """
 
 import sys
 import json
 import asyncio
-from typing import Dict, Any
+import argparse
+import threading
+from typing import AsyncIterator
+from storybook.events import EventStream, read_events
 from storybook.project_manager import ProjectManager
-from storybook.chat import ChatSession
-
-
-async def stream_chat(project_id: str):
+from storybook.chat import ManuscriptChatSession
+from storybook.chat_host import ChatHost
+
+
+def to_bridge_event(event: dict) -> dict:
+    """Translate a chat session event into the bridge protocol."""
+    kind = event.get("type")
+    if kind == "text_delta":
+        return {"type": "delta", "role": "assistant", "content": event["content"]}
+    if kind == "text":
+        return {
+            "type": "message",
+            "role": "assistant",
+            "content": event["content"],
+            "streamed": event.get("streamed", False),
+        }
+    if kind == "tool_use":
+        return {"type": "tool", "name": event["tool"], "input": event.get("input", {})}
+    return event
+
+
+async def stream_chat(project_id: str, events: EventStream, stream_partial: bool = False):
     """
-    Stream chat events to stdout as JSON lines
+    Stream chat events to stdout as frames
 
     Events:
-    - {"type": "message", "role": "assistant", "content": "..."}
+    - {"type": "delta", "role": "assistant", "content": "..."} (with --stream)
+    - {"type": "message", "role": "assistant", "content": "...", "streamed": bool}
     - {"type": "thinking", "content": "..."}
     - {"type": "tool", "name": "...", "input": {...}}
-    - {"type": "complete"}
+    - {"type": "complete", "cost": ..., "turns": ...}
     """
-    try:
-        # Load project
-        pm = ProjectManager()
-        project = pm.load_project(project_id)
-
-        # Create chat session
-        chat = ChatSession(project)
-
-        # Event handlers
-        def on_message(role: str, content: str):
-            print(json.dumps({
-                "type": "message",
-                "role": role,
-                "content": content,
-                "timestamp": str(asyncio.get_event_loop().time())
-            }), flush=True)
-
-        def on_thinking(content: str):
-            print(json.dumps({
-                "type": "thinking",
-                "content": content
-            }), flush=True)
-
-        def on_tool(name: str, tool_input: Dict[str, Any]):
-            print(json.dumps({
-                "type": "tool",
-                "name": name,
-                "input": tool_input
-            }), flush=True)
-
-        # Attach event handlers
-        chat.on_message = on_message
-        chat.on_thinking = on_thinking
-        chat.on_tool = on_tool
+    pm = ProjectManager()
+    project = pm.load_project(project_id)
+
+    chat = ManuscriptChatSession(project, pm, stream_partial=stream_partial)
+    await chat.start()
 
+    try:
         # Read messages from stdin
         while True:
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+            line = await asyncio.to_thread(sys.stdin.readline)
             if not line:
                 break
 
             try:
                 data = json.loads(line)
                 if data.get("type") == "message":
-                    message = data.get("content", "")
-
-                    # Send message and stream response
-                    await chat.send_message_async(message)
-
-                    print(json.dumps({
-                        "type": "complete"
-                    }), flush=True)
+                    async for event in chat.send_message(data.get("content", "")):
+                        await events.send(to_bridge_event(event))
+                    await events.flush()
 
             except json.JSONDecodeError:
-                print(json.dumps({
-                    "type": "error",
-                    "message": "Invalid JSON input"
-                }), flush=True)
+                await events.send({"type": "error", "message": "Invalid JSON input"})
+            except OSError:
+                raise
             except Exception as e:
-                print(json.dumps({
-                    "type": "error",
-                    "message": str(e)
-                }), flush=True)
-
+                await events.send({"type": "error", "message": str(e)})
+    finally:
+        await chat.close()
+
+
+async def read_commands() -> AsyncIterator[dict]:
+    """Yield command frames from stdin without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def pump():
+        try:
+            for command in read_events(sys.stdin.buffer):
+                loop.call_soon_threadsafe(queue.put_nowait, command)
+        except ValueError as e:
+            print(f"Bad command frame: {e}", file=sys.stderr)
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    threading.Thread(target=pump, daemon=True).start()
+    while True:
+        command = await queue.get()
+        if command is None:
+            return
+        yield command
+
+
+async def host_chats(events: EventStream, args: argparse.Namespace):
+    """Serve multiplexed chat sessions until stdin closes."""
+    pm = ProjectManager()
+
+    async def open_chat(project_id: str) -> ManuscriptChatSession:
+        chat = ManuscriptChatSession(
+            pm.load_project(project_id), pm, stream_partial=args.stream
+        )
+        await chat.start()
+        return chat
+
+    host = ChatHost(
+        events,
+        open_chat,
+        max_concurrent=args.max_concurrent,
+        max_sessions=args.max_sessions,
+        idle_timeout=args.idle_timeout,
+        translate=to_bridge_event,
+    )
+    await host.run(read_commands())
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the bridge and return its exit status."""
+    events = EventStream(sys.stdout.buffer)
+    status = 0
+    try:
+        if args.host:
+            await host_chats(events, args)
+        else:
+            await stream_chat(args.project_id, events, stream_partial=args.stream)
+    except OSError:
+        # Node closed the pipe; nobody is left to tell
+        return 1
     except Exception as e:
-        print(json.dumps({
-            "type": "error",
-            "message": f"Chat session failed: {str(e)}"
-        }), flush=True)
-        sys.exit(1)
+        await events.send({"type": "error", "message": f"Chat session failed: {str(e)}"})
+        status = 1
+    await events.close()
+    return status
 
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
-            "type": "error",
-            "message": "No project ID provided"
-        }), flush=True)
-        sys.exit(1)
-
-    project_id = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Storybook chat bridge")
+    parser.add_argument("project_id", nargs="?", help="Project for a single-session bridge")
+    parser.add_argument("--host", action="store_true", help="Host many sessions in this process")
+    parser.add_argument(
+        "--stream", action="store_true", help="Send reply text as it is generated"
+    )
+    parser.add_argument("--max-concurrent", type=int, default=8, help="Turns running at once")
+    parser.add_argument("--max-sessions", type=int, default=256, help="Open sessions allowed")
+    parser.add_argument(
+        "--idle-timeout", type=float, default=900.0, help="Seconds before an idle session is closed"
+    )
+    args = parser.parse_args()
+    if not args.host and not args.project_id:
+        parser.error("a project ID is required unless --host is given")
 
     try:
-        asyncio.run(stream_chat(project_id))
+        sys.exit(asyncio.run(run(args)))
     except KeyboardInterrupt:
         pass
 
@@ -0,0 +1,107 @@
+/**
+ * Bridge Event Stream
+ *
+ * Decodes the framed events written by `storybook.events.EventStream` in
+ * chat_bridge.py and review_bridge.py: a 4-byte big-endian length followed
+ * by one JSON event carrying a `seq` number.
+ *
+ * Frames are reassembled across stdout chunks, so an event split by the pipe
+ * is never lost. When the handler returns a promise (for example because a
+ * socket client is behind), the child's stdout is paused until it settles;
+ * the pipe then fills and the Python writer blocks instead of buffering.
+ */
+
+import { Readable } from 'stream';
+
+const FRAME_HEADER_SIZE = 4;
+const MAX_FRAME_SIZE = 16 * 1024 * 1024;
+
+export interface BridgeEvent {
+  type: string;
+  seq: number;
+  [key: string]: any;
+}
+
+export type BridgeEventHandler = (event: BridgeEvent) => void | Promise<void>;
+
+export interface EventStreamOptions {
+  /** Called when an event's sequence number is not the expected one */
+  onGap?: (expected: number, received: number) => void;
+  /** Called when the stream carries a malformed frame */
+  onError?: (err: Error) => void;
+}
+
+/**
+ * Read framed events from a child's stdout and deliver them in order
+ */
+export function readEventStream(
+  stream: Readable,
+  onEvent: BridgeEventHandler,
+  options: EventStreamOptions = {}
+): void {
+  let buffer = Buffer.alloc(0);
+  let expectedSeq = 0;
+  const queue: BridgeEvent[] = [];
+  let delivering = false;
+
+  const fail = (err: Error) => {
+    if (options.onError) options.onError(err);
+    else console.error('Bridge event stream error:', err.message);
+  };
+
+  const deliver = async () => {
+    if (delivering) return;
+    delivering = true;
+    try {
+      while (queue.length) {
+        const event = queue.shift()!;
+        try {
+          const pending = onEvent(event);
+          if (pending) {
+            stream.pause();
+            await pending;
+          }
+        } catch (err: any) {
+          fail(err);
+        }
+      }
+    } finally {
+      delivering = false;
+      stream.resume();
+    }
+  };
+
+  stream.on('data', (chunk: Buffer) => {
+    buffer = buffer.length ? Buffer.concat([buffer, chunk]) : chunk;
+
+    while (buffer.length >= FRAME_HEADER_SIZE) {
+      const length = buffer.readUInt32BE(0);
+      if (length > MAX_FRAME_SIZE) {
+        fail(new Error(`Bridge frame of ${length} bytes exceeds limit`));
+        stream.destroy();
+        return;
+      }
+      if (buffer.length < FRAME_HEADER_SIZE + length) break;
+
+      const payload = buffer.subarray(FRAME_HEADER_SIZE, FRAME_HEADER_SIZE + length);
+      buffer = buffer.subarray(FRAME_HEADER_SIZE + length);
+
+      let event: BridgeEvent;
+      try {
+        event = JSON.parse(payload.toString('utf8'));
+      } catch (err) {
+        fail(new Error('Failed to parse bridge event'));
+        continue;
+      }
+
+      if (event.seq !== expectedSeq) {
+        if (options.onGap) options.onGap(expectedSeq, event.seq);
+        else console.warn(`Bridge event gap: expected seq ${expectedSeq}, got ${event.seq}`);
+      }
+      expectedSeq = event.seq + 1;
+      queue.push(event);
+    }
+
+    void deliver();
+  });
+}
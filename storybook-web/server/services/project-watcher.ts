@@ -0,0 +1,88 @@
+/**
+ * Project Watcher
+ *
+ * Runs `watch_bridge.py`, which watches the project data directory (inotify,
+ * or polling where that is unavailable) and reports debounced changes no
+ * matter who made them: REST calls, the CLI, or the agent's file tools
+ * inside a chat. Each change is re-emitted as a `change` event for the
+ * socket layer to fan out to `project:<id>` rooms.
+ */
+
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import { EventEmitter } from 'events';
+import { readEventStream } from './event-stream';
+
+export interface ProjectChange {
+  projectId: string;
+  kind: 'manuscript' | 'metadata' | 'created' | 'deleted';
+  /** Changed files, relative to the project directory */
+  paths: string[];
+}
+
+export interface ProjectWatcherOptions {
+  pythonPath: string;
+  scriptPath: string;
+  /** Project data directory; the Python default when omitted */
+  dataDir?: string;
+  /** Delay before restarting the watcher after it exits */
+  restartDelayMs?: number;
+}
+
+export class ProjectWatcher extends EventEmitter {
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private stopped = true;
+  private restartTimer: NodeJS.Timeout | null = null;
+
+  constructor(private options: ProjectWatcherOptions) {
+    super();
+  }
+
+  start(): void {
+    if (!this.stopped) return;
+    this.stopped = false;
+    this.spawn();
+  }
+
+  stop(): void {
+    this.stopped = true;
+    if (this.restartTimer) clearTimeout(this.restartTimer);
+    this.restartTimer = null;
+    this.process?.kill();
+    this.process = null;
+  }
+
+  private spawn(): void {
+    const args = [this.options.scriptPath];
+    if (this.options.dataDir) args.push('--data-dir', this.options.dataDir);
+
+    const child = spawn(this.options.pythonPath, args);
+    this.process = child;
+
+    readEventStream(child.stdout, (event) => {
+      if (event.type === 'ready') {
+        console.log(`👀 Watching projects (${event.backend})`);
+      } else if (event.type === 'change') {
+        const change: ProjectChange = {
+          projectId: event.project_id,
+          kind: event.kind,
+          paths: event.paths || []
+        };
+        this.emit('change', change);
+      }
+    });
+
+    child.stderr.on('data', (data) => {
+      console.error('Project watcher error:', data.toString());
+    });
+
+    child.on('close', (code) => {
+      if (this.process === child) this.process = null;
+      if (this.stopped) return;
+      console.error(`Project watcher exited (${code}); restarting`);
+      this.restartTimer = setTimeout(() => {
+        this.restartTimer = null;
+        if (!this.stopped) this.spawn();
+      }, this.options.restartDelayMs ?? 1000);
+    });
+  }
+}
@@ -7,8 +7,25 @@
 
 import { spawn, ChildProcess } from 'child_process';
 import { EventEmitter } from 'events';
+import { Readable } from 'stream';
 import path from 'path';
-import { Project, Character, PlotEvent, ManuscriptMetadata } from '../types';
+import { PythonWorkerPool } from './python-pool';
+import { readEventStream, BridgeEvent } from './event-stream';
+import { ChatHostClient } from './chat-host';
+import { ProjectWatcher } from './project-watcher';
+import {
+  Project,
+  ProjectSummary,
+  ProjectListOptions,
+  ChapterEntry,
+  ManuscriptEdit,
+  ManuscriptPatchResult,
+  ProjectVersions,
+  SearchHit,
+  Character,
+  PlotEvent,
+  ManuscriptMetadata
+} from '../types';
 
 interface PythonCommand {
   module: string;
@@ -26,18 +43,49 @@ export class PythonBridge extends EventEmitter {
   private pythonPath: string;
   private projectRoot: string;
   private activeSessions: Map<string, ChildProcess>;
+  private pool: PythonWorkerPool;
+  private chatHost: ChatHostClient;
+  private chatCounter = 0;
+  private watcher: ProjectWatcher | null = null;
 
   constructor() {
     super();
     this.projectRoot = path.join(__dirname, '../../../');
     this.pythonPath = path.join(this.projectRoot, '.venv/bin/python');
     this.activeSessions = new Map();
+    this.pool = new PythonWorkerPool({
+      pythonPath: this.pythonPath,
+      scriptPath: path.join(this.projectRoot, 'storybook-web/server/services/python_runner.py'),
+      size: Number(process.env.STORYBOOK_PYTHON_WORKERS) || 2,
+    });
+    this.chatHost = new ChatHostClient({
+      pythonPath: this.pythonPath,
+      scriptPath: path.join(this.projectRoot, 'storybook-web/server/services/chat_bridge.py'),
+      maxConcurrent: Number(process.env.STORYBOOK_CHAT_MAX_CONCURRENT) || undefined,
+      maxSessions: Number(process.env.STORYBOOK_CHAT_MAX_SESSIONS) || undefined,
+      idleTimeoutSeconds: Number(process.env.STORYBOOK_CHAT_IDLE_TIMEOUT) || undefined,
+      streamPartial: process.env.STORYBOOK_CHAT_STREAM === '1',
+    });
+  }
+
+  /**
+   * Worker pool statistics
+   */
+  poolStats() {
+    return this.pool.stats();
   }
 
   /**
-   * Execute a Python function and return the result
+   * Execute a Python function in a pooled worker and return the result
    */
   async execute<T = any>(command: PythonCommand): Promise<T> {
+    return this.pool.call<T>(`${command.module}.${command.function}`, command.args);
+  }
+
+  /**
+   * Execute a Python function in a fresh interpreter (one process per call)
+   */
+  async executeOnce<T = any>(command: PythonCommand): Promise<T> {
     return new Promise((resolve, reject) => {
       const scriptPath = path.join(this.projectRoot, 'storybook-web/server/services/python_runner.py');
 
@@ -92,6 +140,33 @@ export class PythonBridge extends EventEmitter {
     });
   }
 
+  /**
+   * List project summaries from the catalog (sorted and paginated)
+   */
+  async listProjectSummaries(options: ProjectListOptions = {}): Promise<ProjectSummary[]> {
+    return this.execute<ProjectSummary[]>({
+      module: 'storybook.web_integration',
+      function: 'list_project_summaries',
+      args: [
+        options.sort ?? 'last_edited',
+        options.descending ?? true,
+        options.limit ?? null,
+        options.offset ?? 0
+      ]
+    });
+  }
+
+  /**
+   * Get a project's change tokens (cheap; reads file metadata only)
+   */
+  async getVersions(projectId: string): Promise<ProjectVersions> {
+    return this.execute<ProjectVersions>({
+      module: 'storybook.web_integration',
+      function: 'get_versions',
+      args: [projectId]
+    });
+  }
+
   /**
    * Get a single project by ID
    */
@@ -140,21 +215,107 @@ export class PythonBridge extends EventEmitter {
    * Read manuscript content
    */
   async readManuscript(projectId: string): Promise<string> {
-    return this.execute<string>({
+    const chunks: Buffer[] = [];
+    for await (const chunk of await this.readManuscriptStream(projectId)) {
+      chunks.push(chunk);
+    }
+    return Buffer.concat(chunks).toString('utf8');
+  }
+
+  /**
+   * Apply text edits made against a manuscript version (autosave).
+   * Rejects with a PythonError of type StaleVersionError when the base is outdated.
+   */
+  async applyManuscriptPatch(
+    projectId: string,
+    baseVersion: number,
+    ops: ManuscriptEdit[]
+  ): Promise<ManuscriptPatchResult> {
+    // The Python side returns snake_case keys
+    const result = await this.execute<{
+      version: number;
+      word_count: number;
+      chapter_count: number;
+    }>({
       module: 'storybook.web_integration',
-      function: 'read_manuscript',
-      args: [projectId]
+      function: 'apply_manuscript_patch',
+      args: [projectId, baseVersion, ops]
     });
+    return {
+      version: result.version,
+      wordCount: result.word_count,
+      chapterCount: result.chapter_count
+    };
+  }
+
+  /**
+   * Stream manuscript content as UTF-8 chunks
+   */
+  async readManuscriptStream(projectId: string): Promise<Readable> {
+    return this.pool.callStream('storybook.web_integration.read_manuscript_body', [projectId]);
   }
 
   /**
    * Write manuscript content
    */
   async writeManuscript(projectId: string, content: string): Promise<void> {
+    return this.writeManuscriptStream(projectId, [Buffer.from(content, 'utf8')]);
+  }
+
+  /**
+   * Write manuscript content from a stream of UTF-8 chunks
+   * (e.g. an incoming HTTP request body)
+   */
+  async writeManuscriptStream(
+    projectId: string,
+    body: AsyncIterable<Buffer | string> | Iterable<Buffer | string>
+  ): Promise<void> {
+    return this.pool.call<void>('storybook.web_integration.write_manuscript_body', [projectId], {
+      body: Readable.from(body)
+    });
+  }
+
+  /**
+   * List chapters of a project stored in chapters mode
+   */
+  async listChapters(projectId: string): Promise<ChapterEntry[]> {
+    return this.execute<ChapterEntry[]>({
+      module: 'storybook.web_integration',
+      function: 'list_chapters',
+      args: [projectId]
+    });
+  }
+
+  /**
+   * Find where a word or phrase appears in a project's manuscript
+   */
+  async searchManuscript(projectId: string, query: string, limit?: number): Promise<SearchHit[]> {
+    return this.execute<SearchHit[]>({
+      module: 'storybook.web_integration',
+      function: 'search_manuscript',
+      args: [projectId, query, limit ?? null]
+    });
+  }
+
+  /**
+   * Read a single chapter
+   */
+  async readChapter(projectId: string, index: number): Promise<string> {
+    return this.execute<string>({
+      module: 'storybook.web_integration',
+      function: 'read_chapter',
+      args: [projectId, index]
+    });
+  }
+
+  /**
+   * Replace a single chapter
+   */
+  async writeChapter(projectId: string, index: number, content: string): Promise<void> {
     return this.execute<void>({
       module: 'storybook.web_integration',
-      function: 'write_manuscript',
-      args: [projectId, content]
+      function: 'write_chapter',
+      args: [projectId, index, content]
     });
   }
 
@@ -162,16 +323,22 @@ export class PythonBridge extends EventEmitter {
    * Get project characters
    */
   async getCharacters(projectId: string): Promise<Character[]> {
-    const project = await this.getProject(projectId);
-    return project.characters;
+    return this.execute<Character[]>({
+      module: 'storybook.web_integration',
+      function: 'list_characters',
+      args: [projectId]
+    });
   }
 
   /**
    * Get project plot events
    */
   async getPlotEvents(projectId: string): Promise<PlotEvent[]> {
-    const project = await this.getProject(projectId);
-    return project.plotEvents;
+    return this.execute<PlotEvent[]>({
+      module: 'storybook.web_integration',
+      function: 'list_plot_events',
+      args: [projectId]
+    });
   }
 
   /**
@@ -197,39 +364,15 @@ export class PythonBridge extends EventEmitter {
   }
 
   /**
-   * Start a streaming chat session (returns session ID)
+   * Start a streaming chat session in the shared chat host (returns session ID)
    */
-  createChatSession(projectId: string, onMessage: (data: any) => void, onComplete: () => void): string {
-    const sessionId = `chat_${projectId}_${Date.now()}`;
-    const scriptPath = path.join(this.projectRoot, 'storybook-web/server/services/chat_bridge.py');
-
-    const pythonProcess = spawn(this.pythonPath, [
-      scriptPath,
-      projectId
-    ]);
-
-    pythonProcess.stdout.on('data', (data) => {
-      const lines = data.toString().split('\n').filter((line: string) => line.trim());
-      lines.forEach((line: string) => {
-        try {
-          const event = JSON.parse(line);
-          onMessage(event);
-        } catch (err) {
-          console.error('Failed to parse chat event:', line);
-        }
-      });
-    });
-
-    pythonProcess.stderr.on('data', (data) => {
-      console.error('Chat session error:', data.toString());
-    });
-
-    pythonProcess.on('close', () => {
-      this.activeSessions.delete(sessionId);
-      onComplete();
-    });
-
-    this.activeSessions.set(sessionId, pythonProcess);
+  createChatSession(
+    projectId: string,
+    onMessage: (event: BridgeEvent) => void | Promise<void>,
+    onComplete: () => void
+  ): string {
+    const sessionId = `chat_${projectId}_${Date.now()}_${++this.chatCounter}`;
+    this.chatHost.open(sessionId, projectId, onMessage, onComplete);
     return sessionId;
   }
 
@@ -237,28 +380,43 @@ export class PythonBridge extends EventEmitter {
    * Send a message to an active chat session
    */
   async sendChatMessage(sessionId: string, message: string): Promise<void> {
-    const session = this.activeSessions.get(sessionId);
-    if (!session) {
-      throw new Error(`Chat session ${sessionId} not found`);
-    }
+    this.chatHost.send(sessionId, message);
+  }
 
-    return new Promise((resolve, reject) => {
-      session.stdin.write(JSON.stringify({ type: 'message', content: message }) + '\n', (err) => {
-        if (err) reject(err);
-        else resolve();
-      });
-    });
+  /**
+   * Stop the response a chat session is generating
+   */
+  cancelChatMessage(sessionId: string): void {
+    this.chatHost.cancel(sessionId);
   }
 
   /**
    * Close a chat session
    */
   closeChatSession(sessionId: string): void {
-    const session = this.activeSessions.get(sessionId);
-    if (session) {
-      session.kill();
-      this.activeSessions.delete(sessionId);
+    this.chatHost.close(sessionId);
+  }
+
+  /**
+   * Start watching the project data directory (once) and return the watcher
+   */
+  watchProjects(): ProjectWatcher {
+    if (!this.watcher) {
+      this.watcher = new ProjectWatcher({
+        pythonPath: this.pythonPath,
+        scriptPath: path.join(this.projectRoot, 'storybook-web/server/services/watch_bridge.py'),
+        dataDir: process.env.STORYBOOK_DATA_DIR,
+      });
+      this.watcher.start();
     }
+    return this.watcher;
+  }
+
+  /**
+   * Chat host statistics
+   */
+  chatStats() {
+    return this.chatHost.stats();
   }
 
   /**
@@ -267,7 +425,7 @@ export class PythonBridge extends EventEmitter {
   createReviewSession(
     projectId: string,
     focusAreas: string[] | undefined,
-    onProgress: (data: any) => void,
+    onProgress: (event: BridgeEvent) => void | Promise<void>,
     onComplete: (review: any) => void
   ): string {
     const sessionId = `review_${projectId}_${Date.now()}`;
@@ -279,20 +437,12 @@ export class PythonBridge extends EventEmitter {
       JSON.stringify(focusAreas || [])
     ]);
 
-    pythonProcess.stdout.on('data', (data) => {
-      const lines = data.toString().split('\n').filter((line: string) => line.trim());
-      lines.forEach((line: string) => {
-        try {
-          const event = JSON.parse(line);
-          if (event.type === 'complete') {
-            onComplete(event.data);
-          } else {
-            onProgress(event);
-          }
-        } catch (err) {
-          console.error('Failed to parse review event:', line);
-        }
-      });
+    readEventStream(pythonProcess.stdout, (event) => {
+      if (event.type === 'complete') {
+        onComplete(event.data);
+      } else {
+        return onProgress(event);
+      }
     });
 
     pythonProcess.stderr.on('data', (data) => {
@@ -315,6 +465,9 @@ export class PythonBridge extends EventEmitter {
       session.kill();
     });
     this.activeSessions.clear();
+    this.chatHost.shutdown();
+    this.watcher?.stop();
+    this.pool.close();
   }
 }
 
@@ -0,0 +1,405 @@
+/**
+ * Python Worker Pool
+ *
+ * Keeps a set of long-lived `python_runner.py --serve` processes and
+ * dispatches JSON-RPC requests to them over framed stdio, so REST calls do
+ * not pay interpreter startup and imports every time.
+ *
+ * Frames are a 9-byte header (kind, request id, payload length) plus the
+ * payload; see python_runner.py. Large request and response bodies travel
+ * as a sequence of chunk frames, with backpressure on both directions, so
+ * neither side needs the whole body in one buffer.
+ */
+
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import { EventEmitter, once } from 'events';
+import { PassThrough, Readable } from 'stream';
+
+export interface PythonPoolOptions {
+  pythonPath: string;
+  scriptPath: string;
+  /** Number of worker processes */
+  size?: number;
+  /** Requests in flight per worker; further requests wait in a queue */
+  maxConcurrentPerWorker?: number;
+  /** Maximum queued requests before new ones are rejected */
+  maxQueue?: number;
+  /** Per-request timeout in milliseconds (until the response header arrives) */
+  requestTimeoutMs?: number;
+  /** Interval between health checks in milliseconds */
+  healthCheckIntervalMs?: number;
+  /** Time a health check may take before the worker is restarted */
+  healthCheckTimeoutMs?: number;
+}
+
+export interface CallOptions {
+  /** Request body streamed to the Python function as its last argument */
+  body?: AsyncIterable<Buffer | string>;
+  timeoutMs?: number;
+}
+
+interface RpcResponse {
+  jsonrpc: '2.0';
+  id: number | null;
+  result?: any;
+  body?: boolean;
+  error?: { code: number; message: string; data?: any };
+}
+
+interface PendingRequest {
+  resolve: (value: any) => void;
+  reject: (err: Error) => void;
+  timer: NodeJS.Timeout;
+  /** Response body, once the response header said one follows */
+  stream?: PassThrough;
+}
+
+interface QueuedRequest {
+  method: string;
+  params: any;
+  options: CallOptions;
+  resolve: (value: any) => void;
+  reject: (err: Error) => void;
+}
+
+/**
+ * Error raised by the Python function, carrying its exception class name
+ */
+export class PythonError extends Error {
+  constructor(message: string, readonly type?: string) {
+    super(message);
+    this.name = 'PythonError';
+  }
+}
+
+const FRAME_HEADER_SIZE = 9;
+const CHUNK_SIZE = 64 * 1024;
+const MESSAGE = 0x4d; // 'M'
+const CHUNK = 0x43; // 'C'
+const END = 0x45; // 'E'
+
+function encodeFrame(kind: number, id: number, payload: Buffer = Buffer.alloc(0)): Buffer {
+  const header = Buffer.alloc(FRAME_HEADER_SIZE);
+  header.writeUInt8(kind, 0);
+  header.writeUInt32BE(id, 1);
+  header.writeUInt32BE(payload.length, 5);
+  return payload.length ? Buffer.concat([header, payload]) : header;
+}
+
+class PythonWorker extends EventEmitter {
+  readonly process: ChildProcessWithoutNullStreams;
+  readonly pending = new Map<number, PendingRequest>();
+  readonly startedAt = Date.now();
+  private buffer = Buffer.alloc(0);
+  private nextId = 1;
+  alive = true;
+  /** True while a request body is being written; no other frames may interleave */
+  uploading = false;
+
+  constructor(pythonPath: string, scriptPath: string, private requestTimeoutMs: number) {
+    super();
+    this.process = spawn(pythonPath, [scriptPath, '--serve']);
+
+    this.process.stdout.on('data', (chunk: Buffer) => this.onData(chunk));
+    this.process.stderr.on('data', (data) => {
+      console.error('Python worker:', data.toString());
+    });
+    this.process.on('exit', (code, signal) => this.onExit(`exited with ${signal ?? code}`));
+    this.process.on('error', (err) => this.onExit(`failed: ${err.message}`));
+    // Writes to a worker that just died fail with EPIPE; without a listener
+    // that error would be thrown and take the whole server down
+    this.process.stdin.on('error', (err) => {
+      this.process.kill();
+      this.onExit(`stdin failed: ${err.message}`);
+    });
+  }
+
+  get inFlight(): number {
+    return this.pending.size;
+  }
+
+  call(method: string, params: any, options: CallOptions = {}): Promise<any> {
+    const timeoutMs = options.timeoutMs ?? this.requestTimeoutMs;
+
+    return new Promise((resolve, reject) => {
+      if (!this.alive) {
+        reject(new Error('Python worker is not running'));
+        return;
+      }
+
+      const id = this.nextId++;
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Python call ${method} timed out after ${timeoutMs}ms`));
+        // A worker that stops answering is stuck; replace it
+        this.kill();
+      }, timeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+
+      const request = { jsonrpc: '2.0', id, method, params, body: options.body ? true : undefined };
+      this.process.stdin.write(encodeFrame(MESSAGE, id, Buffer.from(JSON.stringify(request), 'utf8')));
+
+      if (options.body) {
+        this.uploading = true;
+        this.upload(id, options.body).finally(() => {
+          this.uploading = false;
+          this.emit('idle');
+        });
+      }
+    });
+  }
+
+  kill(): void {
+    if (this.alive) {
+      this.process.kill();
+    }
+  }
+
+  private async upload(id: number, body: AsyncIterable<Buffer | string>): Promise<void> {
+    const stdin = this.process.stdin;
+    try {
+      for await (const piece of body) {
+        const data = typeof piece === 'string' ? Buffer.from(piece, 'utf8') : piece;
+        for (let start = 0; start < data.length; start += CHUNK_SIZE) {
+          if (!this.alive) return;
+          if (!stdin.write(encodeFrame(CHUNK, id, data.subarray(start, start + CHUNK_SIZE)))) {
+            await once(stdin, 'drain');
+          }
+        }
+      }
+      stdin.write(encodeFrame(END, id));
+    } catch (err: any) {
+      // A non-empty end frame tells the runner the body is incomplete
+      const message = JSON.stringify({ message: err?.message || 'Request body aborted' });
+      if (this.alive) stdin.write(encodeFrame(END, id, Buffer.from(message, 'utf8')));
+    }
+  }
+
+  private onData(chunk: Buffer): void {
+    this.buffer = this.buffer.length ? Buffer.concat([this.buffer, chunk]) : chunk;
+
+    while (this.buffer.length >= FRAME_HEADER_SIZE) {
+      const length = this.buffer.readUInt32BE(5);
+      if (this.buffer.length < FRAME_HEADER_SIZE + length) break;
+
+      const kind = this.buffer.readUInt8(0);
+      const id = this.buffer.readUInt32BE(1);
+      const payload = this.buffer.subarray(FRAME_HEADER_SIZE, FRAME_HEADER_SIZE + length);
+      this.buffer = this.buffer.subarray(FRAME_HEADER_SIZE + length);
+
+      if (kind === MESSAGE) {
+        this.onMessage(id, payload);
+      } else if (kind === CHUNK) {
+        this.onChunk(id, payload);
+      } else if (kind === END) {
+        this.onEnd(id, payload);
+      }
+    }
+  }
+
+  private onMessage(id: number, payload: Buffer): void {
+    const request = this.pending.get(id);
+    if (!request) return;
+    clearTimeout(request.timer);
+
+    let response: RpcResponse;
+    try {
+      response = JSON.parse(payload.toString('utf8'));
+    } catch (err) {
+      this.finish(id);
+      request.reject(new Error('Failed to parse Python worker response'));
+      return;
+    }
+
+    if (response.error) {
+      this.finish(id);
+      request.reject(new PythonError(response.error.message, response.error.data?.type));
+    } else if (response.body) {
+      // Keep the request pending until the body's end frame arrives
+      request.stream = new PassThrough();
+      request.stream.on('drain', () => this.process.stdout.resume());
+      request.stream.on('close', () => this.process.stdout.resume());
+      request.resolve(request.stream);
+    } else {
+      this.finish(id);
+      request.resolve(response.result);
+    }
+  }
+
+  private onChunk(id: number, payload: Buffer): void {
+    const stream = this.pending.get(id)?.stream;
+    if (!stream || stream.destroyed) return; // Consumer went away; discard
+    // Copy, since the payload is a view into the shared read buffer
+    if (!stream.write(Buffer.from(payload))) {
+      this.process.stdout.pause();
+    }
+  }
+
+  private onEnd(id: number, payload: Buffer): void {
+    const stream = this.pending.get(id)?.stream;
+    this.finish(id);
+    if (!stream || stream.destroyed) return;
+    if (payload.length) {
+      const error = JSON.parse(payload.toString('utf8'));
+      stream.destroy(new Error(error.message || 'Python response body failed'));
+    } else {
+      stream.end();
+    }
+  }
+
+  private finish(id: number): void {
+    this.pending.delete(id);
+    this.emit('idle');
+  }
+
+  private onExit(reason: string): void {
+    if (!this.alive) return;
+    this.alive = false;
+
+    const error = new Error(`Python worker ${reason}`);
+    this.pending.forEach((request) => {
+      clearTimeout(request.timer);
+      if (request.stream) {
+        request.stream.destroy(error);
+      } else {
+        request.reject(error);
+      }
+    });
+    this.pending.clear();
+    this.emit('exit', reason);
+  }
+}
+
+export class PythonWorkerPool {
+  private workers: PythonWorker[] = [];
+  private queue: QueuedRequest[] = [];
+  private healthTimer?: NodeJS.Timeout;
+  private closed = false;
+  private restarts = 0;
+  private options: Required<PythonPoolOptions>;
+
+  constructor(options: PythonPoolOptions) {
+    this.options = {
+      size: 2,
+      maxConcurrentPerWorker: 1,
+      maxQueue: 1000,
+      requestTimeoutMs: 120_000,
+      healthCheckIntervalMs: 30_000,
+      healthCheckTimeoutMs: 5_000,
+      ...options,
+    };
+  }
+
+  /**
+   * Call a Python function ("module.function") in a pooled worker
+   */
+  call<T = any>(method: string, params: any, options: CallOptions = {}): Promise<T> {
+    if (this.closed) {
+      return Promise.reject(new Error('Python worker pool is closed'));
+    }
+    if (this.queue.length >= this.options.maxQueue) {
+      return Promise.reject(new Error('Python worker pool queue is full'));
+    }
+
+    this.start();
+    return new Promise<T>((resolve, reject) => {
+      this.queue.push({ method, params, options, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Call a Python function that streams its result back as a body
+   */
+  callStream(method: string, params: any, options: CallOptions = {}): Promise<Readable> {
+    return this.call<Readable>(method, params, options);
+  }
+
+  /**
+   * Pool state for diagnostics
+   */
+  stats() {
+    return {
+      workers: this.workers.length,
+      inFlight: this.workers.reduce((sum, worker) => sum + worker.inFlight, 0),
+      queued: this.queue.length,
+      restarts: this.restarts,
+    };
+  }
+
+  /**
+   * Stop all workers and reject queued requests
+   */
+  close(): void {
+    this.closed = true;
+    if (this.healthTimer) clearInterval(this.healthTimer);
+    this.queue.forEach((request) => request.reject(new Error('Python worker pool closed')));
+    this.queue = [];
+    this.workers.forEach((worker) => worker.kill());
+    this.workers = [];
+  }
+
+  private start(): void {
+    if (this.workers.length || this.closed) return;
+
+    for (let i = 0; i < this.options.size; i++) {
+      this.workers.push(this.spawnWorker());
+    }
+    this.healthTimer = setInterval(() => this.checkHealth(), this.options.healthCheckIntervalMs);
+    this.healthTimer.unref();
+  }
+
+  private spawnWorker(): PythonWorker {
+    const worker = new PythonWorker(
+      this.options.pythonPath,
+      this.options.scriptPath,
+      this.options.requestTimeoutMs
+    );
+    worker.on('idle', () => this.dispatch());
+    worker.on('exit', (reason: string) => {
+      console.error(`Python worker ${reason}; restarting`);
+      this.replace(worker);
+    });
+    return worker;
+  }
+
+  private replace(worker: PythonWorker): void {
+    if (this.workers.indexOf(worker) === -1 || this.closed) return;
+
+    // Back off when a worker dies right after starting (e.g. a broken environment)
+    const delay = Date.now() - worker.startedAt < 1000 ? 1000 : 0;
+    setTimeout(() => {
+      const index = this.workers.indexOf(worker);
+      if (index === -1 || this.closed) return;
+      this.restarts++;
+      this.workers[index] = this.spawnWorker();
+      this.dispatch();
+    }, delay);
+  }
+
+  private dispatch(): void {
+    while (this.queue.length) {
+      const worker = this.workers
+        .filter(
+          (w) => w.alive && !w.uploading && w.inFlight < this.options.maxConcurrentPerWorker
+        )
+        .sort((a, b) => a.inFlight - b.inFlight)[0];
+      if (!worker) return;
+
+      const request = this.queue.shift()!;
+      worker
+        .call(request.method, request.params, request.options)
+        .then(request.resolve, request.reject);
+    }
+  }
+
+  private checkHealth(): void {
+    this.workers
+      .filter((worker) => worker.alive && !worker.uploading && worker.inFlight === 0)
+      .forEach((worker) => {
+        worker
+          .call('runner.ping', [], { timeoutMs: this.options.healthCheckTimeoutMs })
+          .catch(() => worker.kill());
+      });
+  }
+}
@@ -1,15 +1,63 @@
 #!/usr/bin/env python3
 """
 Python Runner - Executes Python CLI functions from Node.js
+
+One-shot mode (one interpreter per call):
+    python_runner.py '{"module": ..., "function": ..., "args": [...]}'
+
+Server mode (long-lived worker):
+    python_runner.py --serve [--socket PATH]
+
+In server mode every frame is a 9-byte header (kind: 1 byte, request id:
+uint32, payload length: uint32, all big-endian) followed by the payload:
+
+    M  a UTF-8 JSON-RPC 2.0 message (request or response)
+    C  one chunk of a request or response body
+    E  end of a body; the payload is empty, or a JSON error object if the
+       body could not be produced
+
+The method is "<module>.<function>" and params are positional (list) or
+keyword (object) arguments. Only functions listed in the ``__all__`` of a
+module in SERVED_MODULES can be called. A request with "body": true is followed by C
+frames and an E frame; the function receives an iterator over the chunks
+as its last argument (or as the "body" keyword). A function that returns
+an iterator answers with "body": true and streams its chunks back the same
+way, so large manuscripts never sit whole in a frame or in argv.
+"runner.ping" answers health checks. Frames go over stdin/stdout, or over
+each connection to a Unix socket when --socket is given.
 """
 
 import sys
+import os
 import json
+import struct
+import threading
+import time
 import importlib
-from typing import Any, Dict
+from collections.abc import Iterator
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Tuple
+
+FRAME_HEADER = struct.Struct(">cII")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+MESSAGE = b"M"
+CHUNK = b"C"
+END = b"E"
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+SERVER_ERROR = -32000
 
+STARTED_AT = time.monotonic()
 
-def execute_command(command: Dict[str, Any]) -> Dict[str, Any]:
+# Modules whose public (``__all__``) functions server mode may call
+SERVED_MODULES = ("storybook.web_integration",)
+
+
+def execute_command(command: Dict[str, Any], body: Optional[Iterable[bytes]] = None) -> Dict[str, Any]:
     """
     Execute a Python function dynamically
 
@@ -19,6 +67,7 @@ def execute_command(command: Dict[str, Any]) -> Dict[str, Any]:
             "function": "list_projects",
             "args": []
         }
+        body: Streamed request body, passed as the last argument
 
     Returns:
         {"success": True, "data": result} or {"success": False, "error": message}
@@ -42,11 +91,11 @@ def execute_command(command: Dict[str, Any]) -> Dict[str, Any]:
 
         # Execute the function with positional and keyword args
         if isinstance(args, list):
-            result = func(*args)
+            result = func(*args) if body is None else func(*args, body)
         elif isinstance(args, dict):
-            result = func(**args)
+            result = func(**args) if body is None else func(**args, body=body)
         else:
-            result = func(args)
+            result = func(args) if body is None else func(args, body)
 
         # Result should already be JSON-serializable from web_integration
         return {
@@ -59,12 +108,230 @@ def execute_command(command: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
+            "type": type(e).__name__,
             "traceback": traceback.format_exc()
         }
 
 
+def read_frame(stream: BinaryIO) -> Optional[Tuple[bytes, int, bytes]]:
+    """Read one frame as (kind, request id, payload), or None at end of stream."""
+    header = stream.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return None
+    kind, request_id, length = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds limit")
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return kind, request_id, payload
+
+
+def write_frame(stream: BinaryIO, kind: bytes, request_id: int, payload: bytes = b"") -> None:
+    """Write one frame."""
+    stream.write(FRAME_HEADER.pack(kind, request_id, len(payload)))
+    if payload:
+        stream.write(payload)
+
+
+class RequestBody(Iterator):
+    """Chunks of a streamed request body, read from the stream on demand."""
+
+    def __init__(self, stream: BinaryIO, request_id: int):
+        self.stream = stream
+        self.request_id = request_id
+        self.done = False
+
+    def __next__(self) -> bytes:
+        if self.done:
+            raise StopIteration
+        frame = read_frame(self.stream)
+        if frame is None:
+            raise EOFError("Stream ended inside a request body")
+        kind, request_id, payload = frame
+        if request_id != self.request_id or kind not in (CHUNK, END):
+            raise ValueError(f"Unexpected frame {kind!r} for request {request_id}")
+        if kind == END:
+            self.done = True
+            if payload:
+                raise ValueError(f"Request body aborted: {json.loads(payload).get('message')}")
+            raise StopIteration
+        return payload
+
+    def drain(self) -> None:
+        """Skip whatever the function did not consume."""
+        try:
+            for _ in self:
+                pass
+        except ValueError:
+            pass
+
+
+def handle_request(request: Any, body: Optional[RequestBody] = None) -> Tuple[Dict[str, Any], Any]:
+    """
+    Handle one JSON-RPC request
+
+    Returns:
+        (response, stream): the JSON-RPC response with either "result" or
+        "error", and an iterator of response body chunks or None
+    """
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return rpc_error(None, INVALID_REQUEST, "Invalid request"), None
+
+    request_id = request.get("id")
+    method = request["method"]
+
+    if method == "runner.ping":
+        result = {"pid": os.getpid(), "uptime": time.monotonic() - STARTED_AT}
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}, None
+
+    if not is_served(method):
+        return rpc_error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}"), None
+
+    module_name, _, function_name = method.rpartition(".")
+    result = execute_command(
+        {
+            "module": module_name,
+            "function": function_name,
+            "args": request.get("params", []),
+        },
+        body,
+    )
+    if not result["success"]:
+        error = rpc_error(
+            request_id,
+            SERVER_ERROR,
+            result["error"],
+            {"type": result.get("type"), "traceback": result.get("traceback")},
+        )
+        return error, None
+
+    data = result["data"]
+    if isinstance(data, Iterator):
+        return {"jsonrpc": "2.0", "id": request_id, "result": None, "body": True}, data
+    return {"jsonrpc": "2.0", "id": request_id, "result": data}, None
+
+
+def is_served(method: str) -> bool:
+    """Whether a method names a public function of a served module"""
+    module_name, _, function_name = method.rpartition(".")
+    if module_name not in SERVED_MODULES:
+        return False
+    module = importlib.import_module(module_name)
+    return function_name in getattr(module, "__all__", ())
+
+
+def rpc_error(request_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    """Build a JSON-RPC error response"""
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def encode_response(response: Dict[str, Any]) -> bytes:
+    """Encode a response, turning unserializable results into errors"""
+    try:
+        return json.dumps(response).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        return json.dumps(
+            rpc_error(response.get("id"), SERVER_ERROR, f"Unserializable result: {e}")
+        ).encode("utf-8")
+
+
+def write_body(writer: BinaryIO, request_id: int, chunks: Iterable[Any]) -> None:
+    """Stream a response body as chunk frames followed by an end frame"""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            # Split oversized pieces so frames stay small
+            for start in range(0, len(chunk), CHUNK_SIZE):
+                write_frame(writer, CHUNK, request_id, chunk[start:start + CHUNK_SIZE])
+    except Exception as e:
+        write_frame(writer, END, request_id, json.dumps({"message": str(e)}).encode("utf-8"))
+    else:
+        write_frame(writer, END, request_id)
+
+
+def serve(reader: BinaryIO, writer: BinaryIO, lock: Optional[threading.Lock] = None) -> None:
+    """
+    Answer framed requests until the reader is exhausted
+
+    Args:
+        reader: Stream to read request frames from
+        writer: Stream to write response frames to
+        lock: Serializes calls into the storybook package across connections
+    """
+    while True:
+        frame = read_frame(reader)
+        if frame is None:
+            return
+        kind, request_id, payload = frame
+        if kind != MESSAGE:
+            # Stray body frames of a request that was already answered
+            continue
+
+        body = None
+        try:
+            request = json.loads(payload)
+        except ValueError as e:
+            response, stream = rpc_error(None, PARSE_ERROR, f"Parse error: {e}"), None
+        else:
+            if isinstance(request, dict) and request.get("body"):
+                body = RequestBody(reader, request_id)
+            if lock:
+                with lock:
+                    response, stream = handle_request(request, body)
+            else:
+                response, stream = handle_request(request, body)
+
+        if body is not None:
+            body.drain()
+        write_frame(writer, MESSAGE, request_id, encode_response(response))
+        if stream is not None:
+            if lock:
+                with lock:
+                    write_body(writer, request_id, stream)
+            else:
+                write_body(writer, request_id, stream)
+        writer.flush()
+
+
+def serve_stdio() -> None:
+    """Serve requests over stdin/stdout"""
+    # Keep stray prints from library code out of the frame stream
+    writer = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    sys.stdout = sys.stderr
+    serve(sys.stdin.buffer, writer)
+
+
+def serve_socket(path: str) -> None:
+    """Serve requests on a Unix socket, one thread per connection"""
+    import socketserver
+
+    lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            serve(self.rfile, self.wfile, lock)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        sys.stdout = sys.stderr
+        server.serve_forever()
+
+
 def main():
     """Main entry point"""
+    if len(sys.argv) >= 2 and sys.argv[1] == "--serve":
+        if len(sys.argv) >= 4 and sys.argv[2] == "--socket":
+            serve_socket(sys.argv[3])
+        else:
+            serve_stdio()
+        return
+
     if len(sys.argv) < 2:
         print(json.dumps({
             "success": False,
@@ -1,77 +1,93 @@
 #!/usr/bin/env python3
 """
 Review Bridge - Handles automated review streaming from Python to Node.js
+
+Events leave on stdout as length-prefixed frames written by
+``storybook.events.EventStream``, which merges text deltas and blocks when
+Node stops reading.
 """
 
 import sys
 import json
 import asyncio
+from datetime import datetime
 from typing import List, Optional
+from storybook.events import EventStream
 from storybook.project_manager import ProjectManager
 from storybook.editor import LiteraryEditor
 
 
-async def stream_review(project_id: str, focus_areas: Optional[List[str]] = None):
+async def stream_review(events: EventStream, project_id: str, focus_areas: Optional[List[str]] = None):
     """
-    Stream review events to stdout as JSON lines
+    Stream review events to stdout as frames
 
     Events:
     - {"type": "progress", "message": "...", "detail": "..."}
+    - {"type": "text", "content": "..."}
     - {"type": "complete", "data": {...review...}}
     - {"type": "error", "message": "..."}
     """
-    try:
-        # Load project
-        pm = ProjectManager()
-        project = pm.load_project(project_id)
-
-        # Create editor
-        editor = LiteraryEditor(project)
-
-        # Progress callback
-        def on_progress(message: str, detail: str = ""):
-            print(json.dumps({
+    await events.send({
+        "type": "progress",
+        "message": "Starting automated review...",
+        "detail": "Loading manuscript"
+    })
+
+    pm = ProjectManager()
+    project = pm.load_project(project_id)
+    editor = LiteraryEditor(pm)
+
+    review_text = []
+    async for event in editor.review_manuscript(project, focus_areas):
+        kind = event.get("type")
+        if kind == "status":
+            await events.send({"type": "progress", "message": event["message"], "detail": ""})
+        elif kind == "text":
+            review_text.append(event["content"])
+            await events.send({"type": "text", "content": event["content"]})
+        elif kind == "tool_use":
+            await events.send({
                 "type": "progress",
-                "message": message,
-                "detail": detail
-            }), flush=True)
-
-        # Run review
-        print(json.dumps({
-            "type": "progress",
-            "message": "Starting automated review...",
-            "detail": "Loading manuscript"
-        }), flush=True)
-
-        review = await editor.run_review_async(
-            focus_areas=focus_areas,
-            on_progress=on_progress
-        )
-
-        # Convert review to dict
-        review_data = review.model_dump() if hasattr(review, "model_dump") else review
-
-        # Send completion event
-        print(json.dumps({
-            "type": "complete",
-            "data": review_data
-        }), flush=True)
-
+                "message": f"Running {event['tool']}",
+                "detail": ""
+            })
+        elif kind == "complete":
+            await events.send({
+                "type": "complete",
+                "data": {
+                    "timestamp": datetime.now().isoformat(),
+                    "overallAssessment": "".join(review_text),
+                    "strengths": [],
+                    "weaknesses": [],
+                    "suggestions": [],
+                    "characterNotes": {},
+                    "plotNotes": [],
+                    "cost": event.get("cost"),
+                    "turns": event.get("turns"),
+                }
+            })
+
+
+async def run(project_id: str, focus_areas: Optional[List[str]]) -> int:
+    """Run the review and return its exit status."""
+    events = EventStream(sys.stdout.buffer)
+    status = 0
+    try:
+        await stream_review(events, project_id, focus_areas)
+    except OSError:
+        # Node closed the pipe; nobody is left to tell
+        return 1
     except Exception as e:
-        print(json.dumps({
-            "type": "error",
-            "message": f"Review failed: {str(e)}"
-        }), flush=True)
-        sys.exit(1)
+        await events.send({"type": "error", "message": f"Review failed: {str(e)}"})
+        status = 1
+    await events.close()
+    return status
 
 
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
-        print(json.dumps({
-            "type": "error",
-            "message": "No project ID provided"
-        }), flush=True)
+        print("Usage: review_bridge.py <project_id> [focus_areas_json]", file=sys.stderr)
         sys.exit(1)
 
     project_id = sys.argv[1]
@@ -79,12 +95,12 @@ def main():
 
     if len(sys.argv) > 2:
         try:
-            focus_areas = json.loads(sys.argv[2])
+            focus_areas = json.loads(sys.argv[2]) or None
         except json.JSONDecodeError:
             pass
 
     try:
-        asyncio.run(stream_review(project_id, focus_areas))
+        sys.exit(asyncio.run(run(project_id, focus_areas)))
     except KeyboardInterrupt:
         pass
 
@@ -4,15 +4,44 @@
 
 import { Server as SocketIOServer, Socket } from 'socket.io';
 import { pythonBridge } from './python-bridge';
+import { ProjectChange } from './project-watcher';
 import { ChatMessage, EditorReview } from '../types';
 
+// Packets queued for a client before bridge output is paused
+const SOCKET_HIGH_WATER = 64;
+
 interface SocketData {
   projectId?: string;
   chatSessionId?: string;
   reviewSessionId?: string;
 }
 
+/**
+ * Emit to a socket, returning a promise that resolves once the client's
+ * write buffer drains if it has fallen too far behind
+ */
+function emitWithBackpressure(socket: Socket, event: string, data: any): Promise<void> | void {
+  socket.emit(event, data);
+  const conn: any = socket.conn;
+  if (conn && conn.writeBuffer && conn.writeBuffer.length > SOCKET_HIGH_WATER) {
+    return new Promise((resolve) => {
+      const done = () => {
+        conn.off('drain', done);
+        conn.off('close', done);
+        resolve();
+      };
+      conn.on('drain', done);
+      conn.on('close', done);
+    });
+  }
+}
+
 export function setupSocketHandlers(io: SocketIOServer) {
+  // Push file changes from any writer (REST, CLI, agent tools) to subscribers
+  pythonBridge.watchProjects().on('change', (change: ProjectChange) => {
+    io.to(`project:${change.projectId}`).emit('project:changed', change);
+  });
+
   io.on('connection', (socket: Socket) => {
     console.log(`🔌 Client connected: ${socket.id}`);
     const socketData: SocketData = {};
@@ -65,26 +94,36 @@ export function setupSocketHandlers(io: SocketIOServer) {
                     content: event.content,
                     timestamp: event.timestamp || new Date().toISOString()
                   };
-                  socket.emit('chat:message', chatMessage);
-                  break;
+                  return emitWithBackpressure(socket, 'chat:message', chatMessage);
+
+                case 'delta':
+                  // Partial reply text; the 'message' that follows replaces it
+                  return emitWithBackpressure(socket, 'chat:delta', {
+                    role: event.role,
+                    content: event.content
+                  });
 
                 case 'thinking':
-                  socket.emit('chat:thinking', {
+                  return emitWithBackpressure(socket, 'chat:thinking', {
                     content: event.content
                   });
-                  break;
 
                 case 'tool':
-                  socket.emit('chat:tool', {
+                  return emitWithBackpressure(socket, 'chat:tool', {
                     tool: event.name,
                     input: event.input
                   });
+
+                case 'cancelled':
+                  socket.emit('chat:cancelled', {});
                   break;
 
                 case 'complete':
                   socket.emit('chat:complete', {
                     turns: event.turns,
-                    cost: event.cost
+                    cost: event.cost,
+                    timeToFirstToken: event.time_to_first_token,
+                    timeToComplete: event.time_to_complete
                   });
                   break;
 
@@ -127,6 +166,21 @@ export function setupSocketHandlers(io: SocketIOServer) {
       }
     });
 
+    /**
+     * Stop the reply the active chat session is generating
+     */
+    socket.on('chat:cancel', () => {
+      if (!socketData.chatSessionId) return;
+      try {
+        pythonBridge.cancelChatMessage(socketData.chatSessionId);
+      } catch (error: any) {
+        socket.emit('error', {
+          message: error.message || 'Failed to cancel chat message',
+          code: 'CHAT_ERROR'
+        });
+      }
+    });
+
     /**
      * Start an automated review
      */
@@ -149,11 +203,17 @@ export function setupSocketHandlers(io: SocketIOServer) {
           projectId,
           focusAreas,
           (event) => {
-            // Progress event
-            socket.emit('review:progress', {
+            // Progress event, or a chunk of the review text as it is written
+            if (event.type === 'text') {
+              return emitWithBackpressure(socket, 'review:progress', {
+                message: event.content,
+                type: 'text'
+              });
+            }
+            return emitWithBackpressure(socket, 'review:progress', {
               message: event.message,
               detail: event.detail,
-              type: 'info'
+              type: event.type === 'error' ? 'error' : 'info'
             });
           },
           (review: EditorReview) => {
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Watch Bridge - Streams project change events from Python to Node.js
+
+Watches the project data directory with ``storybook.watcher.ProjectWatcher``
+and writes each debounced change to stdout as a frame written by
+``storybook.events.EventStream``:
+
+- {"type": "change", "project_id": "...", "kind": "manuscript", "paths": [...]}
+"""
+
+import sys
+import asyncio
+import argparse
+from storybook.events import EventStream
+from storybook.watcher import ProjectWatcher
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Stream changes until Node closes the pipe."""
+    events = EventStream(sys.stdout.buffer)
+    with ProjectWatcher(args.data_dir, debounce=args.debounce) as watcher:
+        await events.send({"type": "ready", "backend": watcher.backend})
+        await events.flush()
+        try:
+            while True:
+                for change in await asyncio.to_thread(watcher.poll, 1.0):
+                    await events.send({"type": "change", **change.model_dump()})
+        except OSError:
+            # Node closed the pipe
+            return 0
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Storybook project watcher")
+    parser.add_argument("--data-dir", default="~/.storybook/projects", help="Project data directory")
+    parser.add_argument("--debounce", type=float, default=0.2, help="Quiet time before reporting")
+    args = parser.parse_args()
+
+    try:
+        sys.exit(asyncio.run(run(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
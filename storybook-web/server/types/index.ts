@@ -37,6 +37,67 @@ export interface Project {
   characters: Character[];
   plotEvents: PlotEvent[];
   manuscriptFile: string;
+  storageMode: 'single' | 'chapters';
+  manuscriptVersion: number;
+}
+
+export interface ManuscriptEdit {
+  /** Offsets into the base version's text, in UTF-16 code units (JavaScript string indexes) */
+  start: number;
+  end: number;
+  text: string;
+}
+
+export interface ManuscriptPatchResult {
+  version: number;
+  wordCount: number;
+  chapterCount: number;
+}
+
+export interface ChapterEntry {
+  file: string;
+  title: string;
+  offset: number;
+  length: number;
+  wordCount: number;
+}
+
+export interface ProjectSummary {
+  id: string;
+  name: string;
+  title: string;
+  genre: string;
+  wordCount: number;
+  characterCount: number;
+  plotEventCount: number;
+  createdAt: string;
+  lastEdited: string;
+}
+
+export interface ProjectListOptions {
+  sort?: 'last_edited' | 'name' | 'title' | 'word_count' | 'created_at';
+  descending?: boolean;
+  limit?: number;
+  offset?: number;
+}
+
+/** Change tokens used as ETags for a project's resources */
+export interface SearchHit {
+  /** Chapter index; 0 is the text before the first chapter heading */
+  chapter: number;
+  /** Paragraph index within the chapter */
+  paragraph: number;
+  /** Character offset in the manuscript */
+  offset: number;
+  /** The matched words as written */
+  text: string;
+}
+
+export interface ProjectVersions {
+  /** Metadata, characters and plot events */
+  project: string;
+  /** Manuscript text and chapters */
+  manuscript: string;
 }
 
 export interface ChatMessage {
@@ -83,6 +144,7 @@ export interface ApiResponse<T = any> {
 export interface SocketEvents {
   // Client to Server
   'chat:send': (data: { projectId: string; message: string }) => void;
+  'chat:cancel': () => void;
   'review:start': (data: { projectId: string; focusAreas?: string[] }) => void;
   'project:subscribe': (projectId: string) => void;
   'project:unsubscribe': (projectId: string) => void;
@@ -91,9 +153,21 @@ export interface SocketEvents {
   'chat:message': (message: ChatMessage) => void;
   'chat:thinking': (data: { content: string }) => void;
   'chat:tool': (data: { tool: string; input: any }) => void;
-  'chat:complete': (data: { cost?: number; turns?: number }) => void;
+  'chat:delta': (data: { role: string; content: string }) => void;
+  'chat:complete': (data: {
+    cost?: number;
+    turns?: number;
+    timeToFirstToken?: number | null;
+    timeToComplete?: number;
+  }) => void;
+  'chat:cancelled': (data: {}) => void;
   'review:progress': (data: { message: string; type: string }) => void;
   'review:complete': (review: EditorReview) => void;
   'project:updated': (project: Project) => void;
+  'project:changed': (change: {
+    projectId: string;
+    kind: 'manuscript' | 'metadata' | 'created' | 'deleted';
+    paths: string[];
+  }) => void;
   'error': (error: { message: string; code?: string }) => void;
 }
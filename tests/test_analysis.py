@@ -0,0 +1,87 @@
+"""Tests for the shared text analysis engine."""
+
+import asyncio
+
+from storybook.analysis import ANALYZERS, analyze
+
+TEXT = """## Chapter 1
+
+On Monday, Sarah walked slowly home. It was late! "Who's there?" she asked.
+
+3 days later sarah returned. "I know," said SARAH Jones, "what you did."
+On day 4 she left in March.
+"""
+
+
+class TestAnalyze:
+    """Tests for analyze."""
+
+    def test_counts(self):
+        """Test words, sentences and paragraphs from one pass."""
+        analysis = analyze(TEXT)
+
+        assert analysis.word_count == 35
+        assert len(analysis.paragraphs) == 3
+        assert [p[2] for p in analysis.paragraphs] == [2, 13, 20]
+        assert [p[3] for p in analysis.paragraphs] == [False, True, True]
+        assert analysis.sentences[0][2] == 2  # The heading ends at the paragraph break
+        assert analysis.word_frequencies["sarah"] == 3
+
+    def test_dialogue_spans(self):
+        """Test that quoted spans are found, including curly and open quotes."""
+        analysis = analyze('He said "hi" and “bye”.\n\n"Unclosed at paragraph end\n\nDone.')
+
+        spans = [analysis.text[start:end] for start, end in analysis.dialogue]
+        assert spans == ['"hi"', "“bye”", '"Unclosed at paragraph end']
+
+    def test_time_references(self):
+        """Test weekday, month, day-number and relative references."""
+        refs = [ref for _, ref in analyze(TEXT).time_references]
+
+        assert refs == ["Monday", "3 days later", "day 4", "March"]
+
+    def test_mentions(self):
+        """Test case-insensitive name lookup with the text as written."""
+        analysis = analyze(TEXT)
+
+        assert [s for _, s in analysis.mentions("Sarah")] == ["Sarah", "sarah", "SARAH"]
+        assert [s for _, s in analysis.mentions("Sarah Jones")] == ["SARAH Jones"]
+        assert analysis.mentions("Sar") == []
+        assert analyze("Sarah's hat").mentions("sarah") == [(0, "Sarah")]
+
+    def test_cached(self):
+        """Test that the same text is analyzed only once."""
+        assert analyze(TEXT) is analyze(TEXT)
+
+    def test_empty(self):
+        """Test that empty text yields an empty analysis."""
+        analysis = analyze("")
+
+        assert analysis.word_count == 0
+        assert analysis.sentences == [] and analysis.paragraphs == []
+
+
+def test_merged_results_match_whole_text():
+    """Test that per-chapter results merge into those of the whole text."""
+    first, second = TEXT[:91], TEXT[91:]
+    assert first.endswith("\n\n")  # Split at a paragraph break
+
+    for model in ANALYZERS.values():
+        assert model.merge([model.from_text(first), model.from_text(second)]) == (
+            model.from_text(TEXT)
+        )
+
+
+def test_tools_use_shared_analysis():
+    """Test that the tools report from the shared analysis."""
+    from storybook.tools import check_character_consistency, detect_pacing_issues
+
+    result = asyncio.run(
+        check_character_consistency.handler({"character_name": "Sarah", "manuscript_text": TEXT})
+    )
+    text = result["content"][0]["text"]
+    assert "Found 3 mentions" in text
+    assert "Inconsistent capitalization" in text
+
+    result = asyncio.run(detect_pacing_issues.handler({"chapter_text": TEXT}))
+    assert "- Paragraphs: 3" in result["content"][0]["text"]
@@ -0,0 +1,72 @@
+"""Tests for the project catalog."""
+
+import os
+
+import pytest
+
+from storybook.catalog import ProjectCatalog
+from storybook.models import ManuscriptMetadata
+
+
+class TestProjectCatalog:
+    """Tests for ProjectCatalog class."""
+
+    def test_create_project_adds_entry(self, project_manager, sample_project):
+        """Test that creating a project indexes it."""
+        summaries = project_manager.catalog.query()
+        assert len(summaries) == 1
+        assert summaries[0].id == sample_project.id
+        assert summaries[0].title == "Test Novel"
+
+    def test_save_updates_entry(self, project_manager, sample_project, sample_manuscript):
+        """Test that saving a project updates its entry."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+
+        summary = project_manager.catalog.query()[0]
+        assert summary.word_count == sample_project.metadata.word_count
+        assert summary.word_count > 0
+
+    def test_delete_removes_entry(self, project_manager, sample_project):
+        """Test that deleting a project removes its entry."""
+        project_manager.delete_project(sample_project.id)
+        assert project_manager.catalog.count() == 0
+
+    def test_query_sort_and_paginate(self, project_manager):
+        """Test sorted, paginated queries."""
+        for name in ["charlie", "alpha", "bravo"]:
+            project_manager.create_project(name, ManuscriptMetadata(title=name))
+
+        names = [s.name for s in project_manager.catalog.query(sort="name", descending=False)]
+        assert names == ["alpha", "bravo", "charlie"]
+
+        page = project_manager.catalog.query(sort="name", descending=False, limit=1, offset=1)
+        assert [s.name for s in page] == ["bravo"]
+
+    def test_query_rejects_unknown_sort(self, project_manager):
+        """Test that unknown sort columns are rejected."""
+        with pytest.raises(ValueError):
+            project_manager.catalog.query(sort="id; DROP TABLE projects")
+
+    def test_refresh_picks_up_external_changes(self, project_manager, sample_project):
+        """Test that refresh reloads projects changed by another process."""
+        metadata_file = sample_project.get_project_dir(project_manager.data_dir) / "project.json"
+        sample_project.metadata.title = "Edited Elsewhere"
+        metadata_file.write_text(sample_project.model_dump_json(indent=2))
+        stat = metadata_file.stat()
+        os.utime(metadata_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        summaries = project_manager.list_project_summaries()
+        assert summaries[0].title == "Edited Elsewhere"
+
+    def test_refresh_drops_missing_projects(self, project_manager, sample_project):
+        """Test that refresh removes projects deleted outside the manager."""
+        metadata_file = sample_project.get_project_dir(project_manager.data_dir) / "project.json"
+        metadata_file.unlink()
+
+        assert project_manager.list_project_summaries() == []
+
+    def test_catalog_persists(self, project_manager, sample_project):
+        """Test that the catalog survives reopening."""
+        catalog = ProjectCatalog(project_manager.data_dir / "catalog.db")
+        assert [s.id for s in catalog.query()] == [sample_project.id]
+        catalog.close()
@@ -0,0 +1,177 @@
+"""Tests for chapter-segmented storage."""
+
+import pytest
+
+from storybook.chapters import ChapterStore, select_chapters, split_chapters
+
+
+class TestSplitChapters:
+    """Tests for split_chapters."""
+
+    def test_split_with_preamble(self, sample_manuscript):
+        """Test splitting a manuscript with a title before the first chapter."""
+        segments = split_chapters(sample_manuscript)
+
+        assert [title for title, _ in segments] == ["", "Chapter 1", "Chapter 2"]
+        assert "".join(text for _, text in segments) == sample_manuscript
+
+    def test_split_without_headings(self):
+        """Test that text without headings is a single segment."""
+        assert split_chapters("Just prose.") == [("", "Just prose.")]
+
+
+def test_select_chapters():
+    """Test chapter indexes, ranges and lists."""
+    assert select_chapters(None, 4) == [0, 1, 2, 3]
+    assert select_chapters("all", 2) == [0, 1]
+    assert select_chapters(2, 4) == [2]
+    assert select_chapters("3, 1-2", 4) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        select_chapters("2-5", 4)
+    with pytest.raises(ValueError):
+        select_chapters("two", 4)
+
+
+class TestChapterStore:
+    """Tests for ChapterStore class."""
+
+    def test_create_and_read(self, temp_dir, sample_manuscript):
+        """Test storing and reassembling a manuscript."""
+        store = ChapterStore(temp_dir / "chapters")
+        store.create_from_text(sample_manuscript)
+
+        assert len(store) == 3
+        assert store.read_chapter(1).startswith("## Chapter 1")
+        assert store.read_all() == sample_manuscript
+        assert store.manifest.chapter_count == 2
+
+    def test_manifest_offsets(self, temp_dir, sample_manuscript):
+        """Test that offsets point into the assembled text."""
+        store = ChapterStore(temp_dir / "chapters")
+        store.create_from_text(sample_manuscript)
+
+        entry = store.manifest.chapters[2]
+        assert sample_manuscript[entry.offset :].startswith("## Chapter 2")
+        assert store.locate(entry.offset + 5) == 2
+
+    def test_write_chapter_only_touches_one_file(self, temp_dir, sample_manuscript):
+        """Test that writing a chapter rewrites only that chapter."""
+        store = ChapterStore(temp_dir / "chapters")
+        store.create_from_text(sample_manuscript)
+        first = store.chapters_dir / store.manifest.chapters[1].file
+        mtime = first.stat().st_mtime_ns
+
+        store.write_chapter(2, "## Chapter 2\n\nA brand new ending.\n")
+
+        assert first.stat().st_mtime_ns == mtime
+        reloaded = ChapterStore(temp_dir / "chapters")
+        assert reloaded.read_all().endswith("A brand new ending.\n")
+        assert reloaded.manifest.chapters[2].word_count == 7
+
+    def test_insert_and_delete_chapter(self, temp_dir, sample_manuscript):
+        """Test inserting and removing chapters."""
+        store = ChapterStore(temp_dir / "chapters")
+        store.create_from_text(sample_manuscript)
+
+        store.insert_chapter(2, "## Interlude\n\nMeanwhile.\n\n")
+        assert [e.title for e in store.manifest.chapters] == [
+            "",
+            "Chapter 1",
+            "Interlude",
+            "Chapter 2",
+        ]
+
+        store.delete_chapter(2)
+        assert store.read_all() == sample_manuscript
+        assert len(list(store.chapters_dir.glob("ch-*.md"))) == 3
+
+
+class TestProjectManagerChapters:
+    """Tests for chapters storage mode in ProjectManager."""
+
+    def test_enable_chapter_storage(self, project_manager, sample_project, sample_manuscript):
+        """Test converting a project to chapters mode."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+
+        loaded = project_manager.load_project(sample_project.id)
+        assert loaded.storage_mode == "chapters"
+        assert loaded.metadata.chapter_count == 2
+        assert project_manager.get_manuscript_content(loaded) == sample_manuscript
+        assert not loaded.get_manuscript_path(project_manager.data_dir).exists()
+
+    def test_write_chapter_updates_counts(self, project_manager, sample_project, sample_manuscript):
+        """Test that writing a chapter updates the project word count."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+        before = sample_project.metadata.word_count
+
+        project_manager.write_chapter(sample_project, 2, "## Chapter 2\n\nShort.\n")
+
+        loaded = project_manager.load_project(sample_project.id)
+        assert loaded.metadata.word_count < before
+        assert project_manager.read_chapter(loaded, 2) == "## Chapter 2\n\nShort.\n"
+
+    def test_write_chapter_rejects_other_shapes(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that a written chapter must be exactly one chapter."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+
+        for index, text in [
+            (2, "## Chapter 2\n\nOne.\n\n## Chapter 3\n\nTwo.\n"),
+            (2, "No heading at all.\n"),
+            (1, "Leading text.\n## Chapter 1\n"),
+            (0, "# Title\n\n## Chapter 0\n"),
+        ]:
+            with pytest.raises(ValueError):
+                project_manager.write_chapter(sample_project, index, text)
+
+        assert project_manager.get_manuscript_content(sample_project) == sample_manuscript
+        project_manager.write_chapter(sample_project, 0, "# New Title\n\n")
+        assert sample_project.metadata.chapter_count == 2
+
+    def test_save_full_content_in_chapter_mode(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that saving full content in chapters mode round-trips."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+
+        edited = sample_manuscript.replace("carefully", "very carefully")
+        project_manager.save_manuscript_content(sample_project, edited)
+        assert project_manager.get_manuscript_content(sample_project) == edited
+
+        extended = edited + "\n## Chapter 3\n\nThe end.\n"
+        project_manager.save_manuscript_content(sample_project, extended)
+        assert project_manager.get_manuscript_content(sample_project) == extended
+        assert sample_project.metadata.chapter_count == 3
+
+    def test_resplit_commits_with_header(
+        self, project_manager, sample_project, sample_manuscript, monkeypatch
+    ):
+        """Test that changing the chapter count is one journal commit."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        commits = []
+        commit = project_manager.journal.commit
+        monkeypatch.setattr(
+            project_manager.journal, "commit", lambda files: commits.append(files) or commit(files)
+        )
+
+        project_manager.enable_chapter_storage(sample_project)
+        store = project_manager.chapter_store(sample_project)
+        old_files = {store.chapters_dir / entry.file for entry in store.manifest.chapters}
+        project_manager.save_manuscript_content(sample_project, "# Title\n\n## One\n\nText.\n")
+
+        assert len(commits) == 2
+        for files in commits:
+            names = {path.name for path in files}
+            assert {"project.json", "manifest.json"} <= names
+        assert not any(path.exists() for path in old_files)
+        assert len(list(store.chapters_dir.glob("ch-*.md"))) == 2
+
+    def test_write_chapter_requires_chapter_mode(self, project_manager, sample_project):
+        """Test that writing a chapter rejects single-file projects."""
+        with pytest.raises(ValueError):
+            project_manager.write_chapter(sample_project, 0, "text")
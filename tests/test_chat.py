@@ -0,0 +1,131 @@
+"""Tests for the manuscript chat session."""
+
+import asyncio
+
+from claude_agent_sdk import AssistantMessage, ResultMessage, StreamEvent, TextBlock
+
+from storybook.chat import ManuscriptChatSession
+
+
+def delta(text: str) -> StreamEvent:
+    return StreamEvent(
+        uuid="u",
+        session_id="s",
+        event={
+            "type": "content_block_delta",
+            "index": 0,
+            "delta": {"type": "text_delta", "text": text},
+        },
+    )
+
+
+class FakeClient:
+    """Stands in for ClaudeSDKClient, replaying canned messages."""
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def query(self, message):
+        pass
+
+    async def receive_response(self):
+        for message in self.messages:
+            await asyncio.sleep(0)
+            yield message
+
+
+class StreamingFakeClient:
+    """Stands in for ClaudeSDKClient, with one message stream shared by all turns."""
+
+    def __init__(self, messages):
+        self.stream = iter(messages)
+        self.interrupted = False
+
+    async def query(self, message):
+        pass
+
+    async def interrupt(self):
+        self.interrupted = True
+
+    async def receive_response(self):
+        for message in self.stream:
+            await asyncio.sleep(0)
+            yield message
+            if isinstance(message, ResultMessage):
+                return
+
+
+def run_turn(project, project_manager, messages, stream_partial=False) -> list[dict]:
+    session = ManuscriptChatSession(project, project_manager, stream_partial=stream_partial)
+    session.client = FakeClient(messages)
+
+    async def collect():
+        return [event async for event in session.send_message("hello")]
+
+    return asyncio.run(collect())
+
+
+RESULT = ResultMessage(
+    subtype="success", duration_ms=1, duration_api_ms=1, is_error=False, num_turns=1, session_id="s"
+)
+
+
+class TestManuscriptChatSession:
+    """Tests for ManuscriptChatSession.send_message."""
+
+    def test_partial_streaming_reconciles_final_block(self, project_manager, sample_project):
+        """Test that deltas are followed by the authoritative final block."""
+        messages = [
+            delta("Hel"),
+            delta("lo"),
+            AssistantMessage(content=[TextBlock(text="Hello.")], model="m"),
+            RESULT,
+        ]
+
+        events = run_turn(sample_project, project_manager, messages, stream_partial=True)
+
+        assert [e["type"] for e in events] == ["text_delta", "text_delta", "text", "complete"]
+        assert "".join(e["content"] for e in events[:2]) == "Hello"
+        assert events[2] == {"type": "text", "content": "Hello.", "streamed": True}
+
+    def test_complete_reports_latency(self, project_manager, sample_project):
+        """Test that the complete event carries timing information."""
+        messages = [AssistantMessage(content=[TextBlock(text="Hi")], model="m"), RESULT]
+
+        events = run_turn(sample_project, project_manager, messages)
+
+        assert events[0]["streamed"] is False
+        complete = events[-1]
+        assert 0 <= complete["time_to_first_token"] <= complete["time_to_complete"]
+
+    def test_no_text_means_no_first_token(self, project_manager, sample_project):
+        """Test that a reply without text reports no time to first token."""
+        events = run_turn(sample_project, project_manager, [RESULT])
+
+        assert events[0]["time_to_first_token"] is None
+
+    def test_turn_after_interrupt_gets_its_own_reply(self, project_manager, sample_project):
+        """Test that the rest of an interrupted reply is not read by the next turn."""
+        session = ManuscriptChatSession(sample_project, project_manager)
+        session.client = StreamingFakeClient(
+            [
+                AssistantMessage(content=[TextBlock(text="First")], model="m"),
+                AssistantMessage(content=[TextBlock(text="first, continued")], model="m"),
+                RESULT,
+                AssistantMessage(content=[TextBlock(text="Second")], model="m"),
+                RESULT,
+            ]
+        )
+
+        async def scenario():
+            turn = session.send_message("one")
+            assert (await anext(turn))["content"] == "First"
+            await turn.aclose()
+            await session.interrupt()
+            return [event async for event in session.send_message("two")]
+
+        events = asyncio.run(scenario())
+
+        assert session.client.interrupted
+        assert [e.get("content") for e in events] == ["Second", None]
+        assert events[-1]["type"] == "complete"
@@ -0,0 +1,194 @@
+"""Tests for the multiplexed chat host."""
+
+import asyncio
+import io
+
+from storybook.chat_host import ChatHost
+from storybook.events import EventStream, read_events
+
+
+class FakeChat:
+    """Chat session that echoes messages, optionally slowly."""
+
+    def __init__(self, project_id: str, delay: float = 0.0):
+        self.project_id = project_id
+        self.delay = delay
+        self.closed = False
+        self.interrupted = False
+
+    async def send_message(self, message):
+        for word in message.split():
+            await asyncio.sleep(self.delay)
+            yield {"type": "text_delta", "content": word}
+        yield {"type": "complete"}
+
+    async def interrupt(self):
+        await asyncio.sleep(self.delay)
+        self.interrupted = True
+
+    async def close(self):
+        self.closed = True
+
+
+def run_host(scenario, delay: float = 0.0, **kwargs) -> list[dict]:
+    """Run a scenario against a host and return the events it wrote."""
+    out = io.BytesIO()
+
+    async def main():
+        events = EventStream(out, flush_interval=10)
+        chats = []
+
+        async def factory(project_id):
+            chat = FakeChat(project_id, delay=delay)
+            chats.append(chat)
+            return chat
+
+        host = ChatHost(events, factory, **kwargs)
+        await scenario(host, chats)
+        await host.shutdown()
+        await events.close()
+
+    asyncio.run(main())
+    out.seek(0)
+    return list(read_events(out))
+
+
+def session_events(events, session_id):
+    return [e for e in events if e["session"] == session_id]
+
+
+class TestChatHost:
+    """Tests for ChatHost class."""
+
+    def test_sessions_are_routed(self):
+        """Test that each session's events carry its id."""
+
+        async def scenario(host, chats):
+            await host.open("a", "p1")
+            await host.open("b", "p2")
+            await asyncio.gather(host.send("a", "one two"), host.send("b", "three"))
+
+        events = run_host(scenario)
+
+        a = session_events(events, "a")
+        b = session_events(events, "b")
+        assert [e["type"] for e in a] == ["opened", "text_delta", "complete", "closed"]
+        assert a[1]["content"] == "onetwo"
+        assert b[1]["content"] == "three"
+        assert [e["seq"] for e in events] == list(range(len(events)))
+
+    def test_turns_in_a_session_run_in_order(self):
+        """Test that queued turns of one session do not interleave."""
+
+        async def scenario(host, chats):
+            await host.open("a", "p")
+            first = host.send("a", "x y")
+            second = host.send("a", "z")
+            await asyncio.gather(first, second)
+
+        events = run_host(scenario, delay=0.01)
+
+        types = [e["type"] for e in session_events(events, "a")]
+        assert types == ["opened", "text_delta", "complete", "text_delta", "complete", "closed"]
+
+    def test_max_concurrent(self):
+        """Test that no more than max_concurrent turns run at once."""
+        peak = 0
+
+        async def scenario(host, chats):
+            nonlocal peak
+            for i in range(4):
+                await host.open(f"s{i}", "p")
+            tasks = [host.send(f"s{i}", "a b c") for i in range(4)]
+            while not all(t.done() for t in tasks):
+                peak = max(peak, host.stats()["running"])
+                await asyncio.sleep(0.001)
+
+        run_host(scenario, max_concurrent=2, delay=0.01)
+        assert peak == 2
+
+    def test_cancel(self):
+        """Test that cancelling stops the running turn and interrupts the session."""
+
+        async def scenario(host, chats):
+            await host.open("a", "p")
+            host.send("a", " ".join(["word"] * 100))
+            await asyncio.sleep(0.05)
+            await host.cancel("a")
+            assert chats[0].interrupted
+            assert not host.sessions["a"].busy
+
+        events = run_host(scenario, delay=0.01)
+
+        types = [e["type"] for e in session_events(events, "a")]
+        assert "cancelled" in types
+        assert "complete" not in types
+
+    def test_turn_sent_during_cancel_waits_for_interrupt(self):
+        """Test that a turn does not start before the interrupted one is drained."""
+
+        async def scenario(host, chats):
+            await host.open("a", "p")
+            host.send("a", " ".join(["word"] * 100))
+            await asyncio.sleep(0.05)
+            cancelling = host.cancel("a")
+            turn = host.send("a", "next")
+            await cancelling
+            assert chats[0].interrupted
+            assert not turn.done()
+            await turn
+
+        events = run_host(scenario, delay=0.01)
+
+        types = [e["type"] for e in session_events(events, "a")]
+        assert types[-3:] == ["text_delta", "complete", "closed"]
+        assert types.index("cancelled") < types.index("complete")
+
+    def test_slow_cancel_does_not_block_other_sessions(self):
+        """Test that commands for other sessions run while one is cancelled."""
+
+        async def scenario(host, chats):
+            await host.handle({"op": "open", "session": "a", "project_id": "p"})
+            await host.handle({"op": "open", "session": "b", "project_id": "p"})
+            await host.handle({"op": "send", "session": "a", "content": "word " * 100})
+            await asyncio.sleep(0.05)
+            chats[0].delay = 0.5  # A slow interrupt
+            await host.handle({"op": "cancel", "session": "a"})
+            await host.handle({"op": "close", "session": "a"})
+            assert "a" not in host.sessions
+            await host.handle({"op": "send", "session": "b", "content": "hi"})
+            await next(iter(host.sessions["b"].turns))
+            assert not chats[0].interrupted
+
+        events = run_host(scenario, delay=0.01)
+
+        types = [(e["session"], e["type"]) for e in events]
+        assert types.index(("b", "complete")) < types.index(("a", "cancelled"))
+        assert types.index(("a", "cancelled")) < types.index(("a", "closed"))
+
+    def test_idle_eviction(self):
+        """Test that idle sessions are closed and busy ones are kept."""
+
+        async def scenario(host, chats):
+            await host.open("idle", "p")
+            await host.open("busy", "p")
+            await host.sessions["idle"].starting
+            turn = host.send("busy", "a b c d e")
+            await asyncio.sleep(0.02)
+            assert await host.evict_idle() == ["idle"]
+            assert chats[0].closed
+            await turn
+
+        events = run_host(scenario, idle_timeout=0.01, delay=0.01)
+
+        assert session_events(events, "idle")[-1]["type"] == "evicted"
+
+    def test_unknown_session_reports_error(self):
+        """Test that commands for unknown sessions produce error events."""
+
+        async def scenario(host, chats):
+            await host.handle({"op": "send", "session": "nope", "content": "hi"})
+
+        events = run_host(scenario)
+        assert events[0]["type"] == "error"
+        assert events[0]["session"] == "nope"
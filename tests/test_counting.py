@@ -0,0 +1,164 @@
+"""Tests for incremental word and chapter counting."""
+
+import io
+import random
+
+import pytest
+
+from storybook.counting import apply_edit, count_lines, count_text, find_edit, utf16_to_indexes
+
+
+class TestCountText:
+    """Tests for full counts."""
+
+    def test_count_text(self, sample_manuscript):
+        """Test word and chapter counts for a manuscript."""
+        stats = count_text(sample_manuscript)
+
+        assert stats.word_count == len(sample_manuscript.split())
+        assert stats.chapter_count == 2
+        assert [c.title for c in stats.chapters] == ["", "Chapter 1", "Chapter 2"]
+        assert stats.length == len(sample_manuscript)
+
+    def test_count_lines_matches_count_text(self, sample_manuscript):
+        """Test that streamed counting matches in-memory counting."""
+        assert count_lines(io.StringIO(sample_manuscript)) == count_text(sample_manuscript)
+
+    def test_count_empty(self):
+        """Test counting an empty manuscript."""
+        stats = count_text("")
+        assert stats.word_count == 0
+        assert stats.chapter_count == 0
+
+
+class TestFindEdit:
+    """Tests for find_edit."""
+
+    def test_find_edit(self):
+        """Test locating the changed region."""
+        old = "The quick brown fox"
+        new = "The very quick brown fox"
+        start, end, text = find_edit(old, new)
+        assert old[:start] + text + old[end:] == new
+        assert text == "very "
+
+    def test_find_edit_identical(self):
+        """Test that identical texts produce an empty edit."""
+        assert find_edit("same", "same") == (4, 4, "")
+
+
+class TestUtf16Offsets:
+    """Tests for utf16_to_indexes."""
+
+    def test_astral_characters_shift_offsets(self):
+        """Test that characters outside the BMP count as two code units."""
+        pieces = ["a\U0001f600b", "\u00e9\U0001f600"]
+        text = "".join(pieces)
+        units = text.encode("utf-16-le")
+
+        offsets = [0, 1, 3, 4, 5, 7]
+        indexes = utf16_to_indexes(pieces, offsets)
+
+        for offset, index in zip(offsets, indexes):
+            assert text[:index].encode("utf-16-le") == units[: 2 * offset]
+
+    def test_offset_inside_surrogate_pair(self):
+        """Test that an offset splitting a character is rejected."""
+        with pytest.raises(ValueError):
+            utf16_to_indexes(["a\U0001f600b"], [2])
+
+
+class TestApplyEdit:
+    """Tests for apply_edit."""
+
+    def test_edit_within_chapter(self, sample_manuscript):
+        """Test an edit that does not touch headings."""
+        stats = count_text(sample_manuscript)
+        start = sample_manuscript.index("carefully")
+        end = start + len("carefully")
+
+        updated = apply_edit(stats, sample_manuscript, start, end, "very carefully indeed")
+        new = sample_manuscript[:start] + "very carefully indeed" + sample_manuscript[end:]
+
+        assert updated == count_text(new)
+        assert updated.chapters[2].word_count == stats.chapters[2].word_count + 2
+
+    def test_edit_adds_chapter(self, sample_manuscript):
+        """Test an edit that inserts a chapter heading."""
+        stats = count_text(sample_manuscript)
+        start = sample_manuscript.index("She found")
+
+        updated = apply_edit(stats, sample_manuscript, start, start, "## Chapter 1b\n\n")
+        new = sample_manuscript[:start] + "## Chapter 1b\n\n" + sample_manuscript[start:]
+
+        assert updated == count_text(new)
+        assert updated.chapter_count == 3
+
+    def test_edit_removes_chapter(self, sample_manuscript):
+        """Test an edit that deletes a chapter heading."""
+        stats = count_text(sample_manuscript)
+        start = sample_manuscript.index("## Chapter 2")
+        end = start + len("## Chapter 2\n")
+
+        updated = apply_edit(stats, sample_manuscript, start, end, "")
+        new = sample_manuscript[:start] + sample_manuscript[end:]
+
+        assert updated == count_text(new)
+        assert updated.chapter_count == 1
+
+    def test_random_edits_match_full_count(self, sample_manuscript):
+        """Test that many random edits agree with a full recount."""
+        rng = random.Random(42)
+        pieces = ["", " ", "word", "\n", "\n## New chapter\n", "## ", "two words", "#"]
+        text = sample_manuscript
+        stats = count_text(text)
+
+        for _ in range(500):
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, min(len(text), start + 20))
+            replacement = rng.choice(pieces)
+            stats = apply_edit(stats, text, start, end, replacement)
+            text = text[:start] + replacement + text[end:]
+            assert stats == count_text(text)
+
+
+class TestProjectCounting:
+    """Tests for counting through Project and ProjectManager."""
+
+    def test_save_sets_chapter_count(self, project_manager, sample_project, sample_manuscript):
+        """Test that saving content computes chapter counts."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+
+        loaded = project_manager.load_project(sample_project.id)
+        assert loaded.metadata.chapter_count == 2
+        assert len(loaded.metadata.chapters) == 3
+
+    def test_incremental_save_matches_full_count(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that incremental counting on save agrees with a full count."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        edited = sample_manuscript.replace("Sarah hurried", "Sarah slowly hurried")
+        project_manager.save_manuscript_content(sample_project, edited)
+
+        assert sample_project.manuscript_stats == count_text(edited)
+
+    def test_external_edit_falls_back_to_full_count(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that stale statistics trigger a full recount."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        path = sample_project.get_manuscript_path(project_manager.data_dir)
+        path.write_text("Edited elsewhere.\n")
+
+        project_manager.save_manuscript_content(sample_project, "Edited elsewhere again.\n")
+        assert sample_project.metadata.word_count == 3
+
+    def test_update_word_count_streams_file(self, project_manager, sample_project):
+        """Test that update_word_count counts the file on disk."""
+        path = sample_project.get_manuscript_path(project_manager.data_dir)
+        path.write_text("# T\n\n## One\n\na b c\n\n## Two\n\nd e\n")
+
+        sample_project.update_word_count(project_manager.data_dir)
+        assert sample_project.metadata.word_count == 11
+        assert sample_project.metadata.chapter_count == 2
@@ -0,0 +1,156 @@
+"""Tests for the framed bridge event stream."""
+
+import asyncio
+import io
+import os
+import threading
+
+import pytest
+
+from storybook.events import FRAME_HEADER, EventStream, encode_frame, read_events
+
+
+def collect(events_to_send, **kwargs) -> list[dict]:
+    """Send events through an EventStream and decode what it wrote."""
+    out = io.BytesIO()
+
+    async def run():
+        stream = EventStream(out, **kwargs)
+        for event in events_to_send:
+            await stream.send(event)
+        await stream.close()
+
+    asyncio.run(run())
+    out.seek(0)
+    return list(read_events(out))
+
+
+class TestEventStream:
+    """Tests for EventStream class."""
+
+    def test_text_deltas_are_coalesced(self):
+        """Test that consecutive deltas become one frame."""
+        events = collect(
+            [{"type": "text_delta", "content": c} for c in "hello"] + [{"type": "complete"}],
+            flush_interval=10,
+        )
+
+        assert events == [
+            {"type": "text_delta", "content": "hello", "seq": 0},
+            {"type": "complete", "seq": 1},
+        ]
+
+    def test_coalescing_respects_other_fields(self):
+        """Test that deltas with different metadata are kept apart."""
+        events = collect(
+            [
+                {"type": "delta", "role": "assistant", "content": "a"},
+                {"type": "delta", "role": "assistant", "content": "b"},
+                {"type": "thinking_delta", "content": "c"},
+                {"type": "delta", "role": "system", "content": "d"},
+            ],
+            flush_interval=10,
+        )
+
+        assert [e["content"] for e in events] == ["ab", "c", "d"]
+        assert [e["seq"] for e in events] == [0, 1, 2]
+
+    def test_complete_events_are_not_merged(self):
+        """Test that finished messages stay separate events."""
+        events = collect(
+            [
+                {"type": "message", "role": "assistant", "content": "First."},
+                {"type": "message", "role": "assistant", "content": "Second."},
+                {"type": "text", "content": "a"},
+                {"type": "text", "content": "b"},
+                {"type": "thinking", "content": "c"},
+                {"type": "thinking", "content": "d"},
+            ],
+            flush_interval=10,
+        )
+
+        assert [e["content"] for e in events] == ["First.", "Second.", "a", "b", "c", "d"]
+
+    def test_size_limit_flushes(self):
+        """Test that merged text is flushed once it reaches max_text."""
+        events = collect(
+            [{"type": "text_delta", "content": "abcd"} for _ in range(5)],
+            flush_interval=10,
+            max_text=8,
+        )
+
+        assert [e["content"] for e in events] == ["abcdabcd", "abcdabcd", "abcd"]
+
+    def test_time_limit_flushes(self):
+        """Test that a held delta is written after flush_interval."""
+        out = io.BytesIO()
+
+        async def run():
+            stream = EventStream(out, flush_interval=0.01)
+            await stream.send({"type": "text_delta", "content": "late"})
+            await asyncio.sleep(0.05)
+            await stream.flush()
+            written = out.getvalue()
+            await stream.close()
+            return written
+
+        written = asyncio.run(run())
+        assert list(read_events(io.BytesIO(written))) == [
+            {"type": "text_delta", "content": "late", "seq": 0}
+        ]
+
+    def test_send_blocks_when_reader_stalls(self):
+        """Test that a stalled reader bounds the bytes queued in memory."""
+        read_fd, write_fd = os.pipe()
+        writer = os.fdopen(write_fd, "wb", buffering=0)
+        reader = os.fdopen(read_fd, "rb")
+        big = "x" * 1000
+
+        async def produce(stream):
+            for _ in range(2000):
+                await stream.send({"type": "tool", "content": big})
+
+        async def run():
+            stream = EventStream(writer, high_water=8 * 1024)
+            task = asyncio.create_task(produce(stream))
+            await asyncio.sleep(0.2)
+            # Nobody reads: the pipe fills and the producer must stall
+            assert not task.done()
+            assert stream._queued_bytes < 16 * 1024
+
+            received = []
+            drain = threading.Thread(target=lambda: received.extend(read_events(reader)))
+            drain.start()
+            await task
+            await stream.close()
+            writer.close()
+            await asyncio.to_thread(drain.join)
+            return received
+
+        received = asyncio.run(run())
+        assert len(received) == 2000
+        assert [e["seq"] for e in received] == list(range(2000))
+
+    def test_closed_reader_raises(self):
+        """Test that a vanished reader surfaces as OSError."""
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        writer = os.fdopen(write_fd, "wb", buffering=0)
+
+        async def run():
+            stream = EventStream(writer)
+            with pytest.raises(OSError):
+                for _ in range(100):
+                    await stream.send({"type": "progress", "message": "x"})
+                    await stream.flush()
+
+        asyncio.run(run())
+        writer.close()
+
+
+def test_read_events_rejects_truncated_frame():
+    """Test that a frame cut short is an error, not a silent drop."""
+    frame = encode_frame({"type": "text", "content": "cut"})
+    with pytest.raises(ValueError):
+        list(read_events(io.BytesIO(frame[:-2])))
+    assert FRAME_HEADER.unpack(frame[:4])[0] == len(frame) - 4
@@ -0,0 +1,61 @@
+"""Tests for bulk import."""
+
+from storybook.importer import bulk_import, collect_files
+
+
+def write_manuscripts(directory, count):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (directory / f"book_{i}.md").write_text(f"# Book {i}\n\n## Chapter 1\n\n" + "word " * i)
+
+
+class TestCollectFiles:
+    """Tests for collect_files."""
+
+    def test_directory_and_glob(self, temp_dir):
+        """Test expanding directories and glob patterns."""
+        write_manuscripts(temp_dir / "a", 2)
+        write_manuscripts(temp_dir / "b", 2)
+        (temp_dir / "a" / "cover.png").write_bytes(b"")
+
+        assert len(collect_files([temp_dir / "a"])) == 2
+        assert len(collect_files([str(temp_dir / "**" / "book_1.md")])) == 2
+        assert collect_files([temp_dir / "a", str(temp_dir / "a" / "*.md")]) == collect_files(
+            [temp_dir / "a"]
+        )
+
+
+class TestBulkImport:
+    """Tests for bulk_import."""
+
+    def test_import_in_process(self, project_manager, temp_dir):
+        """Test importing documents and reporting failures."""
+        write_manuscripts(temp_dir / "docs", 3)
+        bad = temp_dir / "docs" / "broken.xyz"
+        bad.write_text("?")
+        files = collect_files([temp_dir / "docs"]) + [bad]
+
+        seen = []
+        results = bulk_import(
+            project_manager, files, workers=0, batch_size=2, on_result=seen.append
+        )
+
+        assert seen == results
+        assert sorted(r.name for r in results if r.ok) == ["book_0", "book_1", "book_2"]
+        failed = [r for r in results if not r.ok]
+        assert len(failed) == 1 and "Unsupported" in failed[0].error
+        assert project_manager.catalog.count() == 3
+        words = {r.name: r.word_count for r in results}
+        assert words["book_2"] - words["book_0"] == 2
+        book = next(r for r in results if r.name == "book_2")
+        project = project_manager.load_project(book.project_id)
+        assert project_manager.get_manuscript_content(project).startswith("# Book 2")
+
+    def test_import_with_process_pool(self, project_manager, temp_dir):
+        """Test converting documents in worker processes."""
+        write_manuscripts(temp_dir / "docs", 4)
+
+        results = bulk_import(project_manager, collect_files([temp_dir / "docs"]), workers=2)
+
+        assert all(r.ok for r in results)
+        assert len(project_manager.list_project_summaries()) == 4
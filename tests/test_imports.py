@@ -0,0 +1,62 @@
+"""Tests that entry points start without loading heavy dependencies."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+RUNNER = Path(__file__).parent.parent / "storybook-web" / "server" / "services" / "python_runner.py"
+
+# Modules that must only be imported when a feature needs them
+HEAVY_MODULES = {"docx", "pypdf", "PyPDF2", "claude_agent_sdk", "multiprocessing"}
+
+# Generous wall-clock budget for a cold import; the heavy dependencies
+# alone take well over a second to import.
+IMPORT_BUDGET = 1.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def probe(statement: str, home: Path) -> dict:
+    src = Path(__file__).parent.parent / "src"
+    env = dict(os.environ, HOME=str(home))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(src), env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from storybook.main import main",
+        "import storybook.web_integration as w; w.list_project_summaries()",
+        (
+            f"sys.path.insert(0, {str(RUNNER.parent)!r}); import python_runner; "
+            "python_runner.execute_command({'module': 'storybook.web_integration', "
+            "'function': 'list_project_summaries'})"
+        ),
+    ],
+    ids=["main", "web_integration", "python_runner"],
+)
+def test_entry_point_is_light(statement, temp_dir):
+    """Test that entry points import quickly and skip optional dependencies."""
+    result = probe(statement, temp_dir)
+
+    loaded = {name.split(".")[0] for name in result["modules"]}
+    assert not loaded & HEAVY_MODULES
+    assert result["seconds"] < IMPORT_BUDGET
@@ -154,6 +154,80 @@ class TestProject:
         assert len(sample_project.plot_events) == 1
         assert sample_project.plot_events[0].title == "Updated"
 
+    def test_indexes_survive_serialization(self, sample_project):
+        """Test that lookups work on a project loaded from JSON."""
+        sample_project.add_character(Character(name="Sarah", aliases=["Detective"]))
+        sample_project.add_plot_event(PlotEvent(id="e1", title="Start", description="..."))
+
+        loaded = Project.model_validate_json(sample_project.model_dump_json())
+
+        assert loaded.get_character("DETECTIVE").name == "Sarah"
+        assert loaded.get_plot_event("e1").title == "Start"
+        assert "_character_index" not in loaded.model_dump()
+
+    def test_replace_character_updates_aliases(self, sample_project):
+        """Test that replacing a character drops its old aliases."""
+        sample_project.add_character(Character(name="Sarah", aliases=["Sal"]))
+        sample_project.add_character(Character(name="sarah", aliases=["Detective"]))
+
+        assert len(sample_project.characters) == 1
+        assert sample_project.get_character("Sal") is None
+        assert sample_project.get_character("detective").name == "sarah"
+
+    def test_direct_list_changes_are_picked_up(self, sample_project):
+        """Test that appending to the list directly keeps lookups correct."""
+        sample_project.add_character(Character(name="Sarah"))
+        sample_project.characters.append(Character(name="Chen", aliases=["Doc"]))
+        sample_project.plot_events = [PlotEvent(id="e2", title="Twist", description="...")]
+
+        assert sample_project.get_character("doc").name == "Chen"
+        assert sample_project.get_plot_event("e2").title == "Twist"
+
+    def test_rename_and_remove(self, sample_project):
+        """Test that renamed and removed entities keep lookups correct."""
+        sample_project.add_character(Character(name="Sarah", aliases=["Sal"]))
+        sample_project.add_character(Character(name="Chen"))
+        sample_project.add_plot_event(PlotEvent(id="e1", title="Start", description="..."))
+
+        assert sample_project.rename_character("chen", "Dr. Chen").name == "Dr. Chen"
+        assert sample_project.get_character("Chen") is None
+        assert sample_project.get_character("dr. chen").name == "Dr. Chen"
+
+        assert sample_project.remove_character("sal").name == "Sarah"
+        assert sample_project.get_character("Sarah") is None
+        assert sample_project.get_character("Dr. Chen") is sample_project.characters[0]
+        assert sample_project.remove_character("Sarah") is None
+
+        assert sample_project.remove_plot_event("e1").title == "Start"
+        assert sample_project.get_plot_event("e1") is None
+
+    def test_reindex_after_in_place_changes(self, sample_project):
+        """Test that reindex picks up replaced elements and edited keys."""
+        sample_project.add_character(Character(name="Sarah", aliases=["Sal"]))
+        sample_project.add_plot_event(PlotEvent(id="e1", title="Start", description="..."))
+
+        sample_project.characters[0] = Character(name="Mara")
+        sample_project.plot_events[0].id = "e9"
+        sample_project.reindex()
+
+        assert sample_project.get_character("sal") is None
+        assert sample_project.get_character("mara").name == "Mara"
+        assert sample_project.get_plot_event("e1") is None
+        assert sample_project.get_plot_event("e9").title == "Start"
+
+    def test_lookups_scale_with_tracking(self):
+        """Test that lookups between additions do not rescan the lists."""
+        project = Project(id="p", name="p")
+        for i in range(200):
+            project.add_character(Character(name=f"Character {i}"))
+            project.add_plot_event(PlotEvent(id=f"e{i}", title="t", description="d"))
+            assert project.get_character(f"character {i}") is not None
+            project.characters[-1].notes = "edited"
+
+        index = project._character_index
+        assert project.get_character("Character 0").notes == "edited"
+        assert project._character_index is index
+
 
 class TestReviewSuggestion:
     """Tests for ReviewSuggestion model."""
@@ -0,0 +1,68 @@
+"""Tests for the multi-name matcher."""
+
+import asyncio
+
+from storybook.models import Character
+from storybook.names import NameMatcher
+from storybook.tools import _project_tools
+
+CAST = [
+    Character(name="Sarah Jones", aliases=["Sarah", "Jonesy"]),
+    Character(name="Tom", aliases=["Thomas"]),
+    Character(name="Ann", aliases=["Sarah"]),
+    Character(name="Chen"),
+]
+
+
+class TestNameMatcher:
+    """Tests for NameMatcher."""
+
+    def test_scan(self):
+        """Test whole-word, case-insensitive matching of names and aliases."""
+        text = "Sarah Jones met tom. SARAH's hat; sarah\njones, Thomas, Tommy and Sarahs."
+        matcher = NameMatcher.from_characters(CAST)
+
+        found = [(m.character, m.name, m.text) for m in matcher.scan(text)]
+        assert found == [
+            ("Sarah Jones", "Sarah Jones", "Sarah Jones"),
+            ("Tom", "Tom", "tom"),
+            ("Sarah Jones", "Sarah", "SARAH"),
+            ("Ann", "Sarah", "SARAH"),  # A shared alias counts for both
+            ("Sarah Jones", "Sarah Jones", "sarah jones"),
+            ("Tom", "Thomas", "Thomas"),
+        ]
+        assert text[matcher.scan(text)[2].offset :].startswith("SARAH's")
+
+    def test_overlapping_patterns(self):
+        """Test that failure links find names starting inside a partial match."""
+        matcher = NameMatcher({"A": ["red fox"], "B": ["fox hunt"], "C": ["red red fox"]})
+
+        found = [(m.character, m.offset) for m in matcher.scan("the red red fox hunt")]
+        assert found == [("C", 4)]
+        found = [(m.character, m.offset) for m in matcher.scan("a red fox hunt")]
+        assert found == [("A", 2)]
+
+    def test_report(self):
+        """Test per-chapter counts and capitalization issues."""
+        chapters = ["# Title\n\n", "## One\n\nTom and Chen.\n\n", "## Two\n\ntom, Tom, Thomas.\n"]
+
+        reports = {r.character: r for r in NameMatcher.from_characters(CAST).report(chapters)}
+        assert reports["Tom"].count == 4
+        assert reports["Tom"].chapters == {1: 1, 2: 3}
+        assert reports["Tom"].issues == ["Inconsistent capitalization of 'Tom': Tom, tom"]
+        assert reports["Chen"].chapters == {1: 1}
+        assert reports["Sarah Jones"].count == 0
+
+
+def test_check_all_characters_tool(project_manager, sample_project, sample_manuscript):
+    """Test the batch tool scans the project's manuscript for its characters."""
+    for character in CAST:
+        sample_project.add_character(character)
+    project_manager.save_manuscript_content(sample_project, sample_manuscript)
+
+    tools = {t.name: t for t in _project_tools(sample_project, project_manager)}
+    text = asyncio.run(tools["check_all_characters"].handler({}))["content"][0]["text"]
+    assert "Checked 4 characters." in text
+    assert "- Sarah Jones: 1 mentions in 1 chapters (ch. 1: 1)" in text
+    assert "- Chen: 1 mentions in 1 chapters (ch. 2: 1)" in text
+    assert "- Tom: not mentioned" in text
@@ -1,10 +1,15 @@
 """Tests for project manager."""
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
 
-from storybook.project_manager import ProjectManager
-from storybook.models import ManuscriptMetadata
+from storybook.chapters import ChapterStore, split_chapters
+from storybook.project_manager import ProjectManager, StaleVersionError
+from storybook.models import Character, ManuscriptMetadata, PlotEvent
 
 
 class TestProjectManager:
@@ -139,3 +144,402 @@ class TestProjectManager:
         assert len(loaded.plot_events) == 1
         assert loaded.characters[0].name == "Sarah"
         assert loaded.plot_events[0].id == "event_001"
+
+
+class TestProjectCache:
+    """Tests for the project LRU cache."""
+
+    def test_repeated_loads_hit_cache(self, project_manager, sample_project):
+        """Test that unchanged projects are served from the cache."""
+        project_manager.clear_cache()
+
+        first = project_manager.load_project(sample_project.id)
+        second = project_manager.load_project(sample_project.id)
+
+        assert first is second
+        info = project_manager.cache_info()
+        assert info["misses"] == 1
+        assert info["hits"] == 1
+
+    def test_external_change_invalidates(self, project_manager, sample_project):
+        """Test that a changed project.json is re-read."""
+        project_manager.load_project(sample_project.id)
+        metadata_file = sample_project.get_project_dir(project_manager.data_dir) / "project.json"
+        data = metadata_file.read_text().replace("test_project", "renamed_project")
+        metadata_file.write_text(data)
+        stat = metadata_file.stat()
+        os.utime(metadata_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        loaded = project_manager.load_project(sample_project.id)
+        assert loaded.name == "renamed_project"
+
+    def test_eviction(self, temp_dir):
+        """Test that the least recently used project is evicted."""
+        pm = ProjectManager(temp_dir / "projects", cache_size=2)
+        projects = [pm.create_project(f"project_{i}") for i in range(3)]
+
+        assert pm.cache_info()["size"] == 2
+        pm.load_project(projects[0].id)
+        assert pm.cache_info()["misses"] == 1
+
+    def test_delete_drops_entry(self, project_manager, sample_project):
+        """Test that deleting a project removes it from the cache."""
+        project_manager.delete_project(sample_project.id)
+
+        assert project_manager.cache_info()["size"] == 0
+        assert project_manager.load_project(sample_project.id) is None
+
+    def test_unreadable_project_is_evicted(self, project_manager, sample_project):
+        """Test that a project removed or broken on disk is not served from the cache."""
+        project_manager.load_project(sample_project.id)
+        project_file = sample_project.get_project_dir(project_manager.data_dir) / "project.json"
+        project_file.write_text("{not json")
+
+        assert project_manager.load_project(sample_project.id) is None
+        assert project_manager.cache_info()["size"] == 0
+
+        project_file.unlink()
+        project_manager._saved([sample_project])
+        assert project_manager.cache_info()["size"] == 0
+        assert project_manager.load_project(sample_project.id) is None
+
+
+class TestChapterTexts:
+    """Tests for the shared chapter text cache."""
+
+    def test_cached_until_manuscript_changes(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that texts are reused until the manuscript is rewritten."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        texts = project_manager.chapter_texts(sample_project)
+        assert "".join(texts) == sample_manuscript
+
+        cached = project_manager._texts[sample_project.id][1]
+        texts.append("not shared")
+        assert project_manager.chapter_texts(sample_project) == cached
+        assert project_manager._texts[sample_project.id][1] is cached
+
+        path = sample_project.get_manuscript_path(project_manager.data_dir)
+        path.write_text("Edited elsewhere.\n")
+        assert project_manager.chapter_texts(sample_project) == ["Edited elsewhere.\n"]
+
+        project_manager.save_manuscript_content(sample_project, "# New\n")
+        assert project_manager.chapter_texts(sample_project) == ["# New\n"]
+
+    def test_bounded(self, temp_dir, sample_manuscript):
+        """Test that the least recently used texts are dropped over the limit."""
+        pm = ProjectManager(temp_dir / "projects", text_cache_chars=len(sample_manuscript) * 2)
+        projects = [pm.create_project(f"project_{i}") for i in range(3)]
+        for project in projects:
+            pm.save_manuscript_content(project, sample_manuscript)
+            pm.chapter_texts(project)
+
+        assert list(pm._texts) == [projects[1].id, projects[2].id]
+
+    def test_read_chapters_reads_only_selection(
+        self, project_manager, sample_project, sample_manuscript, monkeypatch
+    ):
+        """Test that selected chapters are read without loading the manuscript."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        texts = [text for _, text in split_chapters(sample_manuscript)]
+        project_manager._texts.clear()
+        monkeypatch.setattr(ProjectManager, "get_manuscript_content", None)
+
+        assert project_manager.chapter_count(sample_project) == len(texts)
+        assert project_manager.read_chapters(sample_project, "1") == {1: texts[1]}
+
+        monkeypatch.undo()
+        project_manager.enable_chapter_storage(sample_project)
+        read = []
+        read_chapter = ChapterStore.read_chapter
+        monkeypatch.setattr(
+            ChapterStore,
+            "read_chapter",
+            lambda store, index: read.append(index) or read_chapter(store, index),
+        )
+        assert project_manager.read_chapters(sample_project, "1-2") == {1: texts[1], 2: texts[2]}
+        assert read == [1, 2]
+        assert project_manager._texts == {}
+
+        with pytest.raises(ValueError):
+            project_manager.read_chapters(sample_project, len(texts))
+
+
+class TestEntityBuffer:
+    """Tests for buffered saving of tracked characters and plot events."""
+
+    @staticmethod
+    def count_saves(project_manager, monkeypatch) -> list:
+        saves = []
+        commit = project_manager.journal.commit
+        monkeypatch.setattr(
+            project_manager.journal, "commit", lambda files: saves.append(files) or commit(files)
+        )
+        return saves
+
+    def test_saved_immediately_outside_event_loop(
+        self, project_manager, sample_project, sample_character, monkeypatch
+    ):
+        """Test that synchronous callers are not left with unsaved changes."""
+        saves = self.count_saves(project_manager, monkeypatch)
+        project_manager.add_character(sample_project, sample_character)
+
+        assert len(saves) == 1
+        project_manager.clear_cache()
+        loaded = project_manager.load_project(sample_project.id)
+        assert loaded.get_character("Sarah J.").name == "Sarah"
+
+    def test_coalesced_until_flush(self, project_manager, sample_project, monkeypatch):
+        """Test that many changes in a turn are saved in one write."""
+        saves = self.count_saves(project_manager, monkeypatch)
+
+        async def turn():
+            for i in range(200):
+                project_manager.add_character(sample_project, Character(name=f"Extra {i}"))
+                project_manager.add_plot_event(
+                    sample_project, PlotEvent(id=f"e{i}", title="Beat", description="")
+                )
+            assert saves == []
+            assert project_manager.flush_entities() == 1
+            assert project_manager.flush_entities() == 0
+
+        asyncio.run(turn())
+        assert len(saves) == 1
+        project_manager.clear_cache()
+        loaded = project_manager.load_project(sample_project.id)
+        assert len(loaded.characters) == 200
+        assert len(loaded.plot_events) == 200
+
+    def test_flush_keeps_other_managers_saves(self, project_manager, sample_project):
+        """Test that a flush does not undo a save made meanwhile elsewhere."""
+        other = ProjectManager(project_manager.data_dir)
+
+        async def turn():
+            project_manager.add_character(sample_project, Character(name="Ann"))
+            elsewhere = other.load_project(sample_project.id)
+            other.add_plot_event(elsewhere, PlotEvent(id="e1", title="Beat", description=""))
+            other.save_manuscript_content(
+                elsewhere, "Eight words were written in this short chapter.\n"
+            )
+            project_manager.flush_entities()
+
+        asyncio.run(turn())
+        loaded = ProjectManager(project_manager.data_dir).load_project(sample_project.id)
+        assert loaded.manuscript_version == 1
+        assert loaded.metadata.word_count == 8
+        assert [c.name for c in loaded.characters] == ["Ann"]
+        assert [e.id for e in loaded.plot_events] == ["e1"]
+
+    def test_flush_seen_by_other_managers(self, project_manager, sample_project):
+        """Test that another manager's cached project picks up flushed entities."""
+        other = ProjectManager(project_manager.data_dir)
+        assert other.load_project(sample_project.id).character_count == 0
+
+        project_manager.add_character(sample_project, Character(name="Ann"))
+        project_manager.flush_entities()
+
+        assert [c.name for c in other.load_project(sample_project.id).characters] == ["Ann"]
+
+    def test_flushed_after_delay(self, temp_dir, monkeypatch):
+        """Test that buffered changes are saved after the debounce window."""
+        pm = ProjectManager(temp_dir / "projects", entity_flush_delay=0.01)
+        project = pm.create_project("Debounced")
+        saves = self.count_saves(pm, monkeypatch)
+
+        async def turn():
+            pm.add_character(project, Character(name="Ann"))
+            pm.add_character(project, Character(name="Bob"))
+            await asyncio.sleep(0.05)
+
+        asyncio.run(turn())
+        assert len(saves) == 1
+        assert pm._unsaved == {}
+
+
+class TestManuscriptPatch:
+    """Tests for patch-based manuscript saves."""
+
+    def test_apply_patch(self, project_manager, sample_project, sample_manuscript):
+        """Test applying several edits against the current version."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        version = sample_project.manuscript_version
+        start = sample_manuscript.index("carefully")
+        edits = [
+            {"start": start, "end": start + len("carefully"), "text": "very carefully"},
+            {"start": 2, "end": 2, "text": "Tale of "},
+        ]
+
+        new_version = project_manager.apply_manuscript_patch(sample_project, version, edits)
+
+        expected = sample_manuscript.replace("carefully", "very carefully").replace(
+            "# The", "# Tale of The"
+        )
+        assert new_version == version + 1
+        assert project_manager.get_manuscript_content(sample_project) == expected
+        fresh = project_manager.load_project(sample_project.id)
+        fresh.update_word_count_from_text(expected)
+        assert sample_project.metadata.word_count == fresh.metadata.word_count
+
+    def test_stale_base_rejected(self, project_manager, sample_project, sample_manuscript):
+        """Test that a patch against an old version is rejected."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        stale = sample_project.manuscript_version
+        project_manager.save_manuscript_content(sample_project, sample_manuscript + "More.")
+
+        with pytest.raises(StaleVersionError):
+            project_manager.apply_manuscript_patch(
+                sample_project, stale, [{"start": 0, "end": 0, "text": "x"}]
+            )
+
+    def test_concurrent_managers(self, project_manager, sample_project):
+        """Test that only one of two managers' patches at the same version applies."""
+        project_manager.save_manuscript_content(sample_project, "Hello world.")
+        version = sample_project.manuscript_version
+        other = ProjectManager(project_manager.data_dir)
+        other_project = other.load_project(sample_project.id)
+
+        def patch(manager, project, text):
+            try:
+                return manager.apply_manuscript_patch(
+                    project, version, [{"start": 0, "end": 0, "text": text}]
+                )
+            except StaleVersionError:
+                return None
+
+        with ThreadPoolExecutor(2) as pool:
+            results = list(
+                pool.map(
+                    patch,
+                    [project_manager, other],
+                    [sample_project, other_project],
+                    ["X", "Y"],
+                )
+            )
+
+        assert sorted(results, key=str) == [version + 1, None]
+        assert project_manager.get_manuscript_content(sample_project) in (
+            "XHello world.",
+            "YHello world.",
+        )
+
+        # The manager that lost picks up the winner's version and can patch it
+        loser = other_project if results[0] else sample_project
+        manager = other if results[0] else project_manager
+        assert loser.manuscript_version == version + 1
+        assert patch(manager, loser, "Z") is None  # Still based on the old version
+        version += 1
+        assert patch(manager, loser, "Z") == version + 1
+
+    def test_overlapping_edits_rejected(self, project_manager, sample_project):
+        """Test that overlapping edits are rejected."""
+        version = sample_project.manuscript_version
+        edits = [{"start": 0, "end": 4, "text": ""}, {"start": 2, "end": 3, "text": ""}]
+
+        with pytest.raises(ValueError):
+            project_manager.apply_manuscript_patch(sample_project, version, edits)
+
+    def test_patch_in_chapter_mode(self, project_manager, sample_project, sample_manuscript):
+        """Test that a patch inside one chapter rewrites only that chapter."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+        store = project_manager.chapter_store(sample_project)
+        first = store.chapters_dir / store.manifest.chapters[1].file
+        mtime = first.stat().st_mtime_ns
+        start = sample_manuscript.index("impossible")
+
+        project_manager.apply_manuscript_patch(
+            sample_project,
+            sample_project.manuscript_version,
+            [{"start": start, "end": start + 10, "text": "improbable"}],
+        )
+
+        assert first.stat().st_mtime_ns == mtime
+        assert project_manager.get_manuscript_content(sample_project) == (
+            sample_manuscript.replace("impossible", "improbable")
+        )
+
+        # Adding a heading re-splits the chapters
+        project_manager.apply_manuscript_patch(
+            sample_project,
+            sample_project.manuscript_version,
+            [{"start": start, "end": start, "text": "\n## Chapter 3\n\n"}],
+        )
+        assert sample_project.metadata.chapter_count == 3
+
+    @pytest.mark.parametrize("chapters", [False, True])
+    def test_utf16_offsets(self, project_manager, sample_project, sample_manuscript, chapters):
+        """Test that offsets from JavaScript strings are converted."""
+        content = sample_manuscript.replace("impossible", "\U0001f600 impossible")
+        project_manager.save_manuscript_content(sample_project, content)
+        if chapters:
+            project_manager.enable_chapter_storage(sample_project)
+        start = len(content[: content.index("impossible")].encode("utf-16-le")) // 2
+
+        project_manager.apply_manuscript_patch(
+            sample_project,
+            sample_project.manuscript_version,
+            [{"start": start, "end": start + 10, "text": "improbable"}],
+            utf16=True,
+        )
+
+        assert project_manager.get_manuscript_content(sample_project) == (
+            content.replace("impossible", "improbable")
+        )
+
+    def test_chapter_patch_reads_one_chapter(
+        self, project_manager, sample_project, sample_manuscript, monkeypatch
+    ):
+        """Test that chapter-mode patches do not assemble the manuscript."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+        start = sample_manuscript.index("impossible")
+
+        def assemble(project):
+            raise AssertionError("whole manuscript read")
+
+        monkeypatch.setattr(project_manager, "get_manuscript_content", assemble)
+        for word in ("improbable", "unlikely"):
+            project_manager.apply_manuscript_patch(
+                sample_project,
+                sample_project.manuscript_version,
+                [{"start": start, "end": start + 10, "text": word}],
+            )
+        monkeypatch.undo()
+
+        assert len(project_manager.list_revisions(sample_project)) == 3
+        assert project_manager.get_revision(sample_project, 3) == (
+            sample_manuscript.replace("impossible", "unlikely")
+        )
+
+
+class TestVersionTokens:
+    """Tests for ProjectManager.version_tokens."""
+
+    def test_tokens_track_changes(self, project_manager, sample_project, sample_manuscript):
+        """Test that each token changes only with the data it covers."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        before = project_manager.version_tokens(sample_project)
+        assert project_manager.version_tokens(sample_project) == before
+
+        sample_project.metadata.genre = "Mystery"
+        project_manager.save_project(sample_project)
+        after_metadata = project_manager.version_tokens(sample_project)
+        assert after_metadata["project"] != before["project"]
+        assert after_metadata["manuscript"] == before["manuscript"]
+
+        project_manager.save_manuscript_content(sample_project, sample_manuscript + "More.")
+        after_text = project_manager.version_tokens(sample_project)
+        assert after_text["manuscript"] != after_metadata["manuscript"]
+
+    def test_chapter_write_changes_manuscript_token(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that writing one chapter changes the manuscript token."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+        before = project_manager.version_tokens(sample_project)
+
+        project_manager.write_chapter(sample_project, 2, "## Chapter 2\n\nShort.\n")
+
+        assert project_manager.version_tokens(sample_project)["manuscript"] != before["manuscript"]
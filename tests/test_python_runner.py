@@ -0,0 +1,115 @@
+"""Tests for the framed server mode of the web bridge's python_runner."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "storybook-web" / "server" / "services"))
+
+import pytest  # noqa: E402
+
+import python_runner  # noqa: E402
+from python_runner import CHUNK, END, FRAME_HEADER, MESSAGE  # noqa: E402
+
+__all__ = ["join_body", "stream"]
+
+
+@pytest.fixture(autouse=True)
+def served_modules(monkeypatch):
+    """Serve this module and json instead of the storybook web bridge."""
+    monkeypatch.setattr(python_runner, "SERVED_MODULES", ("json", "test_python_runner"))
+
+
+def join_body(prefix, body):
+    """Called through the runner with a streamed request body."""
+    return prefix + b"".join(body).decode("utf-8")
+
+
+def stream(pieces):
+    """Called through the runner; returns an iterator, sent as a response body."""
+    return iter(pieces)
+
+
+def frame(kind, request_id, payload=b""):
+    return FRAME_HEADER.pack(kind, request_id, len(payload)) + payload
+
+
+def request(request_id, method, params, body=False):
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+    if body:
+        message["body"] = True
+    return frame(MESSAGE, request_id, json.dumps(message).encode())
+
+
+def run(data):
+    writer = io.BytesIO()
+    python_runner.serve(io.BytesIO(data), writer)
+    frames = []
+    output = io.BytesIO(writer.getvalue())
+    while (item := python_runner.read_frame(output)) is not None:
+        frames.append(item)
+    return frames
+
+
+class TestServe:
+    """Tests for python_runner.serve."""
+
+    def test_request_and_ping(self):
+        """Test a plain call and a health check."""
+        frames = run(request(1, "json.dumps", [[1, 2]]) + request(2, "runner.ping", []))
+
+        assert [(kind, request_id) for kind, request_id, _ in frames] == [
+            (MESSAGE, 1),
+            (MESSAGE, 2),
+        ]
+        assert json.loads(frames[0][2])["result"] == "[1, 2]"
+        assert "pid" in json.loads(frames[1][2])["result"]
+
+    def test_streamed_request_body(self):
+        """Test that body chunks reach the function as an iterator."""
+        text = "é" * 100_000
+        data = text.encode()
+        chunks = b"".join(frame(CHUNK, 7, data[i : i + 999]) for i in range(0, len(data), 999))
+        frames = run(
+            request(7, "test_python_runner.join_body", ["> "], body=True)
+            + chunks
+            + frame(END, 7)
+            + request(8, "runner.ping", [])
+        )
+
+        assert json.loads(frames[0][2])["result"] == "> " + text
+        assert json.loads(frames[1][2])["id"] == 8
+
+    def test_unconsumed_body_is_drained(self):
+        """Test that a failing call skips the rest of its body."""
+        frames = run(
+            request(3, "json.loads", [], body=True)
+            + frame(CHUNK, 3, b"x")
+            + frame(END, 3)
+            + request(4, "runner.ping", [])
+        )
+
+        assert "error" in json.loads(frames[0][2])
+        assert json.loads(frames[1][2])["id"] == 4
+
+    def test_streamed_response_body(self):
+        """Test that an iterator result is sent as chunk frames."""
+        big = "x" * (python_runner.CHUNK_SIZE * 2 + 1)
+        frames = run(request(5, "test_python_runner.stream", [["a", big]]))
+
+        assert json.loads(frames[0][2])["body"] is True
+        kinds = [kind for kind, _, _ in frames[1:]]
+        assert kinds == [CHUNK] * 4 + [END]
+        assert b"".join(payload for _, _, payload in frames[1:]) == ("a" + big).encode()
+
+    def test_only_public_functions_of_served_modules(self):
+        """Test that methods outside the allowlist are refused without being called."""
+        frames = run(
+            request(1, "os.getcwd", [])
+            + request(2, "json.codecs", [])
+            + request(3, "test_python_runner.run", [""])
+        )
+
+        errors = [json.loads(payload)["error"] for _, _, payload in frames]
+        assert [error["code"] for error in errors] == [python_runner.METHOD_NOT_FOUND] * 3
@@ -0,0 +1,83 @@
+"""Tests for the memory-mapped manuscript reader."""
+
+from storybook.counting import count_text
+from storybook.reader import ManuscriptReader
+
+
+class TestManuscriptReader:
+    """Tests for ManuscriptReader class."""
+
+    def test_byte_ranges(self, temp_dir, sample_manuscript):
+        """Test reading byte ranges."""
+        path = temp_dir / "manuscript.md"
+        path.write_text(sample_manuscript)
+
+        with ManuscriptReader(path) as reader:
+            assert reader.size == len(sample_manuscript.encode())
+            assert reader.read_text(0, 14) == "# The Lost Key"
+            assert reader.read_text() == sample_manuscript
+            assert bytes(reader.view(2, 5)) == b"The"
+
+    def test_line_ranges(self, temp_dir):
+        """Test reading line ranges."""
+        path = temp_dir / "manuscript.md"
+        path.write_text("one\ntwo\nthree\nfour")
+
+        with ManuscriptReader(path) as reader:
+            assert reader.line_count == 4
+            assert reader.read_lines(1, 3) == "two\nthree\n"
+            assert reader.read_lines(3) == "four"
+
+    def test_chapter_spans_match_counting(self, temp_dir, sample_manuscript):
+        """Test that chapter spans agree with the counting engine."""
+        path = temp_dir / "manuscript.md"
+        path.write_text(sample_manuscript)
+
+        with ManuscriptReader(path) as reader:
+            spans = reader.chapter_spans()
+
+        stats = count_text(sample_manuscript)
+        assert [title for _, _, title in spans] == [c.title for c in stats.chapters]
+        assert [start for start, _, _ in spans] == [c.offset for c in stats.chapters]
+        assert spans[-1][1] == len(sample_manuscript)
+
+    def test_iter_paragraphs(self, temp_dir):
+        """Test iterating over paragraphs."""
+        path = temp_dir / "manuscript.md"
+        path.write_text("\nFirst para\nstill first.\n\n  \n\nSecond.\n\n")
+
+        with ManuscriptReader(path) as reader:
+            paragraphs = [bytes(p) for p in reader.iter_paragraphs()]
+
+        assert paragraphs == [b"First para\nstill first.", b"Second."]
+
+    def test_empty_file(self, temp_dir):
+        """Test reading an empty file."""
+        path = temp_dir / "empty.md"
+        path.write_text("")
+
+        with ManuscriptReader(path) as reader:
+            assert reader.read_text() == ""
+            assert reader.line_count == 0
+            assert list(reader.iter_paragraphs()) == []
+            assert reader.chapter_spans() == [(0, 0, "")]
+
+
+class TestProjectManagerReader:
+    """Tests for reader integration in ProjectManager."""
+
+    def test_read_chapter_single_file(self, project_manager, sample_project, sample_manuscript):
+        """Test reading one chapter from a single-file manuscript."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+
+        chapter = project_manager.read_chapter(sample_project, 2)
+        assert chapter.startswith("## Chapter 2")
+        assert "impossible" in chapter
+        assert "Sarah hurried" not in chapter
+
+    def test_open_manuscript(self, project_manager, sample_project, sample_manuscript):
+        """Test opening a reader through the project manager."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+
+        with project_manager.open_manuscript(sample_project) as reader:
+            assert reader.read_text() == sample_manuscript
@@ -0,0 +1,64 @@
+"""Tests for the per-chapter analysis result cache."""
+
+from storybook.analysis import PacingStats, ProseStats
+from storybook.results import RESULTS_FILE, ResultCache
+
+CHAPTERS = [
+    "# The Lost Key\n\n",
+    '## Chapter 1\n\nSarah ran quickly.\n\n"Wait," she said.\n\n',
+    "## Chapter 2\n\nThe key was found on Monday.\n",
+]
+
+
+class TestResultCache:
+    """Tests for ResultCache."""
+
+    def test_round_trip(self, temp_dir):
+        """Test that stored results are read back per analyzer."""
+        with ResultCache(temp_dir / RESULTS_FILE) as cache:
+            cache.put_many("prose", {"a": ProseStats.from_text(CHAPTERS[1])})
+
+        with ResultCache(temp_dir / RESULTS_FILE) as cache:
+            assert cache.get_many("prose", ["a", "b"]) == {"a": ProseStats.from_text(CHAPTERS[1])}
+            assert cache.get_many("pacing", ["a"]) == {}
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        """Test that the size limit drops the results used longest ago."""
+        result = PacingStats.from_text(CHAPTERS[1])
+        size = len(result.model_dump_json())
+        cache = ResultCache(temp_dir / RESULTS_FILE, max_bytes=size * 2)
+
+        cache.put_many("pacing", {"a": result})
+        cache.put_many("pacing", {"b": result})
+        cache.get_many("pacing", ["a"])
+        cache.put_many("pacing", {"c": result})
+
+        assert set(cache.get_many("pacing", ["a", "b", "c"])) == {"a", "c"}
+        assert cache.size() <= size * 2
+
+
+class TestProjectResults:
+    """Tests for the results kept by ProjectManager."""
+
+    def test_only_edited_chapters_are_analyzed(self, project_manager, sample_project, monkeypatch):
+        """Test that unchanged chapters are read from the cache."""
+        project_manager.save_manuscript_content(sample_project, "".join(CHAPTERS))
+        analyzed = []
+        from_text = ProseStats.from_text.__func__
+        monkeypatch.setattr(
+            ProseStats,
+            "from_text",
+            classmethod(lambda cls, text: analyzed.append(text) or from_text(cls, text)),
+        )
+
+        first = project_manager.analysis_results(sample_project, "prose")
+        assert len(analyzed) == 3
+        assert project_manager.analysis_results(sample_project, "prose", 2) == [first[2]]
+        assert len(analyzed) == 3
+
+        edited = [*CHAPTERS[:2], "## Chapter 2\n\nNobody came.\n"]
+        project_manager.save_manuscript_content(sample_project, "".join(edited))
+        results = project_manager.analysis_results(sample_project, "prose")
+        assert analyzed[3:] == [edited[2]]
+        assert results[:2] == first[:2]
+        assert ProseStats.merge(results).words == sum(r.words for r in results)
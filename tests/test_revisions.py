@@ -0,0 +1,188 @@
+"""Tests for the manuscript revision store."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from storybook.revisions import RevisionStore
+
+WORDS = ["fog", "key", "street", "museum", "symbol", "serpent", "office", "lecture"]
+
+
+class TestRevisionStore:
+    """Tests for RevisionStore class."""
+
+    def test_record_and_get(self, temp_dir, sample_manuscript):
+        """Test recording revisions and reading them back."""
+        store = RevisionStore(temp_dir / ".revisions")
+        versions = [sample_manuscript + "x" * i for i in range(5)]
+        for version in versions:
+            store.record(version)
+
+        reopened = RevisionStore(temp_dir / ".revisions")
+        assert [r.number for r in reopened.list_revisions()] == [1, 2, 3, 4, 5]
+        for number, version in enumerate(versions, start=1):
+            assert reopened.get(number) == version
+
+    def test_identical_content_not_recorded(self, temp_dir):
+        """Test that saving unchanged content adds no revision."""
+        store = RevisionStore(temp_dir / ".revisions")
+        assert store.record("same") is not None
+        assert store.record("same") is None
+        assert len(store.list_revisions()) == 1
+
+    def test_deltas_are_small(self, temp_dir):
+        """Test that small edits are stored as small deltas."""
+        rng = random.Random(0)
+        base = " ".join(rng.choice(WORDS) + str(rng.randint(0, 999)) for _ in range(20000))
+        store = RevisionStore(temp_dir / ".revisions")
+        store.record(base)
+        full_size = sum(p.stat().st_size for p in store.objects_dir.glob("*/*"))
+
+        for i in range(10):
+            store.record(base + f" edit {i}")
+        total = sum(p.stat().st_size for p in store.objects_dir.glob("*/*"))
+
+        assert total - full_size < full_size / 10
+
+    def test_snapshot_every(self, temp_dir):
+        """Test that a full snapshot bounds the delta chain."""
+        store = RevisionStore(temp_dir / ".revisions", snapshot_every=3)
+        for i in range(7):
+            store.record(f"version {i}")
+
+        assert [r.depth for r in store.list_revisions()] == [0, 1, 2, 0, 1, 2, 0]
+        assert store.get(6) == "version 5"
+
+    def test_compact_keeps_recent_revisions(self, temp_dir):
+        """Test that compaction drops old revisions and their objects."""
+        store = RevisionStore(temp_dir / ".revisions")
+        for i in range(10):
+            store.record(f"version {i}")
+
+        result = store.compact(keep_last=3)
+
+        assert result["revisions_dropped"] == 7
+        assert result["objects_removed"] == 7
+        reopened = RevisionStore(temp_dir / ".revisions")
+        assert [r.number for r in reopened.list_revisions()] == [8, 9, 10]
+        assert reopened.get(8) == "version 7"
+        assert reopened.get(10) == "version 9"
+
+    def test_compact_depths_follow_object_chains(self, temp_dir):
+        """Test that depths after compaction are those of the stored chains."""
+        store = RevisionStore(temp_dir / ".revisions")
+        for text in ["v0", "v1", "v2", "v1", "v3"]:
+            store.record(text)
+
+        store.compact(keep_last=3)
+
+        # v1 is still a delta on v0, which stays referenced
+        assert [r.depth for r in store.list_revisions()] == [0, 1, 2]
+        assert store.get(4) == "v1"
+
+    def test_record_reads_log_once(self, temp_dir, monkeypatch):
+        """Test that recording does not reread the log it wrote itself."""
+        store = RevisionStore(temp_dir / ".revisions")
+        store.record("first")
+        reads = []
+        list_revisions = store.list_revisions
+        monkeypatch.setattr(store, "list_revisions", lambda: reads.append(1) or list_revisions())
+
+        for i in range(5):
+            store.record(f"version {i}")
+        assert reads == []
+
+        # A revision recorded elsewhere is picked up
+        RevisionStore(temp_dir / ".revisions").record("elsewhere")
+        assert store.record("next").number == 8
+        assert reads == [1]
+
+    def test_concurrent_writers(self, temp_dir):
+        """Test that stores sharing a log never reuse a revision number."""
+        stores = [RevisionStore(temp_dir / ".revisions") for _ in range(4)]
+
+        def write(i):
+            for j in range(10):
+                stores[i].record(f"writer {i}, save {j}\n")
+
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(write, range(4)))
+
+        revisions = RevisionStore(temp_dir / ".revisions").list_revisions()
+        assert [r.number for r in revisions] == list(range(1, 41))
+
+    def test_record_edit(self, temp_dir):
+        """Test recording an edit to the latest revision."""
+        store = RevisionStore(temp_dir / ".revisions")
+        store.record("one two three")
+
+        store.record_edit(4, 7, "two", "2", 13)
+
+        assert store.get(2) == "one 2 three"
+        with pytest.raises(ValueError):
+            store.record_edit(4, 7, "two", "II", 11)
+
+    def test_get_missing_revision(self, temp_dir):
+        """Test that unknown revisions raise KeyError."""
+        store = RevisionStore(temp_dir / ".revisions")
+        with pytest.raises(KeyError):
+            store.get(1)
+
+
+class TestProjectManagerRevisions:
+    """Tests for revision recording in ProjectManager."""
+
+    def test_save_records_revision(self, project_manager, sample_project, sample_manuscript):
+        """Test that every manuscript save records a revision."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.save_manuscript_content(sample_project, sample_manuscript + "More.")
+
+        revisions = project_manager.list_revisions(sample_project)
+        assert len(revisions) == 2
+        assert project_manager.get_revision(sample_project, 1) == sample_manuscript
+
+    def test_store_reused(self, project_manager, sample_project):
+        """Test that saves share one revision store per project."""
+        assert project_manager.revisions(sample_project) is project_manager.revisions(
+            sample_project
+        )
+
+    def test_write_chapter_records_revision(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that chapter writes leave history like full saves."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+
+        project_manager.write_chapter(sample_project, 2, "## Chapter 2\n\nShort.\n")
+
+        revisions = project_manager.list_revisions(sample_project)
+        assert len(revisions) == 2
+        assert project_manager.get_revision(sample_project, 2) == (
+            project_manager.get_manuscript_content(sample_project)
+        )
+
+    def test_unchanged_chapter_write_is_a_no_op(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that rewriting a chapter's text changes neither version nor history."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+        version = sample_project.manuscript_version
+
+        text = project_manager.chapter_store(sample_project).read_chapter(1)
+        project_manager.write_chapter(sample_project, 1, text)
+
+        assert sample_project.manuscript_version == version
+        assert len(project_manager.list_revisions(sample_project)) == 1
+
+    def test_history_disabled(self, temp_dir, sample_manuscript):
+        """Test that history can be turned off."""
+        from storybook.project_manager import ProjectManager
+
+        pm = ProjectManager(temp_dir / "projects", keep_history=False)
+        project = pm.create_project("no_history")
+        pm.save_manuscript_content(project, sample_manuscript)
+        assert pm.list_revisions(project) == []
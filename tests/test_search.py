@@ -0,0 +1,115 @@
+"""Tests for the positional manuscript index."""
+
+import asyncio
+
+from storybook.search import INDEX_FILE, ManuscriptIndex
+from storybook.tools import _project_tools
+
+CHAPTERS = [
+    "# The Lost Key\n\n",
+    "## Chapter 1\n\nSarah Jones ran.\n\nShe met SARAH's friend.\n\n",
+    "## Chapter 2\n\nDr. Chen saw sarah\njones at dawn.\n",
+]
+
+
+class TestManuscriptIndex:
+    """Tests for ManuscriptIndex."""
+
+    def test_lookup_word(self, temp_dir):
+        """Test postings carry chapter, paragraph, offset and the text as written."""
+        index = ManuscriptIndex(temp_dir / INDEX_FILE)
+        index.update(CHAPTERS)
+
+        postings = index.lookup("sarah")
+        assert [(p.chapter, p.paragraph, p.text) for p in postings] == [
+            (1, 1, "Sarah"),
+            (1, 2, "SARAH"),
+            (2, 1, "sarah"),
+        ]
+        text = "".join(CHAPTERS)
+        assert all(text[p.offset : p.offset + 5].casefold() == "sarah" for p in postings)
+
+    def test_lookup_phrase(self, temp_dir):
+        """Test that phrases match consecutive words across line breaks."""
+        index = ManuscriptIndex(temp_dir / INDEX_FILE)
+        index.update(CHAPTERS)
+
+        assert [p.text for p in index.lookup("Sarah Jones")] == ["Sarah Jones", "sarah jones"]
+        assert index.lookup("Jones ran", limit=1)[0].chapter == 1
+        assert index.lookup("Sarah ran") == []
+        assert index.lookup("...") == []
+
+    def test_update_is_incremental(self, temp_dir):
+        """Test that only changed chapters are analyzed again."""
+        index = ManuscriptIndex(temp_dir / INDEX_FILE)
+        assert index.update(CHAPTERS) == 3
+
+        edited = [*CHAPTERS[:2], "## Chapter 2\n\nNobody came.\n"]
+        assert ManuscriptIndex(temp_dir / INDEX_FILE).update(edited) == 1
+
+        # The first connection sees the other's update
+        assert index.count("chen") == 0
+        assert index.count("nobody") == 1
+        # Postings of the replaced chapter were removed
+        assert index.chapter_count() == 3
+        assert index._conn.execute("SELECT COUNT(*) FROM chapters").fetchone()[0] == 3
+
+
+class TestProjectIndex:
+    """Tests for the index kept by ProjectManager."""
+
+    def test_built_on_first_search_and_updated_on_save(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test lazy build, then incremental updates on save."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        index_path = sample_project.get_project_dir(project_manager.data_dir) / INDEX_FILE
+        assert not index_path.exists()
+
+        hits = project_manager.find_in_manuscript(sample_project, "key")
+        assert [(p.chapter, p.paragraph) for p in hits] == [(0, 0), (1, 2), (2, 1)]
+
+        project_manager.save_manuscript_content(
+            sample_project, sample_manuscript.replace("Dr. Chen", "Dr. Chen and Sarah")
+        )
+        index = project_manager.search_index(sample_project, refresh=False)
+        assert index.source == project_manager.version_tokens(sample_project)["manuscript"]
+        assert [p.chapter for p in index.lookup("sarah")] == [1, 2]
+
+    def test_external_edit_is_picked_up(self, project_manager, sample_project, sample_manuscript):
+        """Test that a manuscript written behind the manager's back is re-indexed."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        assert project_manager.find_in_manuscript(sample_project, "Zed") == []
+
+        path = sample_project.get_manuscript_path(project_manager.data_dir)
+        path.write_text(sample_manuscript + "\nZed waved.\n")
+        assert len(project_manager.find_in_manuscript(sample_project, "Zed")) == 1
+
+    def test_chapter_write(self, project_manager, sample_project, sample_manuscript):
+        """Test that writing one chapter re-indexes just that chapter."""
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+        project_manager.enable_chapter_storage(sample_project)
+        assert len(project_manager.find_in_manuscript(sample_project, "Chen")) == 1
+
+        project_manager.write_chapter(sample_project, 2, "## Chapter 2\n\nChen and Chen.\n")
+        index = project_manager.search_index(sample_project, refresh=False)
+        assert index.source == project_manager.version_tokens(sample_project)["manuscript"]
+        assert [p.chapter for p in index.lookup("chen")] == [2, 2]
+
+    def test_consistency_tool_reads_index(self, project_manager, sample_project, sample_manuscript):
+        """Test that the project-bound tools need no manuscript text."""
+        project_manager.save_manuscript_content(
+            sample_project, sample_manuscript + "\nSARAH left.\n"
+        )
+
+        tools = {t.name: t for t in _project_tools(sample_project, project_manager)}
+        result = asyncio.run(
+            tools["check_character_consistency"].handler({"character_name": "Sarah"})
+        )
+        text = result["content"][0]["text"]
+        assert "Found 2 mentions" in text
+        assert "Inconsistent capitalization" in text
+
+        result = asyncio.run(tools["find_in_manuscript"].handler({"query": "key", "limit": 1}))
+        assert "Found 3 occurrences" in result["content"][0]["text"]
+        assert "and 2 more" in result["content"][0]["text"]
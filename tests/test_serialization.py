@@ -0,0 +1,122 @@
+"""Tests for the split project file format."""
+
+import json
+
+from storybook.models import Character, PlotEvent, Project
+from storybook.serialization import (
+    ENTITIES_FILE,
+    PROJECT_FILE,
+    decode_project,
+    encode_entities,
+    encode_header,
+    read_project,
+)
+
+
+def make_project() -> Project:
+    project = Project(id="p1", name="novel")
+    project.add_character(Character(name="Sarah", aliases=["Detective"]))
+    project.add_plot_event(PlotEvent(id="e1", title="Start", description="It begins"))
+    return project
+
+
+class TestSplitFormat:
+    """Tests for encoding and decoding projects."""
+
+    def test_round_trip(self):
+        """Test that a decoded project equals the original."""
+        project = make_project()
+
+        decoded = decode_project(encode_header(project), encode_entities(project))
+
+        assert decoded == project
+        assert decoded.get_character("detective").name == "Sarah"
+
+    def test_header_excludes_entities(self):
+        """Test that the header carries no entity collections."""
+        header = json.loads(encode_header(make_project()))
+
+        assert "characters" not in header
+        assert header["name"] == "novel"
+
+    def test_entities_decoded_lazily(self):
+        """Test that entity lists are only decoded on first access."""
+        project = make_project()
+        decoded = decode_project(encode_header(project), encode_entities(project))
+
+        assert not decoded.entities_loaded
+        assert decoded.character_count == 1
+        assert decoded.plot_event_count == 1
+        assert not decoded.entities_loaded
+
+        assert decoded.plot_events[0].id == "e1"
+        assert decoded.entities_loaded
+
+    def test_dump_loads_entities(self):
+        """Test that dumping a deferred project includes its entities."""
+        project = make_project()
+        decoded = decode_project(encode_header(project), encode_entities(project))
+
+        assert decoded.model_dump()["characters"][0]["name"] == "Sarah"
+
+    def test_legacy_single_file(self, temp_dir):
+        """Test reading a project saved as one indented file."""
+        project = make_project()
+        (temp_dir / PROJECT_FILE).write_text(project.model_dump_json(indent=2))
+
+        loaded = read_project(temp_dir)
+
+        assert loaded.entities_loaded
+        assert loaded == project
+
+
+class TestProjectManagerFormat:
+    """Tests for the split format in ProjectManager."""
+
+    def test_save_writes_both_files(self, project_manager, sample_project, sample_character):
+        """Test that saving writes the header and entity files."""
+        sample_project.add_character(sample_character)
+        project_manager.save_project(sample_project)
+
+        project_dir = sample_project.get_project_dir(project_manager.data_dir)
+        assert (project_dir / ENTITIES_FILE).exists()
+        project_manager.clear_cache()
+        assert project_manager.load_project(sample_project.id).characters[0].name == "Sarah"
+
+    def test_header_only_save_keeps_entities(
+        self, project_manager, sample_project, sample_character
+    ):
+        """Test that saving an undecoded project leaves entities.json alone."""
+        sample_project.add_character(sample_character)
+        project_manager.save_project(sample_project)
+        entities_file = sample_project.get_project_dir(project_manager.data_dir) / ENTITIES_FILE
+        mtime = entities_file.stat().st_mtime_ns
+
+        project_manager.clear_cache()
+        loaded = project_manager.load_project(sample_project.id)
+        loaded.metadata.notes = "header change"
+        project_manager.save_project(loaded)
+
+        assert entities_file.stat().st_mtime_ns == mtime
+        assert not loaded.entities_loaded
+        project_manager.clear_cache()
+        reloaded = project_manager.load_project(sample_project.id)
+        assert reloaded.metadata.notes == "header change"
+        assert reloaded.character_count == 1
+
+    def test_assigned_entities_are_saved(self, project_manager, sample_project, sample_character):
+        """Test that lists assigned on an undecoded project reach entities.json."""
+        sample_project.add_character(sample_character)
+        sample_project.add_plot_event(PlotEvent(id="e1", title="Start", description="..."))
+        project_manager.save_project(sample_project)
+
+        project_manager.clear_cache()
+        loaded = project_manager.load_project(sample_project.id)
+        loaded.characters = [Character(name="Mara")]
+        assert loaded.entities_loaded
+        project_manager.save_project(loaded)
+
+        project_manager.clear_cache()
+        reloaded = project_manager.load_project(sample_project.id)
+        assert [c.name for c in reloaded.characters] == ["Mara"]
+        assert [e.id for e in reloaded.plot_events] == ["e1"]
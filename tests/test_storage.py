@@ -0,0 +1,118 @@
+"""Tests for crash-safe storage."""
+
+import pytest
+
+from storybook.project_manager import ProjectManager
+from storybook.storage import WriteJournal, atomic_write
+
+
+class TestAtomicWrite:
+    """Tests for atomic_write."""
+
+    def test_replaces_contents(self, temp_dir):
+        """Test that the file is replaced and no temp files remain."""
+        path = temp_dir / "file.txt"
+        path.write_text("old")
+
+        atomic_write(path, "new")
+
+        assert path.read_text() == "new"
+        assert [p.name for p in temp_dir.iterdir()] == ["file.txt"]
+
+    def test_failed_write_keeps_original(self, temp_dir, monkeypatch):
+        """Test that a failure before the rename leaves the old contents."""
+        path = temp_dir / "file.txt"
+        path.write_text("old")
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("storybook.storage.os.replace", fail)
+        with pytest.raises(OSError):
+            atomic_write(path, "new")
+
+        assert path.read_text() == "old"
+        assert [p.name for p in temp_dir.iterdir()] == ["file.txt"]
+
+
+class TestWriteJournal:
+    """Tests for WriteJournal class."""
+
+    def test_commit_writes_all_files(self, temp_dir):
+        """Test that a commit writes every file in the transaction."""
+        journal = WriteJournal(temp_dir / "journal.wal", temp_dir)
+        journal.commit({temp_dir / "a.txt": "A", temp_dir / "b.txt": b"B"})
+
+        assert (temp_dir / "a.txt").read_text() == "A"
+        assert (temp_dir / "b.txt").read_text() == "B"
+
+    def test_checkpoint_truncates_journal(self, temp_dir):
+        """Test that checkpoints empty the journal."""
+        journal = WriteJournal(temp_dir / "journal.wal", temp_dir, checkpoint_every=100)
+        journal.commit({temp_dir / "a.txt": "A"})
+        assert journal.journal_path.stat().st_size > 0
+
+        journal.checkpoint()
+        assert journal.journal_path.stat().st_size == 0
+
+    def test_recover_replays_committed_records(self, temp_dir):
+        """Test that recovery restores files from the journal."""
+        journal = WriteJournal(temp_dir / "journal.wal", temp_dir, checkpoint_every=100)
+        journal.commit({temp_dir / "a.txt": "first", temp_dir / "b.txt": "meta 1"})
+        journal.commit({temp_dir / "a.txt": "second", temp_dir / "b.txt": "meta 2"})
+
+        # Simulate a crash that lost the un-synced data files
+        (temp_dir / "a.txt").write_text("torn")
+        (temp_dir / "b.txt").unlink()
+
+        recovered = WriteJournal(temp_dir / "journal.wal", temp_dir)
+        assert recovered.recover() == 2
+        assert (temp_dir / "a.txt").read_text() == "second"
+        assert (temp_dir / "b.txt").read_text() == "meta 2"
+        assert recovered.journal_path.stat().st_size == 0
+
+    def test_recover_discards_torn_record(self, temp_dir):
+        """Test that a partially written record is ignored."""
+        journal = WriteJournal(temp_dir / "journal.wal", temp_dir, checkpoint_every=100)
+        journal.commit({temp_dir / "a.txt": "good"})
+        with open(journal.journal_path, "ab") as f:
+            f.write(b"\x00\x00\x01\x00partial")
+
+        recovered = WriteJournal(temp_dir / "journal.wal", temp_dir)
+        assert recovered.recover() == 1
+        assert (temp_dir / "a.txt").read_text() == "good"
+
+    def test_recover_skips_deleted_directories(self, temp_dir):
+        """Test that recovery does not resurrect deleted projects."""
+        project_dir = temp_dir / "project"
+        project_dir.mkdir()
+        journal = WriteJournal(temp_dir / "journal.wal", temp_dir, checkpoint_every=100)
+        journal.commit({project_dir / "a.txt": "A"})
+        (project_dir / "a.txt").unlink()
+        project_dir.rmdir()
+
+        WriteJournal(temp_dir / "journal.wal", temp_dir).recover()
+        assert not project_dir.exists()
+
+
+class TestProjectManagerJournal:
+    """Tests for journaled project saves."""
+
+    def test_manuscript_and_metadata_recovered_together(
+        self, project_manager, sample_project, sample_manuscript
+    ):
+        """Test that a crash after commit restores manuscript and metadata."""
+        project_manager.journal.checkpoint_every = 100
+        project_manager.journal.checkpoint_interval = 3600
+        project_manager.save_manuscript_content(sample_project, sample_manuscript)
+
+        manuscript_path = sample_project.get_manuscript_path(project_manager.data_dir)
+        metadata_path = sample_project.get_project_dir(project_manager.data_dir) / "project.json"
+        manuscript_path.write_text("")
+        metadata_path.write_text("{")
+
+        pm = ProjectManager(project_manager.data_dir)
+        project = pm.load_project(sample_project.id)
+        assert project is not None
+        assert project.metadata.word_count == sample_project.metadata.word_count
+        assert pm.get_manuscript_content(project) == sample_manuscript
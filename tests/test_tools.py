@@ -0,0 +1,112 @@
+"""Tests for the project-bound MCP tools."""
+
+import asyncio
+
+import pytest
+
+from storybook.models import PlotEvent
+from storybook.tools import _project_tools
+
+
+@pytest.fixture
+def tools(project_manager, sample_project, sample_manuscript):
+    """Project-bound tools over the sample manuscript, by name."""
+    project_manager.save_manuscript_content(sample_project, sample_manuscript)
+    return {t.name: t for t in _project_tools(sample_project, project_manager)}
+
+
+def run(tool, args):
+    """Call a tool and return its text and error flag."""
+    result = asyncio.run(tool.handler(args))
+    return result["content"][0]["text"], result.get("is_error", False)
+
+
+class TestProjectTools:
+    """Tests for tools that read the manuscript server-side."""
+
+    def test_reads_selected_chapters(self, tools):
+        """Test that a chapter selector replaces the text argument."""
+        text, error = run(tools["detect_pacing_issues"], {"chapters": 2})
+        assert not error
+        assert "- Paragraphs: 3" in text
+
+        text, _ = run(tools["analyze_prose_quality"], {})
+        assert "- Words: 39" in text
+
+        text, _ = run(tools["analyze_prose_quality"], {"text_sample": "One two three."})
+        assert "- Words: 3" in text
+
+    def test_other_project(self, tools, project_manager):
+        """Test reading another project by id."""
+        other = project_manager.create_project("other")
+        project_manager.save_manuscript_content(other, "It was Monday. Then Tuesday.")
+
+        text, _ = run(tools["analyze_plot_timeline"], {"project_id": other.id})
+        assert "Found 2 time references" in text
+
+        text, error = run(tools["analyze_plot_timeline"], {"project_id": "missing"})
+        assert error and "not found" in text
+
+    def test_invalid_selector(self, tools):
+        """Test that a bad selector is reported as a tool error."""
+        text, error = run(tools["detect_pacing_issues"], {"chapters": "7"})
+        assert error and "out of range" in text
+
+    def test_search_tools_respect_selector(self, tools):
+        """Test chapter filtering for index-backed tools."""
+        text, _ = run(tools["find_in_manuscript"], {"query": "key", "chapters": "1-2"})
+        assert "Found 2 occurrences" in text
+
+        text, _ = run(
+            tools["check_character_consistency"], {"character_name": "Chen", "chapters": 1}
+        )
+        assert "Found 0 mentions" in text
+
+
+class TestTrackingTools:
+    """Tests for tools that record characters and plot events."""
+
+    def test_track_and_list_characters(self, tools, project_manager, sample_project):
+        """Test that tracked characters are stored, merged and listed."""
+        run(tools["track_character"], {"name": "Sarah", "aliases": ["S"], "traits": ["brave"]})
+        run(tools["track_character"], {"name": "sarah", "description": "An archaeologist"})
+        project_manager.flush_entities()
+
+        text, _ = run(tools["list_characters"], {})
+        assert "1 tracked characters" in text
+        assert "- Sarah (aka S): An archaeologist [brave]" in text
+
+        project_manager.clear_cache()
+        loaded = project_manager.load_project(sample_project.id)
+        assert loaded.get_character("S").description == "An archaeologist"
+
+    def test_track_and_list_plot_events(self, tools, project_manager, sample_project):
+        """Test that plot events are stored and get an id when none is given."""
+        text, _ = run(
+            tools["track_plot_event"],
+            {"title": "Key found", "chapter_reference": "Chapter 1", "importance": "high"},
+        )
+        assert "as event-1" in text
+        project_manager.flush_entities()
+
+        text, _ = run(tools["list_plot_events"], {})
+        assert "- event-1: Key found (Chapter 1, high)" in text
+
+        project_manager.clear_cache()
+        assert project_manager.load_project(sample_project.id).get_plot_event("event-1")
+
+    def test_generated_event_ids_are_unique(self, tools, sample_project):
+        """Test that generated ids skip ids already in use."""
+        sample_project.add_plot_event(PlotEvent(id="event-1", title="A", description=""))
+        sample_project.add_plot_event(PlotEvent(id="event-3", title="B", description=""))
+        sample_project.remove_plot_event("event-1")
+
+        text, _ = run(tools["track_plot_event"], {"title": "C"})
+
+        assert "as event-4" in text
+        assert [e.title for e in sample_project.plot_events] == ["B", "C"]
+
+    def test_lists_start_empty(self, tools):
+        """Test the empty listings."""
+        assert "No characters tracked yet" in run(tools["list_characters"], {})[0]
+        assert "No plot events tracked yet" in run(tools["list_plot_events"], {})[0]
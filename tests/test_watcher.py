@@ -0,0 +1,91 @@
+"""Tests for the project directory watcher."""
+
+import shutil
+
+import pytest
+
+from storybook.watcher import ProjectWatcher, classify
+
+
+def changes(watcher, timeout=3.0):
+    """Collect (project id, kind) pairs until the watcher goes quiet."""
+    seen = {}
+    batch = watcher.poll(timeout)
+    while batch:
+        for change in batch:
+            seen[(change.project_id, change.kind)] = change.paths
+        batch = watcher.poll(0.3)
+    return seen
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher(request, project_manager):
+    """A watcher over the project manager's data directory."""
+    try:
+        w = ProjectWatcher(
+            project_manager.data_dir, debounce=0.05, backend=request.param, poll_interval=0.05
+        )
+    except OSError:
+        pytest.skip("inotify is not available")
+    yield w
+    w.close()
+
+
+class TestClassify:
+    """Tests for classify."""
+
+    def test_kinds(self, temp_dir):
+        """Test classification of paths inside a project."""
+        (temp_dir / "p1").mkdir()
+        assert classify(temp_dir, temp_dir / "p1" / "project.json", False) == ("p1", "metadata")
+        assert classify(temp_dir, temp_dir / "p1" / "manuscript.md", False) == ("p1", "manuscript")
+        assert classify(temp_dir, temp_dir / "p1" / "chapters" / "ch-1.md", False) == (
+            "p1",
+            "manuscript",
+        )
+        assert classify(temp_dir, temp_dir / "p1", True) == ("p1", "created")
+        assert classify(temp_dir, temp_dir / "gone", True) == ("gone", "deleted")
+
+    def test_ignored(self, temp_dir):
+        """Test that temporary files, history and top-level files are ignored."""
+        assert classify(temp_dir, temp_dir / "p1" / ".manuscript.md.1.2.tmp", False) is None
+        assert classify(temp_dir, temp_dir / "p1" / ".revisions" / "log.jsonl", False) is None
+        assert classify(temp_dir, temp_dir / "catalog.db", False) is None
+
+
+class TestProjectWatcher:
+    """Tests for ProjectWatcher with both backends."""
+
+    def test_manuscript_and_metadata_changes(self, watcher, project_manager, sample_project):
+        """Test that manuscript saves and metadata saves are told apart."""
+        changes(watcher, timeout=0.3)  # Settle events from project creation
+
+        project_manager.save_manuscript_content(sample_project, "# Title\n\nSome words.\n")
+        seen = changes(watcher)
+
+        assert (sample_project.id, "manuscript") in seen
+        assert "manuscript.md" in seen[(sample_project.id, "manuscript")]
+
+        sample_project.metadata.title = "Renamed"
+        project_manager.save_project(sample_project)
+        seen = changes(watcher)
+        assert set(seen) == {(sample_project.id, "metadata")}
+
+    def test_burst_is_debounced(self, watcher, project_manager, sample_project):
+        """Test that many quick writes produce one event."""
+        changes(watcher, timeout=0.3)
+        path = sample_project.get_manuscript_path(project_manager.data_dir)
+
+        for i in range(20):
+            path.write_text(f"draft {i}")
+        batch = watcher.poll(3.0)
+
+        assert [(c.project_id, c.kind) for c in batch] == [(sample_project.id, "manuscript")]
+
+    def test_created_and_deleted(self, watcher, project_manager):
+        """Test that new and removed project directories are reported."""
+        project = project_manager.create_project("fresh")
+        assert (project.id, "created") in changes(watcher)
+
+        shutil.rmtree(project.get_project_dir(project_manager.data_dir))
+        assert (project.id, "deleted") in changes(watcher)